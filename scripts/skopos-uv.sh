@@ -62,19 +62,53 @@ case "$COMMAND" in
         ;;
 esac
 
+# Collect the packages a uv command would install into SKOPOS_PACKAGES.
+# `uv add` installs its positional arguments; `uv run` installs `--with` values.
+# Flags that take a value are skipped together with that value.
+collect_packages() {
+    SKOPOS_PACKAGES=()
+    local subcommand=$1
+    shift
+    local skip_next=0 take_next=0 arg
+    for arg in "$@"; do
+        if [[ $take_next -eq 1 ]]; then
+            SKOPOS_PACKAGES+=("$arg")
+            take_next=0
+            continue
+        fi
+        if [[ $skip_next -eq 1 ]]; then
+            skip_next=0
+            continue
+        fi
+        case "$arg" in
+            --with)
+                [[ "$subcommand" == "run" ]] && take_next=1 || skip_next=1 ;;
+            --with=*)
+                [[ "$subcommand" == "run" ]] && SKOPOS_PACKAGES+=("${arg#--with=}") ;;
+            --group|--optional|--extra|--rev|--tag|--branch|--index|--default-index|--index-url|--extra-index-url|--find-links|-f|--python|-p|--package|--script|--requirements|-r|--constraints|-c|--marker|-m|--bounds|--directory|--project|--config-file|--cache-dir|--with-editable|--with-requirements|--env-file)
+                skip_next=1 ;;
+            -*)
+                ;;
+            *)
+                [[ "$subcommand" == "add" ]] && SKOPOS_PACKAGES+=("$arg") ;;
+        esac
+    done
+}
+
 if [[ "$COMMAND" == "add" || "$COMMAND" == "run" ]]; then
-    # The last argument is usually the package name
-    PACKAGE="${@: -1}"
+    collect_packages "$COMMAND" "$@"
 
-    # Attempt to run the check. Exit code meanings:
-    # 0 -> passed, non-zero -> failure, 127 -> skopos missing
-    run_skopos_check "$PACKAGE"
-    RC=$?
-    if [[ $RC -eq 127 ]]; then
-        echo -e "\033[0;33m[Skopos] skopos not found; skipping security check.\033[0m" >&2
-    elif [[ $RC -ne 0 ]]; then
-        echo -e "\033[0;31m[Skopos] Security Gate: Installation aborted due to high risk score.\033[0m" >&2
-        return 1 2>/dev/null || exit 1
+    if [[ ${#SKOPOS_PACKAGES[@]} -gt 0 ]]; then
+        # Audit every package in a single skopos process. Exit code meanings:
+        # 0 -> passed, non-zero -> failure, 127 -> skopos missing
+        run_skopos_check "${SKOPOS_PACKAGES[@]}"
+        RC=$?
+        if [[ $RC -eq 127 ]]; then
+            echo -e "\033[0;33m[Skopos] skopos not found; skipping security check.\033[0m" >&2
+        elif [[ $RC -ne 0 ]]; then
+            echo -e "\033[0;31m[Skopos] Security Gate: Installation aborted due to high risk score.\033[0m" >&2
+            return 1 2>/dev/null || exit 1
+        fi
     fi
 fi
 
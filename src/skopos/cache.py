@@ -1,14 +1,68 @@
+import gzip
+import hashlib
 import json
+import math
 import sqlite3
+import threading
+from array import array
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+from skopos import metrics
+from skopos.cache_backends import SQLiteBackend
+from skopos.metadata import PackageMetadata
+from skopos.names import canonical_name
+
+# Audit verdicts (and project manifest entries) are trusted for this long.
+AUDIT_TTL = timedelta(hours=24)
+
+BUNDLE_FORMAT = "skopos-cache-bundle"
+BUNDLE_VERSION = 2
+
+# `PRAGMA user_version` of the cache DB; 1 = package names stored canonically.
+SCHEMA_VERSION = 1
+
+
+class BundleError(ValueError):
+    """A cache bundle is malformed, from an unknown format, or fails its checksum."""
+
+
+def _expiry(entry):
+    """When an entry stops being fresh.
+
+    That is its staggered `expires_at`, else timestamp + TTL.
+    """
+    if entry.get("expires_at"):
+        return datetime.fromisoformat(entry["expires_at"])
+    return datetime.fromisoformat(entry["timestamp"]) + AUDIT_TTL
+
+
+def _is_fresh(entry):
+    return datetime.now(timezone.utc) < _expiry(entry)
+
 
 class CacheManager:
-    def __init__(self, db_path="~/.skopos/audit_cache.db"):
+    """Audit cache with tiered reads.
+
+    Reads go to the in-process tier, then local SQLite, then an optional
+    remote store.
+
+    Remote writes are buffered and sent in batches of `remote_batch` entries
+    (and by `flush()`, which the CLI calls on exit).
+    """
+
+    def __init__(
+        self, db_path="~/.skopos/audit_cache.db", remote=None, remote_batch=50
+    ):
         self.db_path = Path(db_path).expanduser()
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._init_db()
+        self.local = SQLiteBackend(self.db_path)
+        self.remote = remote
+        self.remote_batch = remote_batch
+        self._memory = {}
+        self._pending = {}
+        self._lock = threading.Lock()
 
     def _init_db(self):
         with sqlite3.connect(self.db_path) as conn:
@@ -19,36 +73,824 @@ class CacheManager:
                     score INTEGER,
                     meta_json TEXT,
                     timestamp DATETIME,
+                    expires_at DATETIME,
+                    PRIMARY KEY (package_name, version)
+                )
+            """)
+            if "expires_at" not in {
+                row[1] for row in conn.execute("PRAGMA table_info(audits)")
+            }:
+                # Caches created before `cache warm` staggered expiry
+                conn.execute("ALTER TABLE audits ADD COLUMN expires_at DATETIME")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS project_manifests (
+                    project TEXT,
+                    dep_spec TEXT,
+                    package_name TEXT,
+                    version TEXT,
+                    score INTEGER,
+                    passed INTEGER,
+                    timestamp DATETIME,
+                    PRIMARY KEY (project, dep_spec)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS project_fingerprints (
+                    project TEXT PRIMARY KEY,
+                    fingerprint TEXT,
+                    timestamp DATETIME
+                )
+            """)
+            # Normalized release history, synced incrementally from the simple index
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS releases (
+                    package_name TEXT,
+                    version TEXT,
+                    seq INTEGER,
                     PRIMARY KEY (package_name, version)
                 )
             """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS release_files (
+                    package_name TEXT,
+                    filename TEXT,
+                    version TEXT,
+                    upload_time REAL,
+                    size INTEGER,
+                    digest TEXT,
+                    yanked INTEGER,
+                    PRIMARY KEY (package_name, filename)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS release_sync (
+                    package_name TEXT PRIMARY KEY,
+                    last_serial INTEGER,
+                    etag TEXT,
+                    info_json TEXT,
+                    synced_at DATETIME
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS negative_lookups (
+                    package_name TEXT PRIMARY KEY,
+                    reason TEXT,
+                    expires_at DATETIME
+                )
+            """)
+            # Dependency graph: a release's requirements never change, so edges
+            # have no TTL; `dependency_nodes` marks releases already resolved
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS dependency_nodes (
+                    package_name TEXT,
+                    version TEXT,
+                    resolved_at DATETIME,
+                    PRIMARY KEY (package_name, version)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS dependency_edges (
+                    package_name TEXT,
+                    version TEXT,
+                    dependency TEXT,
+                    PRIMARY KEY (package_name, version, dependency)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS subtree_rollups (
+                    package_name TEXT,
+                    version TEXT,
+                    depth INTEGER,
+                    score INTEGER,
+                    nodes_json TEXT,
+                    timestamp DATETIME,
+                    PRIMARY KEY (package_name, version, depth)
+                )
+            """)
+            # Maintainer index: every (email, package) pair seen in fetched
+            # metadata, plus a per-email rollup so identity checks are one lookup
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS author_packages (
+                    email TEXT,
+                    package_name TEXT,
+                    first_upload REAL,
+                    PRIMARY KEY (email, package_name)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS authors (
+                    email TEXT PRIMARY KEY,
+                    package_count INTEGER,
+                    first_seen REAL
+                )
+            """)
+            if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                self._canonicalize_rows(conn)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    @staticmethod
+    def _canonicalize_rows(conn):
+        """Rekey rows written before names were canonicalized.
+
+        For example `Requests` becomes `requests`.
+
+        Audits merge into the canonical key, newest timestamp winning. Derived
+        rows (negative lookups, release history) are dropped and re-fetched.
+        """
+        conn.create_function("canonical", 1, canonical_name, deterministic=True)
+        conn.execute("""
+            INSERT INTO audits (package_name, version, score, meta_json, timestamp)
+            SELECT canonical(package_name), version, score, meta_json, timestamp
+            FROM audits WHERE package_name != canonical(package_name)
+            ORDER BY timestamp
+            ON CONFLICT (package_name, version) DO UPDATE SET
+                score = excluded.score, meta_json = excluded.meta_json,
+                timestamp = excluded.timestamp
+            WHERE excluded.timestamp >= audits.timestamp
+        """)
+        conn.execute("DELETE FROM audits WHERE package_name != canonical(package_name)")
+        for table in ("negative_lookups", "releases", "release_files", "release_sync"):
+            conn.execute(
+                f"DELETE FROM {table} WHERE package_name != canonical(package_name)"
+            )
+        conn.execute(
+            "UPDATE project_manifests SET package_name = canonical(package_name) "
+            "WHERE package_name IS NOT NULL"
+        )
+
+    def _lookup(self, keys):
+        """Resolve keys through each tier.
+
+        Faster tiers are backfilled with what slower ones find.
+
+        A tier holding only an expired entry does not end the search; the
+        expired entry is returned if no tier has a fresh one.
+        """
+        found, stale = {}, {}
+
+        def take(entries):
+            for key, entry in entries.items():
+                if _is_fresh(entry):
+                    found[key] = entry
+                    stale.pop(key, None)
+                elif key not in found:
+                    stale[key] = entry
+
+        take({k: self._memory[k] for k in keys if k in self._memory})
+        missing = [k for k in keys if k not in found]
+        if missing:
+            local = self.local.get_many(missing)
+            take(local)
+            self._memory.update(local)
+            metrics.CACHE_TIER_HITS.inc(
+                sum(1 for k in local if k in found), tier="local"
+            )
+            missing = [k for k in missing if k not in found]
+        if missing and self.remote is not None:
+            remote = {
+                k: e for k, e in self.remote.get_many(missing).items() if _is_fresh(e)
+            }
+            if remote:
+                metrics.CACHE_TIER_HITS.inc(len(remote), tier="remote")
+                self.local.put_many(remote)
+                self._memory.update(remote)
+                take(remote)
+        return {**stale, **found}
+
+    def prefetch(self, keys):
+        """Warm the in-process tier for many keys with one batched lookup per tier."""
+        keys = ((canonical_name(name), version) for name, version in keys)
+        self._lookup(list(dict.fromkeys(keys)))
 
     def get_cached_audit(self, package_name, version):
-        """Retrieves a result only if it's less than 24 hours old."""
-        query = "SELECT score, meta_json, timestamp FROM audits WHERE package_name = ? AND version = ?"
-        with sqlite3.connect(self.db_path) as conn:
-            row = conn.execute(query, (package_name, version)).fetchone()
+        """Retrieves a result only if it's less than 24 hours old.
 
-        if row:
-            score, meta_json, ts_str = row
-            ts = datetime.fromisoformat(ts_str)
-            if datetime.now(timezone.utc) - ts < timedelta(hours=24):
-                return score, json.loads(meta_json)
+        `version="latest"` returns the most recently audited version.
+        """
+        package_name = canonical_name(package_name)
+        key = (package_name, version)
+        entry = self._lookup([key]).get(key)
+        if entry:
+            if _is_fresh(entry):
+                metrics.CACHE_REQUESTS.inc(result="hit")
+                return entry["score"], entry["meta"]
+            metrics.CACHE_REQUESTS.inc(result="expired")
+            return None
+        metrics.CACHE_REQUESTS.inc(result="miss")
         return None
 
+    def get_stale_audit(self, package_name, version, stale_ttl):
+        """An expired verdict at most `stale_ttl` seconds past the TTL, else None."""
+        if stale_ttl <= 0:
+            return None
+        package_name = canonical_name(package_name)
+        key = (package_name, version)
+        entry = self._lookup([key]).get(key)
+        if not entry or _is_fresh(entry):
+            return None
+        if datetime.now(timezone.utc) >= _expiry(entry) + timedelta(seconds=stale_ttl):
+            return None
+        return entry["score"], entry["meta"]
+
     def save_audit(self, package_name, version, score, meta):
-        """Upserts a forensic audit result into the local cache."""
+        """Upserts a forensic audit result into the local cache.
+
+        The result is also queued for the remote.
+        """
+        package_name = canonical_name(package_name)
+        entry = {
+            "score": score,
+            "meta": meta,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+        self.local.put_many({(package_name, version): entry})
+        self._memory[(package_name, version)] = self._memory[
+            (package_name, "latest")
+        ] = entry
+        metrics.CACHE_WRITES.inc()
+        if self.remote is not None:
+            with self._lock:
+                # The remote has no ordering query, so "latest" is stored as its own key
+                self._pending[(package_name, version)] = entry
+                self._pending[(package_name, "latest")] = {**entry, "version": version}
+                batch = (
+                    self._pending if len(self._pending) >= self.remote_batch else None
+                )
+                if batch:
+                    self._pending = {}
+            if batch:
+                self.remote.put_many(batch)
+
+    def flush(self):
+        """Send buffered writes to the remote store."""
+        if self.remote is None:
+            return
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if batch:
+            self.remote.put_many(batch)
+
+    def latest_version(self, package_name):
+        """Return the most recently audited version of a package, if any."""
+        package_name = canonical_name(package_name)
+        query = (
+            "SELECT version FROM audits WHERE package_name = ? "
+            "ORDER BY timestamp DESC LIMIT 1"
+        )
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(query, (package_name,)).fetchone()
+        return row[0] if row else None
+
+    def stagger_expiry(self, keys, spread):
+        """Pull the expiry of each `(package, version)` verdict forward.
+
+        Each expiry moves forward by up to `spread`.
+
+        A version of None means the package's most recently audited row.
+        Verdicts warmed in one batch would otherwise all expire in the same
+        minute. Each key gets a stable offset in [0, spread) derived from it,
+        so expiries are spread evenly and never exceed the TTL. With a
+        remote backend the staggered entries are queued for it, so call
+        flush() afterwards. Returns the number of rows updated.
+        """
+        rows = []
+        for name, version in dict.fromkeys((canonical_name(n), v) for n, v in keys):
+            seed = f"{name}=={version}" if version else name
+            fraction = (
+                int.from_bytes(hashlib.sha256(seed.encode()).digest()[:4], "big")
+                / 2**32
+            )
+            rows.append(
+                ((AUDIT_TTL - spread * fraction).total_seconds(), name, version, name)
+            )
+        # The explicit version, else the newest row of the package
+        row_filter = (
+            "package_name = ? AND version = COALESCE(?, "
+            "(SELECT version FROM audits WHERE package_name = ? "
+            "ORDER BY timestamp DESC LIMIT 1))"
+        )
+        with sqlite3.connect(self.db_path) as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "UPDATE audits SET expires_at = "
+                "strftime('%Y-%m-%dT%H:%M:%f+00:00', timestamp, ? || ' seconds') "
+                f"WHERE {row_filter}",
+                rows,
+            )
+            updated = conn.total_changes - before
+            staggered = []
+            if self.remote is not None:
+                for _, name, version, _ in rows:
+                    staggered.extend(
+                        conn.execute(
+                            "SELECT package_name, version, score, meta_json, "
+                            "timestamp, expires_at, timestamp = (SELECT MAX(timestamp) "
+                            "FROM audits a WHERE a.package_name = audits.package_name) "
+                            f"FROM audits WHERE {row_filter}",
+                            (name, version, name),
+                        )
+                    )
+        with self._lock:
+            for (
+                name,
+                version,
+                score,
+                meta_json,
+                timestamp,
+                expires_at,
+                newest,
+            ) in staggered:
+                entry = {
+                    "score": score,
+                    "meta": json.loads(meta_json),
+                    "timestamp": timestamp,
+                    "expires_at": expires_at,
+                }
+                self._pending[(name, version)] = entry
+                if newest:
+                    self._pending[(name, "latest")] = {**entry, "version": version}
+        self._memory.clear()
+        return updated
+
+    # --- NEGATIVE LOOKUPS ---
+
+    def get_negative(self, package_name):
+        """The reason ("not_found"/"error") of an unexpired failed lookup, or None."""
+        package_name = canonical_name(package_name)
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT reason, expires_at FROM negative_lookups "
+                "WHERE package_name = ?",
+                (package_name,),
+            ).fetchone()
+        if row and datetime.now(timezone.utc) < datetime.fromisoformat(row[1]):
+            metrics.NEGATIVE_CACHE_HITS.inc(reason=row[0])
+            return row[0]
+        return None
+
+    def save_negative(self, package_name, reason, ttl_seconds):
+        """Remember that looking `package_name` up failed, for `ttl_seconds`."""
+        package_name = canonical_name(package_name)
+        if ttl_seconds <= 0:
+            return
+        expires = datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)
         with sqlite3.connect(self.db_path) as conn:
             conn.execute(
-                """
-                INSERT OR REPLACE INTO audits (package_name, version, score, meta_json, timestamp)
-                VALUES (?, ?, ?, ?, ?)
-            """,
+                "INSERT OR REPLACE INTO negative_lookups "
+                "(package_name, reason, expires_at) VALUES (?, ?, ?)",
+                (package_name, reason, expires.isoformat()),
+            )
+
+    # --- RELEASE HISTORY ---
+
+    def get_release_sync(self, package_name):
+        """{"last_serial", "etag", "info"} from the last history sync, or None."""
+        package_name = canonical_name(package_name)
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT last_serial, etag, info_json FROM release_sync "
+                "WHERE package_name = ?",
+                (package_name,),
+            ).fetchone()
+        if not row:
+            return None
+        return {
+            "last_serial": row[0],
+            "etag": row[1],
+            "info": json.loads(row[2] or "{}"),
+        }
+
+    def save_release_sync(self, package_name, last_serial, etag, info):
+        package_name = canonical_name(package_name)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO release_sync "
+                "(package_name, last_serial, etag, info_json, synced_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    package_name,
+                    last_serial,
+                    etag,
+                    json.dumps(info),
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+
+    def known_release_files(self, package_name):
+        """Map filename -> yanked flag for every stored file of a package."""
+        package_name = canonical_name(package_name)
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT filename, yanked FROM release_files WHERE package_name = ?",
+                (package_name,),
+            ).fetchall()
+        return {filename: bool(yanked) for filename, yanked in rows}
+
+    def apply_release_delta(self, package_name, versions, new_files, yank_changes):
+        """Add new releases/files and flip yanked flags.
+
+        Returns the number of files added.
+        """
+        package_name = canonical_name(package_name)
+        with sqlite3.connect(self.db_path) as conn:
+            (next_seq,) = conn.execute(
+                "SELECT COALESCE(MAX(seq) + 1, 0) FROM releases WHERE package_name = ?",
+                (package_name,),
+            ).fetchone()
+            known = {
+                v
+                for (v,) in conn.execute(
+                    "SELECT version FROM releases WHERE package_name = ?",
+                    (package_name,),
+                )
+            }
+            fresh = [v for v in versions if v not in known]
+            conn.executemany(
+                "INSERT INTO releases (package_name, version, seq) VALUES (?, ?, ?)",
+                [(package_name, v, next_seq + i) for i, v in enumerate(fresh)],
+            )
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO release_files "
+                "(package_name, version, filename, upload_time, size, digest, yanked) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (package_name, v, fn, ts, size, digest, int(yanked))
+                    for v, fn, ts, size, digest, yanked in new_files
+                ],
+            )
+            added = conn.total_changes - before
+            conn.executemany(
+                "UPDATE release_files SET yanked = ? "
+                "WHERE package_name = ? AND filename = ?",
+                [(int(yanked), package_name, fn) for fn, yanked in yank_changes],
+            )
+        return added
+
+    def load_release_history(self, package_name):
+        """Build a `PackageMetadata` straight from the stored history.
+
+        Returns (metadata, fully_yanked_versions); `info` fields are left for
+        the caller to fill from the sync row.
+        """
+        package_name = canonical_name(package_name)
+        with sqlite3.connect(self.db_path) as conn:
+            versions = [
+                v
+                for (v,) in conn.execute(
+                    "SELECT version FROM releases WHERE package_name = ? ORDER BY seq",
+                    (package_name,),
+                )
+            ]
+            rows = conn.execute(
+                "SELECT f.version, f.filename, f.upload_time, f.yanked "
+                "FROM release_files f JOIN releases r "
+                "ON r.package_name = f.package_name AND r.version = f.version "
+                "WHERE f.package_name = ? ORDER BY r.seq, f.filename",
+                (package_name,),
+            ).fetchall()
+        position = {v: i for i, v in enumerate(versions)}
+        starts = array("I", [0] * (len(versions) + 1))
+        for version, _, _, _ in rows:
+            starts[position[version] + 1] += 1
+        for i in range(len(versions)):
+            starts[i + 1] += starts[i]
+        yanked = {}
+        for version, _, _, is_yanked in rows:
+            yanked[version] = yanked.get(version, True) and bool(is_yanked)
+        meta = PackageMetadata(
+            name=package_name,
+            versions=tuple(versions),
+            filenames=tuple(r[1] for r in rows),
+            upload_times=array(
+                "d", (r[2] if r[2] is not None else math.nan for r in rows)
+            ),
+            release_starts=starts,
+        )
+        return meta, {v for v, all_yanked in yanked.items() if all_yanked}
+
+    # --- DEPENDENCY GRAPH ---
+
+    def get_dependencies(self, package_name, version):
+        """Canonical dependency names of a release, or None if it was never resolved."""
+        package_name = canonical_name(package_name)
+        with sqlite3.connect(self.db_path) as conn:
+            if not conn.execute(
+                "SELECT 1 FROM dependency_nodes WHERE package_name = ? AND version = ?",
+                (package_name, version),
+            ).fetchone():
+                return None
+            rows = conn.execute(
+                "SELECT dependency FROM dependency_edges "
+                "WHERE package_name = ? AND version = ? ORDER BY dependency",
+                (package_name, version),
+            ).fetchall()
+        return [d for (d,) in rows]
+
+    def save_dependencies(self, package_name, version, dependencies):
+        package_name = canonical_name(package_name)
+        deps = sorted({canonical_name(d) for d in dependencies})
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO dependency_nodes "
+                "(package_name, version, resolved_at) VALUES (?, ?, ?)",
+                (package_name, version, datetime.now(timezone.utc).isoformat()),
+            )
+            conn.execute(
+                "DELETE FROM dependency_edges WHERE package_name = ? AND version = ?",
+                (package_name, version),
+            )
+            conn.executemany(
+                "INSERT INTO dependency_edges (package_name, version, dependency) "
+                "VALUES (?, ?, ?)",
+                [(package_name, version, d) for d in deps],
+            )
+        return deps
+
+    def latest_audits(self, package_names):
+        """{name: (version, score, fresh)} of the latest local audit of each name."""
+        names = list(dict.fromkeys(canonical_name(n) for n in package_names))
+        if not names:
+            return {}
+        marks = ",".join("?" * len(names))
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT package_name, version, score, MAX(timestamp), expires_at "
+                f"FROM audits WHERE package_name IN ({marks}) GROUP BY package_name",
+                names,
+            ).fetchall()
+        return {
+            name: (version, score, _is_fresh({"timestamp": ts, "expires_at": expires}))
+            for name, version, score, ts, expires in rows
+        }
+
+    def get_subtree(self, package_name, version, depth, pass_threshold):
+        """A passing rollup of the subtree below a release, if still valid.
+
+        Valid means: saved within the audit TTL for at least `depth` levels,
+        and every node's most recent audit is still fresh, scores at least
+        `pass_threshold` (the audit's own cutoff) and is at the version
+        recorded in the rollup (nodes recorded without a version were
+        whitelisted). Returns (min score, {node: version}) or None.
+        """
+        package_name = canonical_name(package_name)
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT score, nodes_json, timestamp FROM subtree_rollups "
+                "WHERE package_name = ? AND version = ? AND depth >= ? "
+                "ORDER BY depth LIMIT 1",
+                (package_name, version, depth),
+            ).fetchone()
+        if not row or not _is_fresh({"timestamp": row[2]}):
+            return None
+        nodes = json.loads(row[1])
+        current = self.latest_audits([n for n, v in nodes.items() if v is not None])
+        for name, recorded in nodes.items():
+            if recorded is None:
+                continue
+            version_now, score, fresh = current.get(name, (None, 0, False))
+            if version_now != recorded or not fresh or score < pass_threshold:
+                return None
+        return row[0], nodes
+
+    def save_subtree(self, package_name, version, depth, score, nodes):
+        """Record that every node below `package_name==version` passed.
+
+        The rollup covers `depth` levels.
+        """
+        package_name = canonical_name(package_name)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO subtree_rollups "
+                "(package_name, version, depth, score, nodes_json, timestamp) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
                 (
                     package_name,
                     version,
+                    depth,
                     score,
-                    json.dumps(meta),
+                    json.dumps(nodes, sort_keys=True),
                     datetime.now(timezone.utc).isoformat(),
                 ),
             )
+
+    # --- MAINTAINER INDEX ---
+
+    def index_authors(self, package_name, emails, first_upload):
+        """Record `package_name` under each email.
+
+        Returns {email: (package_count, first_seen)}.
+
+        `first_upload` is the package's earliest upload time, so an email's
+        `first_seen` is the earliest upload of any locally indexed package it
+        maintains. Re-indexing a known pair is a no-op, which keeps the counts
+        exact however often a package is audited.
+        """
+        package_name = canonical_name(package_name)
+        stats = {}
+        with sqlite3.connect(self.db_path) as conn:
+            for email in emails:
+                added = conn.execute(
+                    "INSERT OR IGNORE INTO author_packages "
+                    "(email, package_name, first_upload) VALUES (?, ?, ?)",
+                    (email, package_name, first_upload),
+                ).rowcount
+                if added:
+                    conn.execute(
+                        "INSERT INTO authors (email, package_count, first_seen) "
+                        "VALUES (?, 1, ?) ON CONFLICT(email) DO UPDATE SET "
+                        "package_count = package_count + 1, "
+                        "first_seen = MIN(first_seen, excluded.first_seen)",
+                        (email, first_upload),
+                    )
+                row = conn.execute(
+                    "SELECT package_count, first_seen FROM authors WHERE email = ?",
+                    (email,),
+                ).fetchone()
+                stats[email] = (row[0], row[1])
+        return stats
+
+    def author_stats(self, package_name, emails, first_upload):
+        """What index_authors() would return, without writing anything."""
+        package_name = canonical_name(package_name)
+        stats = {}
+        with sqlite3.connect(self.db_path) as conn:
+            for email in emails:
+                row = conn.execute(
+                    "SELECT package_count, first_seen FROM authors WHERE email = ?",
+                    (email,),
+                ).fetchone()
+                known = conn.execute(
+                    "SELECT 1 FROM author_packages "
+                    "WHERE email = ? AND package_name = ?",
+                    (email, package_name),
+                ).fetchone()
+                if row is None:
+                    stats[email] = (1, first_upload)
+                elif known:
+                    stats[email] = (row[0], row[1])
+                else:
+                    stats[email] = (row[0] + 1, min(row[1], first_upload))
+        return stats
+
+    # --- PROJECT MANIFESTS ---
+
+    def get_project_manifest(self, project):
+        """Return (fingerprint, {dep_spec: entry}) from the last audit of `project`."""
+        with sqlite3.connect(self.db_path) as conn:
+            fp_row = conn.execute(
+                "SELECT fingerprint FROM project_fingerprints WHERE project = ?",
+                (project,),
+            ).fetchone()
+            rows = conn.execute(
+                "SELECT dep_spec, package_name, version, score, passed, timestamp "
+                "FROM project_manifests WHERE project = ?",
+                (project,),
+            ).fetchall()
+        entries = {
+            spec: {
+                "package": name,
+                "version": version,
+                "score": score,
+                "passed": bool(passed),
+                "timestamp": datetime.fromisoformat(ts),
+            }
+            for spec, name, version, score, passed, ts in rows
+        }
+        return (fp_row[0] if fp_row else None), entries
+
+    def save_project_manifest(self, project, fingerprint, entries):
+        """Replace the stored manifest of `project` with {dep_spec: entry}."""
+        now = datetime.now(timezone.utc)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DELETE FROM project_manifests WHERE project = ?", (project,))
+            conn.executemany(
+                "INSERT INTO project_manifests "
+                "(project, dep_spec, package_name, version, score, passed, timestamp) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        project,
+                        spec,
+                        canonical_name(e["package"]),
+                        e.get("version"),
+                        e["score"],
+                        int(e["passed"]),
+                        (e.get("timestamp") or now).isoformat(),
+                    )
+                    for spec, e in entries.items()
+                ],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO project_fingerprints "
+                "(project, fingerprint, timestamp) VALUES (?, ?, ?)",
+                (project, fingerprint, now.isoformat()),
+            )
+
+    # --- PORTABLE BUNDLES ---
+
+    def export_bundle(self, path):
+        """Write every cached audit to a gzip JSONL bundle; returns the row count.
+
+        Layout: a header line, one `[package, version, score, meta_json,
+        timestamp, expires_at]` array per line, then a trailer with the row
+        count and the sha256 of the row lines.
+        """
+        digest = hashlib.sha256()
+        count = 0
+        with (
+            sqlite3.connect(self.db_path) as conn,
+            gzip.open(path, "wb", compresslevel=6) as out,
+        ):
+            header = {
+                "format": BUNDLE_FORMAT,
+                "version": BUNDLE_VERSION,
+                "created": datetime.now(timezone.utc).isoformat(),
+            }
+            out.write(json.dumps(header).encode() + b"\n")
+            rows = conn.execute(
+                "SELECT package_name, version, score, meta_json, timestamp, "
+                "expires_at FROM audits ORDER BY package_name, version"
+            )
+            for row in rows:
+                line = json.dumps(row, separators=(",", ":")).encode() + b"\n"
+                digest.update(line)
+                out.write(line)
+                count += 1
+            out.write(
+                json.dumps({"rows": count, "sha256": digest.hexdigest()}).encode()
+                + b"\n"
+            )
+        return count
+
+    def import_bundle(self, path):
+        """Merge a bundle into the cache.
+
+        The newest entry per (package, version) is kept.
+
+        The whole bundle is verified before anything is written. Rows are
+        staged in a temporary table and merged with one upsert statement.
+        Returns (rows in bundle, rows inserted or updated).
+        """
+        digest = hashlib.sha256()
+        rows = []
+        try:
+            with gzip.open(path, "rb") as f:
+                header = json.loads(f.readline())
+                if header.get("format") != BUNDLE_FORMAT or header.get(
+                    "version"
+                ) not in (1, BUNDLE_VERSION):
+                    raise BundleError(f"not a {BUNDLE_FORMAT} v{BUNDLE_VERSION} file")
+                lines = f.read().splitlines(keepends=True)
+        except (OSError, EOFError, json.JSONDecodeError, AttributeError) as e:
+            raise BundleError(f"unreadable bundle: {e}") from e
+        if not lines:
+            raise BundleError("bundle is truncated (missing trailer)")
+        try:
+            trailer = json.loads(lines.pop())
+            for line in lines:
+                digest.update(line)
+            if (
+                trailer.get("rows") != len(lines)
+                or trailer.get("sha256") != digest.hexdigest()
+            ):
+                raise BundleError(
+                    "checksum mismatch; bundle is corrupt or was modified"
+                )
+            rows = [tuple(json.loads(line)) for line in lines]
+            # Bundles from older releases may carry non-canonical names, and v1
+            # rows have no expires_at
+            rows = [
+                (canonical_name(row[0]),)
+                + row[1:5]
+                + (row[5] if len(row) > 5 else None,)
+                for row in rows
+            ]
+        except (json.JSONDecodeError, AttributeError) as e:
+            raise BundleError(f"malformed bundle: {e}") from e
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "CREATE TEMP TABLE bundle_rows "
+                "(package_name TEXT, version TEXT, score INTEGER, meta_json TEXT, "
+                "timestamp DATETIME, expires_at DATETIME)"
+            )
+            conn.executemany("INSERT INTO bundle_rows VALUES (?, ?, ?, ?, ?, ?)", rows)
+            before = conn.total_changes
+            conn.execute(
+                """
+                INSERT INTO audits
+                    (package_name, version, score, meta_json, timestamp, expires_at)
+                SELECT package_name, version, score, meta_json, timestamp, expires_at
+                FROM bundle_rows WHERE true
+                ORDER BY timestamp
+                ON CONFLICT (package_name, version) DO UPDATE SET
+                    score = excluded.score, meta_json = excluded.meta_json,
+                    timestamp = excluded.timestamp, expires_at = excluded.expires_at
+                WHERE excluded.timestamp > audits.timestamp
+                """
+            )
+            merged = conn.total_changes - before
+            conn.execute("DROP TABLE bundle_rows")
+        self._memory.clear()
+        return len(rows), merged
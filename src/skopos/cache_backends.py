@@ -0,0 +1,172 @@
+"""Storage backends for cached audit verdicts.
+
+An entry is `{"score": int, "meta": dict, "timestamp": iso8601}` (plus an
+optional `"expires_at"` set by `cache warm`'s staggering) keyed by
+`(package_name, version)`. `version="latest"` asks for the most recently
+audited version; entries stored under that alias also carry `"version"`.
+`CacheManager` layers an in-process dict over `SQLiteBackend` and, when
+`cache.remote_url` is configured, an `HTTPBackend` shared by a fleet of
+machines.
+"""
+
+import json
+import sqlite3
+from typing import Any, Dict, Iterable, Optional, Protocol, Tuple
+
+import requests
+
+from skopos import metrics
+
+AuditKey = Tuple[str, str]
+Entry = Dict[str, Any]
+
+
+class CacheBackend(Protocol):
+    """Batched key-value store for audit entries."""
+
+    def get_many(self, keys: Iterable[AuditKey]) -> Dict[AuditKey, Entry]:
+        """Return the entries found; missing keys are simply absent."""
+
+    def put_many(self, entries: Dict[AuditKey, Entry]) -> None: ...
+
+
+class SQLiteBackend:
+    """The local `audits` table (created by `CacheManager`)."""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+
+    def get_many(self, keys: Iterable[AuditKey]) -> Dict[AuditKey, Entry]:
+        found = {}
+        with sqlite3.connect(self.db_path) as conn:
+            for name, version in keys:
+                if version == "latest":
+                    row = conn.execute(
+                        "SELECT score, meta_json, timestamp, expires_at FROM audits "
+                        "WHERE package_name = ? ORDER BY timestamp DESC LIMIT 1",
+                        (name,),
+                    ).fetchone()
+                else:
+                    row = conn.execute(
+                        "SELECT score, meta_json, timestamp, expires_at FROM audits "
+                        "WHERE package_name = ? AND version = ?",
+                        (name, version),
+                    ).fetchone()
+                if row:
+                    entry = {
+                        "score": row[0],
+                        "meta": json.loads(row[1]),
+                        "timestamp": row[2],
+                    }
+                    if row[3]:
+                        entry["expires_at"] = row[3]
+                    found[(name, version)] = entry
+        return found
+
+    def put_many(self, entries: Dict[AuditKey, Entry]) -> None:
+        """Upsert entries, never replacing a newer local row with an older one."""
+        rows = [
+            # "latest" aliases from the remote carry their concrete version
+            (
+                name,
+                e.get("version") if version == "latest" else version,
+                e["score"],
+                json.dumps(e["meta"]),
+                e["timestamp"],
+                e.get("expires_at"),
+            )
+            for (name, version), e in entries.items()
+        ]
+        rows = [row for row in rows if row[1] and row[1] != "latest"]
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                """
+                INSERT INTO audits
+                    (package_name, version, score, meta_json, timestamp, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (package_name, version) DO UPDATE SET
+                    score = excluded.score, meta_json = excluded.meta_json,
+                    timestamp = excluded.timestamp, expires_at = excluded.expires_at
+                WHERE excluded.timestamp >= audits.timestamp
+                """,
+                rows,
+            )
+
+
+def encode_key(key: AuditKey) -> str:
+    return f"{key[0]}=={key[1]}"
+
+
+def decode_key(text: str) -> AuditKey:
+    name, _, version = text.partition("==")
+    return name, version
+
+
+class HTTPBackend:
+    """Remote key-value store speaking a two-endpoint JSON protocol.
+
+    `POST {url}/mget` with `{"keys": ["name==version", ...]}` answers
+    `{"entries": {"name==version": entry}}`; `POST {url}/mput` with
+    `{"entries": {...}}` stores them. The remote cache is best effort:
+    errors are counted and treated as misses, never as audit failures.
+    """
+
+    def __init__(self, url: str, token: str = "", timeout: float = 2.0, session=None):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.headers = {"Authorization": f"Bearer {token}"} if token else {}
+        self._session = session
+
+    @property
+    def session(self):
+        if self._session is None:
+            from skopos import pypi
+
+            self._session = pypi.get_session()
+        return self._session
+
+    def get_many(self, keys: Iterable[AuditKey]) -> Dict[AuditKey, Entry]:
+        wanted = [encode_key(k) for k in keys]
+        if not wanted:
+            return {}
+        try:
+            response = self.session.post(
+                f"{self.url}/mget",
+                json={"keys": wanted},
+                headers=self.headers,
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            entries = response.json().get("entries", {})
+        except (requests.RequestException, ValueError, AttributeError):
+            metrics.REMOTE_CACHE_ERRORS.inc(op="mget")
+            return {}
+        wanted_set = set(wanted)
+        return {decode_key(k): v for k, v in entries.items() if k in wanted_set}
+
+    def put_many(self, entries: Dict[AuditKey, Entry]) -> None:
+        if not entries:
+            return
+        payload = {"entries": {encode_key(k): v for k, v in entries.items()}}
+        try:
+            response = self.session.post(
+                f"{self.url}/mput",
+                json=payload,
+                headers=self.headers,
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+        except requests.RequestException:
+            metrics.REMOTE_CACHE_ERRORS.inc(op="mput")
+
+
+def remote_backend_from_config(cfg: Dict[str, Any]) -> Optional[HTTPBackend]:
+    """Build the shared remote backend if `cache.remote_url` is set."""
+    opts = cfg.get("cache", {})
+    if not opts.get("remote_url"):
+        return None
+    return HTTPBackend(
+        opts["remote_url"],
+        opts.get("remote_token", ""),
+        opts.get("remote_timeout", 2.0),
+    )
@@ -1,7 +1,13 @@
 import argparse
 import hashlib
 import os
+import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import partial
 from pathlib import Path
 
 import requests
@@ -10,26 +16,50 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 
-from skopos.cache import CacheManager
+from skopos.cache import AUDIT_TTL, BundleError, CacheManager
+from skopos.cache_backends import remote_backend_from_config
+from skopos.config import config_fingerprint, load_config
+from skopos.metadata import as_metadata
+from skopos.names import canonical_name
+from skopos.manifests import (
+    discover_manifests,
+    is_manifest,
+    parse_manifest,
+    pinned_version,
+    pins_by_name,
+    requirement_delta,
+    requirement_name,
+    specs_by_name,
+)
 from skopos.checker_logic import (
+    IDENTITY_IMMUNE_RELEASES,
+    author_emails,
     calculate_skopos_score,
     check_author_reputation,
     check_for_typosquatting,
+    check_maintainer_footprint,
     check_reputation,
     check_resurrection,
     disable_hooks,
     scan_payload,
     check_for_updates,
-    check_identity
+    check_identity,
+    get_dependencies,
+    verdict_is_final,
+    PASS_THRESHOLD,
 )
 from skopos.integrations.snyk_adapter import SnykAdapter
 from skopos.integrations.socket_adapter import SocketAdapter
+from skopos.integrations.osv_adapter import OSVAdapter, import_osv_zip
+from skopos import metrics, profiling, pypi
+from skopos.profiling import span
+from skopos.watch import ManifestWatcher
 import re
 
 # --- CONFIGURATION ---
 VERSION = "0.22.0"
 console = Console()
-cache = CacheManager()
+cache = CacheManager(remote=remote_backend_from_config(load_config()))
 WHITELIST_FILE = os.path.expanduser("~/.skopos-whitelist")
 SIG_FILE = WHITELIST_FILE + ".sig"
 
@@ -46,8 +76,13 @@ def ensure_whitelist_exists():
 def is_whitelisted(package_name):
     if not os.path.exists(WHITELIST_FILE):
         return False
+    target = canonical_name(package_name)
     with open(WHITELIST_FILE, "r") as f:
-        return package_name in [l.strip() for l in f if not l.startswith("#")]
+        return any(
+            canonical_name(l) == target
+            for l in f
+            if l.strip() and not l.startswith("#")
+        )
 
 
 def add_to_whitelist(package_name):
@@ -83,16 +118,16 @@ def check_velocity(pypi_data: dict):
     Returns (status, meta) where meta includes the number of releases.
     """
     # Simple velocity heuristic: many releases in a short span is suspicious
-    releases = pypi_data.get("releases", {})
-    num_releases = len(releases)
+    meta = as_metadata(pypi_data)
+    num_releases = meta.release_count
 
     # If the project has an unusually high number of rapid releases, flag it
     if num_releases >= 20:
         return False, {"releases": num_releases}
 
     # Otherwise fall back to the resurrection logic for more nuanced checks
-    status, meta = check_resurrection(pypi_data)
-    meta_out = dict(meta) if isinstance(meta, dict) else {"info": meta}
+    status, evidence = check_resurrection(meta)
+    meta_out = dict(evidence) if isinstance(evidence, dict) else {"info": evidence}
     meta_out["releases"] = num_releases
     return status, meta_out
 
@@ -101,68 +136,429 @@ def check_velocity(pypi_data: dict):
 
 
 def fetch_pypi_data(package_name):
-    url = f"https://pypi.org/pypi/{package_name}/json"
+    """Fetch package metadata, or None if the package is missing or PyPI failed.
+
+    Returns a `PackageMetadata` from the release-history store for the
+    simple source, or the raw `/pypi/<name>/json` document for the legacy one.
+
+    Failures are remembered in the negative cache for `cache.not_found_ttl`
+    (404) or `cache.error_ttl` (anything else) seconds, and concurrent calls
+    for the same name share a single request.
+    """
+    package_name = canonical_name(package_name)
+    if cache.get_negative(package_name):
+        return None
+    data, shared = pypi.coalesce(package_name, lambda: _fetch_pypi_data(package_name))
+    if shared:
+        metrics.PYPI_FETCH_COALESCED.inc()
+    return data
+
+
+def _pypi_get(url, net, endpoint, headers=None):
+    response = pypi.get(
+        url,
+        timeout=net.get("timeout", 5),
+        max_retries=net.get("max_retries", 3),
+        backoff_base=net.get("backoff_base", 0.5),
+        backoff_max=net.get("backoff_max", 30),
+        headers=headers,
+    )
+    metrics.PYPI_BYTES.inc(len(response.content or b""), endpoint=endpoint)
+    return response
+
+
+def _last_serial(response, doc):
+    value = response.headers.get("X-PyPI-Last-Serial") or (doc.get("meta") or {}).get(
+        "_last-serial"
+    )
     try:
-        response = requests.get(url, timeout=5)
-        return response.json() if response.status_code == 200 else None
-    except Exception:
+        return int(value)
+    except (TypeError, ValueError):
         return None
 
 
-def check_package(package, args, depth=0):
-    if is_whitelisted(package):
-        console.print(
-            f"✅ [bold green]{package}[/bold green] is in your trusted whitelist. Skipping forensic audit."
+def _stored_metadata(package_name, info):
+    """Heuristic input read straight from the release-history tables."""
+    meta, _ = cache.load_release_history(package_name)
+    return _with_info(meta, info)
+
+
+def _with_info(meta, info):
+    meta.name = info.get("name") or meta.name
+    meta.version = info.get("version")
+    meta.author = (info.get("author") or "").strip()
+    meta.author_email = (info.get("author_email") or "").strip()
+    meta.maintainer_email = (info.get("maintainer_email") or "").strip()
+    meta.requires_dist = tuple(info.get("requires_dist") or ())
+    return meta
+
+
+def _fetch_simple(package_name, net):
+    """Metadata from the PEP 691 simple index via the incremental release-history store.
+
+    The page is requested with the stored ETag; a 304, or a page whose
+    `last_serial` matches the last sync, is answered from SQLite without
+    parsing. Otherwise only files not yet stored are mapped and inserted.
+    Author fields are only read for projects small enough to lose Giant's
+    Immunity, from the per-version legacy document. Returns
+    (status_code, PackageMetadata).
+    """
+    sync = cache.get_release_sync(package_name)
+    headers = {"Accept": pypi.SIMPLE_ACCEPT}
+    if sync and sync["etag"]:
+        headers["If-None-Match"] = sync["etag"]
+    response = _pypi_get(
+        f"{pypi.PYPI_URL}/simple/{package_name}/", net, "simple", headers=headers
+    )
+    if response.status_code == 304 and sync:
+        metrics.RELEASE_SYNCS.inc(result="not_modified")
+        return 200, _stored_metadata(package_name, sync["info"])
+    if response.status_code != 200:
+        return response.status_code, None
+
+    doc = response.json()
+    serial, etag = _last_serial(response, doc), response.headers.get("ETag")
+    if sync and serial is not None and serial == sync["last_serial"]:
+        metrics.RELEASE_SYNCS.inc(result="unchanged")
+        cache.save_release_sync(package_name, serial, etag, sync["info"])
+        return 200, _stored_metadata(package_name, sync["info"])
+
+    delta = pypi.simple_files_delta(
+        doc, cache.known_release_files(package_name) if sync else {}
+    )
+    if delta is None:
+        # Index without PEP 700 fields: use the full legacy document
+        return _fetch_legacy(package_name, net)
+    metrics.RELEASE_FILES_ADDED.inc(cache.apply_release_delta(package_name, *delta))
+    metrics.RELEASE_SYNCS.inc(result="updated" if sync else "full")
+
+    meta, yanked = cache.load_release_history(package_name)
+    version = pypi.latest_version(list(meta.versions), yanked)
+    info = {"name": doc.get("name", package_name), "version": version}
+    if version and meta.release_count <= IDENTITY_IMMUNE_RELEASES:
+        response = _pypi_get(
+            f"{pypi.PYPI_URL}/pypi/{package_name}/{version}/json", net, "json-version"
+        )
+        if response.status_code != 200:
+            return response.status_code, None
+        legacy = response.json().get("info", {})
+        info.update(
+            {
+                k: legacy.get(k)
+                for k in ("author", "author_email", "maintainer_email", "requires_dist")
+            }
         )
+    cache.save_release_sync(package_name, serial, etag, info)
+    return 200, _with_info(meta, info)
+
+
+def _fetch_legacy(package_name, net):
+    response = _pypi_get(f"{pypi.PYPI_URL}/pypi/{package_name}/json", net, "json")
+    return response.status_code, (
+        response.json() if response.status_code == 200 else None
+    )
+
+
+def _fetch_pypi_data(package_name):
+    cfg = load_config()
+    ttls, net = cfg.get("cache", {}), cfg.get("pypi", {})
+    fetch = (
+        _fetch_simple
+        if net.get("metadata_source", "simple") == "simple"
+        else _fetch_legacy
+    )
+    start = time.perf_counter()
+    try:
+        status, data = fetch(package_name, net)
+        if status == 200:
+            return data
+        reason = "not_found" if status == 404 else "error"
+        metrics.PYPI_FETCH_FAILURES.inc(reason=str(status))
+    except Exception:
+        metrics.PYPI_FETCH_FAILURES.inc(reason="error")
+        reason = "error"
+    finally:
+        metrics.PYPI_FETCH_DURATION.observe(time.perf_counter() - start)
+    cache.save_negative(package_name, reason, ttls.get(f"{reason}_ttl", 0))
+    return None
+
+
+def check_package(package, args, depth=0, version=None):
+    """Audit `package`; `version` is an exact pin from a manifest or `name==x.y`."""
+    package = canonical_name(package)
+    start = time.perf_counter()
+    with span("check_package"):
+        result = _check_package(package, args, version=version)
+    metrics.AUDIT_DURATION.observe(time.perf_counter() - start)
+    return result
+
+
+def _check_package(package, args, use_cache=True, report=True, version=None):
+    """Staged audit, cheapest stage first, stopping once the verdict is decided.
+
+    Order: name-only heuristics, whitelist, cached verdict, metadata fetch,
+    metadata heuristics, adapters, artifact scan. Findings only lower the
+    score, so once it drops below the pass threshold the remaining stages
+    are skipped and listed in the report; an obvious typosquat is blocked
+    without any network I/O. Refreshes pass `use_cache=False, report=False`.
+    A pinned `version` is what the adapters check and what the verdict is
+    cached under; other heuristics look at the project as a whole.
+    """
+    with span("heuristic.typosquatting"):
+        typo_check = check_for_typosquatting(package)
+    with span("whitelist"):
+        whitelisted = is_whitelisted(package)
+    if whitelisted:
+        if report:
+            console.print(
+                f"✅ [bold green]{package}[/bold green] is in your trusted whitelist. Skipping forensic audit."
+            )
+        metrics.AUDITS.inc(result="whitelisted")
         return True, 100
 
-    cached = cache.get_cached_audit(package, "latest")
-    if cached:
-        score, _ = cached
-        if score >= 80:
-            return True, score
+    findings = {"Typosquatting": typo_check}
+    if verdict_is_final(findings):
+        metrics.EARLY_EXITS.inc(stage="name")
+        return _finish_audit(
+            package, None, findings, ["metadata", "adapters", "artifacts"], report
+        )
+
+    score = _cached_pass(package, version) if use_cache else None
+    if score is not None:
+        metrics.AUDITS.inc(result="cached")
+        return True, score
 
-    data = fetch_pypi_data(package)
+    with span("pypi.fetch"):
+        data = fetch_pypi_data(package)
     if not data:
-        console.print(f"❌ [red]Package '{package}' not found on PyPI.[/red]")
+        if report:
+            console.print(f"❌ [red]Package '{package}' not found on PyPI.[/red]")
+        metrics.AUDITS.inc(result="not_found")
         return False, 0
 
-    info = data.get("info", {})
-    typo_check = check_for_typosquatting(package)
-    payload_passed, payload_meta = scan_payload(package, data)
+    # Keep only the fields the heuristics read; the raw document is dropped here
+    meta = as_metadata(data)
+    del data
+    stages = (
+        ("metadata", _metadata_findings),
+        ("adapters", partial(_adapter_findings, version=version)),
+        ("artifacts", _artifact_findings),
+    )
+    for i, (stage, run) in enumerate(stages):
+        run(package, meta, findings)
+        if verdict_is_final(findings) and i + 1 < len(stages):
+            metrics.EARLY_EXITS.inc(stage=stage)
+            return _finish_audit(
+                package,
+                meta,
+                findings,
+                [name for name, _ in stages[i + 1 :]],
+                report,
+                version,
+            )
+    return _finish_audit(package, meta, findings, [], report, version)
+
+
+def _cached_pass(package, version):
+    """The score of a cached (or servable stale) passing verdict, else None."""
+    with span("cache.lookup"):
+        cached = cache.get_cached_audit(package, version or "latest") or _serve_stale(
+            package, version
+        )
+    if cached and cached[0] >= PASS_THRESHOLD:
+        return cached[0]
+    return None
+
 
-    findings = {
-        "Typosquatting": typo_check,
-        "Identity": check_author_reputation(package, data), # <-- Add 'package' here
-        "Reputation": check_reputation(package, data),
-        "Resurrection": check_resurrection(data),
-        "Payload": (payload_passed, payload_meta),
-    }
+def _metadata_findings(package, meta, findings):
+    with span("heuristic.identity"):
+        findings["Identity"] = check_author_reputation(package, meta)
+    with span("heuristic.reputation"):
+        findings["Reputation"] = check_reputation(package, meta)
+    with span("heuristic.resurrection"):
+        findings["Resurrection"] = check_resurrection(meta)
+    with span("heuristic.maintainer"):
+        # Read-only here: the package joins the index once its audit is saved
+        authors = cache.author_stats(package, author_emails(meta), _first_upload(meta))
+        findings["Maintainer"] = check_maintainer_footprint(authors)
 
-    # Integrations: enrichment (opt-in, offline-first)
+
+def _first_upload(meta):
+    uploads = meta.upload_timestamps()
+    return min(uploads) if uploads else time.time()
+
+
+def _adapter_findings(package, meta, findings, version=None):
+    """Integrations: enrichment (opt-in, offline-first)."""
     try:
-        snyk = SnykAdapter()
-        snyk_enrich = snyk.enrich(package, data)
+        with span("adapter.snyk"):
+            snyk = SnykAdapter()
+            snyk_enrich = snyk.enrich(package, meta)
         if snyk_enrich:
             vulns = snyk_enrich.get("vulnerabilities", [])
             findings["Snyk"] = (len(vulns) == 0, vulns)
     except Exception:
         # Do not fail audit on integration errors
-        pass
+        metrics.ADAPTER_ERRORS.inc(adapter="snyk")
 
     try:
-        socket = SocketAdapter()
-        socket_enrich = socket.enrich(package, data)
+        with span("adapter.osv"):
+            osv = OSVAdapter()
+            osv_enrich = osv.enrich(package, meta, version)
+        if osv_enrich:
+            vulns = osv_enrich.get("vulnerabilities", [])
+            findings["OSV"] = (len(vulns) == 0, vulns)
+    except Exception:
+        metrics.ADAPTER_ERRORS.inc(adapter="osv")
+
+    try:
+        with span("adapter.socket"):
+            socket = SocketAdapter()
+            socket_enrich = socket.enrich(package, meta)
         if socket_enrich:
             findings["Socket"] = (True, socket_enrich)
     except Exception:
-        pass
+        metrics.ADAPTER_ERRORS.inc(adapter="socket")
+
 
+def _artifact_findings(package, meta, findings):
+    with span("heuristic.payload"):
+        findings["Payload"] = scan_payload(package, meta)
+
+
+def _finish_audit(package, meta, findings, skipped, report=True, version=None):
+    """Score, cache and report an audit.
+
+    `skipped` names the stages cut short by an early exit.
+    """
+    if skipped:
+        findings["Skipped"] = (True, skipped)
     score = calculate_skopos_score(findings)
-    cache.save_audit(package, info.get("version", "0.0.0"), score, findings)
-    display_report(package, findings, score)
+    if meta is not None:
+        # Name-only verdicts are not cached: they are cheaper to recompute than
+        # to look up
+        with span("cache.save"):
+            cache.save_audit(
+                package, version or meta.version or "0.0.0", score, findings
+            )
+            cache.index_authors(package, author_emails(meta), _first_upload(meta))
+    if report:
+        with span("render.report"):
+            display_report(package, findings, score)
+
+    metrics.AUDITS.inc(result="pass" if score >= PASS_THRESHOLD else "fail")
+    return score >= PASS_THRESHOLD, score
+
+
+# Names (or `name==x.y` pins) answered from a stale verdict this run,
+# re-audited by revalidate_in_background()
+_STALE = set()
+_STALE_LOCK = threading.Lock()
+
+
+def _target_key(name, version):
+    return f"{name}=={version}" if version else name
+
+
+def _serve_stale(package, version=None):
+    """A stale passing verdict inside the `cache.stale_ttl` window.
+
+    The package is queued for revalidation.
+
+    A pinned `version` is looked up and revalidated as that exact pin.
+    Verdicts scoring below `cache.revalidate_below` are borderline and are
+    never served stale: the caller re-audits them synchronously.
+    """
+    opts = load_config().get("cache", {})
+    stale = cache.get_stale_audit(
+        package, version or "latest", opts.get("stale_ttl", 0)
+    )
+    if stale is None or stale[0] < max(
+        opts.get("revalidate_below", 90), PASS_THRESHOLD
+    ):
+        return None
+    metrics.CACHE_REQUESTS.inc(result="stale")
+    with _STALE_LOCK:
+        _STALE.add(_target_key(package, version))
+    return stale
+
+
+def refresh_audits(packages, max_workers=pypi.POOL_SIZE):
+    """Re-audit packages bypassing the cache, without printing.
+
+    `packages` are names or requirement specs; an exact `name==x.y` pin
+    audits (and caches) that version, anything else the latest release.
+    Returns {name or "name==x.y": (passed, score)}.
+    """
+    targets = list(
+        dict.fromkeys(
+            (canonical_name(requirement_name(p) or p), pinned_version(p))
+            for p in packages
+        )
+    )
+    if not targets:
+        return {}
+
+    def refresh(target):
+        name, version = target
+        return _check_package(
+            name, None, use_cache=False, report=False, version=version
+        )
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(targets))) as pool:
+        results = pool.map(refresh, targets)
+        return {
+            _target_key(*target): result for target, result in zip(targets, results)
+        }
+
+
+def warm_cache(sources, jobs=32, spread_hours=6.0):
+    """Pre-audit every package named by `sources` (manifest paths or requirement specs).
+
+    Exact pins (every `uv.lock` entry, `name==x.y` lines) are audited at
+    the pinned version, which is what pinned lookups read; other
+    requirements at the latest release. Packages are re-audited with the
+    cache bypassed, `jobs` at a time, and their expiries are then staggered
+    over the last `spread_hours` of the TTL.
+    Returns {name or "name==x.y": (passed, score)}.
+    """
+    specs = []
+    for source in sources:
+        if Path(source).is_file():
+            found = parse_manifest(str(source), _read_text(source))
+            pins = pins_by_name(found)
+            specs.extend(
+                _target_key(name, pins.get(name)) for name in specs_by_name(found)
+            )
+        else:
+            specs.append(source)
+    with span("cache.warm"):
+        results = refresh_audits(specs, max_workers=jobs)
+    keys = [(requirement_name(key), pinned_version(key)) for key in results]
+    # Stagger first, so the writes queued for a remote cache carry their expiry
+    cache.stagger_expiry(keys, timedelta(hours=spread_hours))
+    cache.flush()
+    return results
 
-    return score >= 80, score
+
+def revalidate_in_background():
+    """Hand packages served stale to a detached `skopos cache refresh` process.
+
+    The refresh outlives this process, so the command (and a shim waiting on
+    it) exits as soon as its own verdicts are printed.
+    """
+    with _STALE_LOCK:
+        specs = sorted(_STALE)
+        _STALE.clear()
+    if not specs:
+        return None
+    return subprocess.Popen(
+        [sys.executable, "-m", "skopos.checker", "cache", "refresh", *specs],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
 
 
 def display_report(package, results, score):
@@ -179,6 +575,9 @@ def display_report(package, results, score):
             is_squat, target = val
             status = "[red]FAIL[/red]" if is_squat else "[green]PASS[/green]"
             evidence = f"Possible squat of: {target}" if is_squat else "None detected"
+        elif name == "Skipped":
+            status = "[dim]SKIP[/dim]"
+            evidence = f"Verdict decided before: {', '.join(val[1])}"
         else:
             status = "[green]PASS[/green]" if val[0] else "[red]FAIL[/red]"
             evidence = str(val[1])
@@ -187,9 +586,68 @@ def display_report(package, results, score):
     console.print(table)
 
 
+def display_profile(trace_file=None):
+    """Print the per-phase timing breakdown and optionally write a Chrome trace."""
+    table = Table(title="Skopos Profile")
+    table.add_column("Phase", style="cyan")
+    table.add_column("Calls", justify="right")
+    table.add_column("Total (ms)", justify="right")
+    table.add_column("Max (ms)", justify="right", style="dim")
+    for entry in profiling.summary():
+        table.add_row(
+            entry["phase"],
+            str(entry["calls"]),
+            f"{entry['total_ms']:.2f}",
+            f"{entry['max_ms']:.2f}",
+        )
+    console.print(table)
+    if trace_file:
+        profiling.write_chrome_trace(trace_file)
+        console.print(f"🧭 [dim]Trace written to {trace_file}[/dim]")
+
+
 # --- COMMANDS ---
 
 
+def _audit_context_fingerprint():
+    """Hash of everything besides the dependency list that can change a verdict."""
+    sig = ""
+    if os.path.exists(SIG_FILE):
+        with open(SIG_FILE, "r") as f:
+            sig = f.read().strip()
+    return hashlib.sha256((config_fingerprint() + sig).encode()).hexdigest()[:16]
+
+
+def plan_incremental_audit(dependencies, fingerprint, previous, now=None):
+    """Split dependency specs into (reusable manifest entries, specs to re-audit).
+
+    A previous entry is reused only when the config/whitelist context is
+    unchanged, the exact spec is still present, it passed, and it has not
+    outlived the audit cache TTL. Failures are always re-audited so the
+    interactive whitelist prompt behaves exactly like a full audit.
+    """
+    now = now or datetime.now(timezone.utc)
+    context = _audit_context_fingerprint()
+    old_context = (fingerprint or ":").split(":", 1)[0]
+    reuse = {}
+    if old_context == context:
+        reuse = {
+            spec: entry
+            for spec, entry in previous.items()
+            if spec in dependencies
+            and entry["passed"]
+            and now - entry["timestamp"] < AUDIT_TTL
+        }
+    return reuse, [d for d in dependencies if d not in reuse]
+
+
+def _save_manifest(project, dependencies, entries):
+    depset = hashlib.sha256("\n".join(sorted(dependencies)).encode()).hexdigest()[:16]
+    cache.save_project_manifest(
+        project, f"{_audit_context_fingerprint()}:{depset}", entries
+    )
+
+
 def audit_project(args):
     console.print(
         Panel(
@@ -197,43 +655,388 @@ def audit_project(args):
         )
     )
     try:
-        with open("pyproject.toml", "rb") as f:
+        with span("audit.parse_manifest"), open("pyproject.toml", "rb") as f:
             project_data = tomllib.load(f)
-            dependencies = project_data.get("project", {}).get("dependencies", [])
-            for dep_str in dependencies:
-                name = (
-                    dep_str.split(">")[0]
-                    .split("=")[0]
-                    .split("<")[0]
-                    .split("[")[0]
-                    .strip()
-                )
-                passed, score = check_package(name, args)
-                if not passed:
-                    console.print(
-                        f"\n⚠️  [bold yellow]Risk Detected:[/bold yellow] {name} scored {score}/100"
-                    )
-                    choice = input(f"   Trust and whitelist {name}? (y/N): ").lower()
-                    if choice == "y":
-                        add_to_whitelist(name)
-                        sign_whitelist()
-                    else:
-                        console.print(
-                            "🛑 [red]Audit failed. Installation blocked.[/red]"
-                        )
-                        sys.exit(1)
-            console.print(
-                "\n✨ [bold green]Audit Complete. Environment is secure.[/bold green]"
-            )
     except FileNotFoundError:
         console.print("❌ [red]pyproject.toml not found.[/red]")
         sys.exit(1)
 
+    dependencies = project_data.get("project", {}).get("dependencies", [])
+    project = str(Path("pyproject.toml").resolve())
+    entries = {}
+    if getattr(args, "full", False):
+        pending = list(dependencies)
+    else:
+        fingerprint, previous = cache.get_project_manifest(project)
+        entries, pending = plan_incremental_audit(dependencies, fingerprint, previous)
+        if entries:
+            console.print(
+                f"♻️  [dim]Reusing {len(entries)} unchanged verdict(s) from the "
+                f"last audit; {len(pending)} to check.[/dim]"
+            )
+
+    with span("audit_project"):
+        for dep_str in pending:
+            name = requirement_name(dep_str)
+            if not name:
+                continue
+            pin = pinned_version(dep_str)
+            passed, score = check_package(name, args, version=pin)
+            entry = {
+                "package": name,
+                "version": pin or cache.latest_version(name),
+                "score": score,
+                "passed": passed,
+            }
+            entries[dep_str] = entry
+            if not passed:
+                console.print(
+                    f"\n⚠️  [bold yellow]Risk Detected:[/bold yellow] {name} scored {score}/100"
+                )
+                choice = input(f"   Trust and whitelist {name}? (y/N): ").lower()
+                if choice == "y":
+                    add_to_whitelist(name)
+                    sign_whitelist()
+                    entry["passed"] = True
+                else:
+                    _save_manifest(project, dependencies, entries)
+                    console.print("🛑 [red]Audit failed. Installation blocked.[/red]")
+                    sys.exit(1)
+    _save_manifest(project, dependencies, entries)
+    if getattr(args, "recursive", False):
+        direct = {
+            canonical_name(e["package"]): (e["passed"], e["score"])
+            for e in entries.values()
+        }
+        results = audit_tree(list(direct), args, args.max_depth, direct)
+        failed = [name for name, (passed, _) in results.items() if not passed]
+        if failed:
+            console.print(
+                "🛑 [red]Transitive dependencies failed the audit: "
+                f"{', '.join(sorted(failed))}[/red]"
+            )
+            sys.exit(1)
+    console.print(
+        "\n✨ [bold green]Audit Complete. Environment is secure.[/bold green]"
+    )
+
+
+def audit_monorepo(root, args):
+    """Audit every manifest under `root` in one pass.
+
+    The pass covers the union of their requirements.
+
+    Each unique package is audited once, concurrently; verdicts are then
+    mapped back to every manifest that lists it. Returns True if all pass.
+    """
+    root = Path(root)
+    with span("audit.discover"):
+        paths = discover_manifests(root)
+    users, pins = {}, {}
+    with span("audit.parse_manifest"):
+        for path in paths:
+            try:
+                text = path.read_text()
+            except (OSError, UnicodeDecodeError):
+                continue
+            specs = parse_manifest(str(path), text)
+            for name in specs_by_name(specs):
+                users.setdefault(name, []).append(path.relative_to(root).as_posix())
+            for name, version in pins_by_name(specs).items():
+                pins.setdefault(name, set()).add(version)
+    console.print(
+        Panel(
+            f"🔍 [bold]Skopos Tree Audit[/bold]\nTarget: {root} "
+            f"({len(paths)} manifests, {len(users)} unique packages)",
+            expand=False,
+        )
+    )
+    results = audit_many(list(users), args, pins={n: min(v) for n, v in pins.items()})
+    # Projects pinning different versions of one package: every pin must pass
+    for name, versions in pins.items():
+        for version in sorted(versions - {min(versions)}):
+            passed, score = check_package(name, args, version=version)
+            results[name] = (results[name][0] and passed, min(results[name][1], score))
+
+    failed = sorted(name for name, (passed, _) in results.items() if not passed)
+    if not failed:
+        console.print(
+            "\n✨ [bold green]Audit Complete. Every project is secure.[/bold green]"
+        )
+        return True
+    table = Table(title="Failed packages")
+    table.add_column("Package", style="cyan")
+    table.add_column("Score", justify="right")
+    table.add_column("Used by", style="dim")
+    for name in failed:
+        table.add_row(name, str(results[name][1]), ", ".join(users[name]))
+    console.print(table)
+    console.print(
+        "🛑 [red]Audit failed. Whitelist with care or drop the dependencies.[/red]"
+    )
+    return False
+
+
+def audit_many(packages, args, max_workers=pypi.POOL_SIZE, pins=None):
+    """Audit several packages concurrently in this process.
+
+    `pins` maps canonical names to exact pinned versions to audit instead of
+    the latest release. Returns {name: (passed, score)}.
+    """
+    unique = list(dict.fromkeys(canonical_name(p) for p in packages))
+    pins = pins or {}
+    if len(unique) <= 1:
+        return {
+            name: check_package(name, args, version=pins.get(name)) for name in unique
+        }
+    # One batched round trip per cache tier instead of one per package
+    cache.prefetch([(name, pins.get(name, "latest")) for name in unique])
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(unique))) as pool:
+        results = pool.map(
+            lambda name: check_package(name, args, version=pins.get(name)), unique
+        )
+        return dict(zip(unique, results))
+
+
+def _dependencies(package, version):
+    """Dependency names of `package==version`.
+
+    Read from the edge table, else from the per-version document.
+    """
+    deps = cache.get_dependencies(package, version)
+    if deps is not None:
+        metrics.DEPENDENCY_LOOKUPS.inc(result="cached")
+        return deps
+    metrics.DEPENDENCY_LOOKUPS.inc(result="fetched")
+    try:
+        response = _pypi_get(
+            f"{pypi.PYPI_URL}/pypi/{package}/{version}/json",
+            load_config().get("pypi", {}),
+            "json-version",
+        )
+        if response.status_code != 200:
+            return []
+        requires = get_dependencies(response.json())
+    except (requests.RequestException, ValueError):
+        return []
+    return cache.save_dependencies(package, version, requires)
+
+
+def audit_tree(roots, args, max_depth, verdicts=None):
+    """Audit `roots` and their dependencies down to `max_depth` levels.
+
+    Returns {name: (passed, score)}.
+
+    Edges are cached per release, and every passing subtree gets a rollup;
+    a subtree whose rollup is still valid (all nodes freshly audited at the
+    same versions) is neither audited nor walked again, so subtrees shared
+    between projects cost one lookup. `verdicts` seeds already-audited
+    packages.
+    """
+    verdicts = dict(verdicts or {})
+    roots = list(dict.fromkeys(canonical_name(r) for r in roots))
+    memo = {}
+    with span("audit_tree"):
+        pending = [
+            r
+            for r in roots
+            if _reused_subtree(r, max_depth, verdicts, memo) is None
+            and r not in verdicts
+        ]
+        verdicts.update(audit_many(pending, args))
+        for root in roots:
+            _audit_subtree(root, max_depth, verdicts, args, (), memo)
+    return verdicts
+
+
+def _reused_subtree(package, depth, verdicts, memo):
+    """(True, lowest score, nodes) from a still-valid rollup of `package`, else None."""
+    if (package, depth) in memo:
+        return memo[(package, depth)]
+    version = cache.latest_version(package)
+    rollup = (
+        cache.get_subtree(package, version, depth, PASS_THRESHOLD)
+        if version and depth > 0
+        else None
+    )
+    if rollup is None:
+        return None
+    metrics.SUBTREE_ROLLUPS.inc(result="reused")
+    score, nodes = rollup
+    verdicts.setdefault(package, (True, score))
+    memo[(package, depth)] = result = (True, score, nodes)
+    return result
+
+
+def _audit_subtree(package, depth, verdicts, args, path, memo):
+    """(passed, lowest score, {node: version}) for `package` and its dependencies."""
+    if (package, depth) in memo:
+        return memo[(package, depth)]
+    passed, score = verdicts[package]
+    version = cache.latest_version(package)
+    nodes = {package: version}
+    if depth <= 0 or version is None:
+        return passed, score, nodes
+
+    deps = [d for d in _dependencies(package, version) if d not in path]
+    # Siblings without a reusable rollup are audited concurrently before descending
+    pending = [
+        d
+        for d in deps
+        if _reused_subtree(d, depth - 1, verdicts, memo) is None and d not in verdicts
+    ]
+    verdicts.update(audit_many(pending, args))
+    for dep in deps:
+        dep_passed, dep_score, dep_nodes = _audit_subtree(
+            dep, depth - 1, verdicts, args, path + (package,), memo
+        )
+        passed, score = passed and dep_passed, min(score, dep_score)
+        nodes.update(dep_nodes)
+    if passed:
+        cache.save_subtree(package, version, depth, score, nodes)
+        metrics.SUBTREE_ROLLUPS.inc(result="saved")
+    memo[(package, depth)] = result = (passed, score, nodes)
+    return result
+
+
+def _git_show(revision_path):
+    """File contents at `<rev>:<path>` from git, or "" if it does not exist there."""
+    proc = subprocess.run(
+        ["git", "show", revision_path], capture_output=True, text=True
+    )
+    return proc.stdout if proc.returncode == 0 else ""
+
+
+def _staged_manifests():
+    proc = subprocess.run(
+        ["git", "diff", "--cached", "--name-only", "--diff-filter=ACMR"],
+        capture_output=True,
+        text=True,
+    )
+    return [p for p in proc.stdout.splitlines() if is_manifest(p)]
+
+
+def precommit_delta(files, pins=None):
+    """Names added or changed in the staged version of each manifest vs. HEAD.
+
+    Exact pins among the staged requirements are collected into `pins` if given.
+    """
+    names = []
+    for path in files:
+        staged = parse_manifest(path, _git_show(f":{path}"))
+        head = parse_manifest(path, _git_show(f"HEAD:{path}"))
+        names.extend(requirement_delta(head, staged))
+        if pins is not None:
+            pins.update(pins_by_name(staged))
+    return list(dict.fromkeys(names))
+
+
+def precommit(files, args):
+    """pre-commit entry point: audit only requirements the staged diff introduces."""
+    with span("precommit.diff"):
+        pins = {}
+        delta = precommit_delta(files or _staged_manifests(), pins)
+    if not delta:
+        console.print("✅ [dim]skopos: no new or changed dependencies staged.[/dim]")
+        return True
+    console.print(f"🔍 [bold]skopos pre-commit:[/bold] auditing {', '.join(delta)}")
+    results = audit_many(delta, args, pins=pins)
+    failed = [name for name, (passed, _) in results.items() if not passed]
+    for name in failed:
+        console.print(
+            f"🛑 [red]{name} scored {results[name][1]}/100.[/red] "
+            "Whitelist it with care or drop the change."
+        )
+    return not failed
+
+
+def _read_text(path):
+    try:
+        return Path(path).read_text()
+    except (OSError, UnicodeDecodeError):
+        return ""
+
+
+def watch(paths, args, watcher=None, rounds=None):
+    """Re-audit requirements added or changed in `paths` each time they are saved.
+
+    Runs until interrupted (or for `rounds` change bursts). Config, caches
+    and the HTTP pool live in this process, so each round only pays for
+    the packages it has to audit.
+    """
+    paths = [Path(p) for p in paths]
+    watcher = watcher or ManifestWatcher(paths)
+    texts = {p: _read_text(p) for p in paths}
+    console.print(
+        f"👀 [bold]skopos watch:[/bold] {', '.join(str(p) for p in paths)} "
+        "[dim](Ctrl+C to stop)[/dim]"
+    )
+    done = 0
+    while rounds is None or done < rounds:
+        changed = watcher.wait()
+        done += 1
+        delta, pins = [], {}
+        for path in changed:
+            text = _read_text(path)
+            specs = parse_manifest(str(path), text)
+            delta.extend(
+                requirement_delta(parse_manifest(str(path), texts[path]), specs)
+            )
+            pins.update(pins_by_name(specs))
+            texts[path] = text
+        delta = list(dict.fromkeys(delta))
+        if not delta:
+            console.print("✅ [dim]No new or changed dependencies.[/dim]")
+            continue
+        console.print(f"🔍 [bold]Auditing[/bold] {', '.join(delta)}")
+        with span("watch.audit"):
+            results = audit_many(delta, args, pins=pins)
+        cache.flush()
+        revalidate_in_background()
+        for name in sorted(results):
+            passed, score = results[name]
+            if not passed:
+                console.print(
+                    f"🛑 [red]{name} scored {score}/100.[/red] "
+                    "Whitelist it with care or drop the change."
+                )
+
+
+def _watched_manifests(directory="."):
+    root = Path(directory)
+    found = [
+        root / "pyproject.toml",
+        root / "uv.lock",
+        *sorted(root.glob("requirements*.txt")),
+    ]
+    return [p for p in found if p.exists()]
+
+
+# `uv add` flags whose value is not a package (kept in sync with scripts/skopos-uv.sh)
+_UV_VALUE_FLAGS = (
+    "--with|--group|--optional|--extra|--rev|--tag|--branch|--index|--default-index|--index-url|"
+    "--extra-index-url|--find-links|-f|--python|-p|--package|--script|--requirements|-r|--constraints|-c|"
+    "--marker|-m|--bounds|--directory|--project|--config-file|--cache-dir|--with-editable|"
+    "--with-requirements|--env-file"
+)
+
 
 def install_shell_hook():
     shell = os.environ.get("SHELL", "")
     rc = os.path.expanduser("~/.zshrc" if "zsh" in shell else "~/.bashrc")
-    hook = f'\n# Skopos v{VERSION}\nuv() {{ if [[ "$1" == "add" ]]; then skopos check "$2" || return 1; fi; command uv "$@"; }}\n'
+    # One line, so disable_hooks() can remove it; every package of `uv add` goes
+    # to one check
+    hook = (
+        f"\n# Skopos v{VERSION}\n"
+        'uv() { if [[ "$1" == "add" ]]; then local skopos_pkgs=() skopos_skip=0 arg; '
+        'for arg in "${@:2}"; do '
+        "if [[ $skopos_skip -eq 1 ]]; then skopos_skip=0; continue; fi; "
+        f'case "$arg" in {_UV_VALUE_FLAGS}) skopos_skip=1 ;; -*) ;; '
+        '*) skopos_pkgs+=("$arg") ;; esac; done; '
+        "[[ ${#skopos_pkgs[@]} -eq 0 ]] || "
+        'skopos check "${skopos_pkgs[@]}" || return 1; '
+        'fi; command uv "$@"; }\n'
+    )
     with open(rc, "a") as f:
         f.write(hook)
     console.print(f"✅ Hook installed in {rc}.")
@@ -307,16 +1110,7 @@ def set_integration_offline_file(provider: str, offline_path: str, target_path:
         return False
 
 
-def main():
-    """v0.22.0: Official Entry Point - Forensic Gatekeeper"""
-
-    # 1. Security First: Verify Whitelist Integrity
-    ensure_whitelist_exists()
-    if not verify_whitelist_integrity():
-        console.print("🚨 [bold red]WHITELIST TAMPERED![/bold red] Signature mismatch.")
-        sys.exit(1)
-
-    # 2. Setup Base Parser
+def _build_parser():
     parser = argparse.ArgumentParser(
         prog="skopos",
         description=f"🛡️ Skopos v{VERSION}: Proactive Supply-Chain Defense",
@@ -338,12 +1132,43 @@ def main():
         help="Enforce blocking mode: return non-zero exit code when audits fail (useful for CI)",
     )
 
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print a per-phase timing breakdown after check/audit",
+    )
+    parser.add_argument(
+        "--trace-file",
+        metavar="PATH",
+        help="Write a Chrome trace-event JSON file of the run (implies --profile)",
+    )
+
+    parser.add_argument(
+        "--metrics-file",
+        metavar="PATH",
+        help="Write OpenMetrics text (cache hits, fetch latency, phase timings) "
+        "at the end of the run",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        metavar="PORT",
+        help="Serve OpenMetrics on http://127.0.0.1:PORT/metrics while skopos runs",
+    )
+
     # 3. Setup Subcommands (check, audit)
     subparsers = parser.add_subparsers(dest="command", help="Skopos Forensic Commands")
 
     # Command: 'check'
-    check_p = subparsers.add_parser("check", help="Audit a specific package from PyPI")
-    check_p.add_argument("package", help="The name of the package to check")
+    check_p = subparsers.add_parser(
+        "check", help="Audit one or more packages from PyPI"
+    )
+    check_p.add_argument(
+        "packages",
+        nargs="+",
+        metavar="package",
+        help="Package names (or requirement specs) to check concurrently",
+    )
     check_p.add_argument(
         "--recursive",
         "-r",
@@ -364,6 +1189,48 @@ def main():
     audit_p.add_argument(
         "--max-depth", type=int, default=2, help="Depth for recursive auditing"
     )
+    audit_p.add_argument(
+        "--full",
+        action="store_true",
+        help="Ignore the per-project manifest and re-audit every dependency",
+    )
+    audit_p.add_argument(
+        "--tree",
+        metavar="DIR",
+        help="Audit every pyproject.toml/requirements*.txt under DIR "
+        "(deduplicated, non-interactive)",
+    )
+
+    # Command: 'precommit'
+    precommit_p = subparsers.add_parser(
+        "precommit",
+        help="Audit only dependencies added or changed in staged manifests "
+        "(pre-commit hook)",
+    )
+    precommit_p.add_argument(
+        "files",
+        nargs="*",
+        help="Manifests passed by pre-commit "
+        "(defaults to staged pyproject.toml/requirements*.txt)",
+    )
+
+    # Command: 'watch'
+    watch_p = subparsers.add_parser(
+        "watch",
+        help="Re-audit added or changed requirements whenever a manifest is saved",
+    )
+    watch_p.add_argument(
+        "files",
+        nargs="*",
+        help="Manifests to watch "
+        "(defaults to pyproject.toml, uv.lock and requirements*.txt here)",
+    )
+    watch_p.add_argument(
+        "--debounce",
+        type=float,
+        default=0.3,
+        help="Seconds a burst of edits must settle before auditing (default: 0.3)",
+    )
 
     # Command: 'config'
     config_p = subparsers.add_parser("config", help="Manage skopos configuration")
@@ -377,42 +1244,249 @@ def main():
     load_snyk_p.add_argument("path", help="Path to local Snyk JSON feed")
     load_snyk_p.add_argument("--target", help="Optional target config path (for testing)")
 
+    import_osv_p = integ_sub.add_parser(
+        "import-osv", help="Import an OSV export zip into the local advisory store"
+    )
+    import_osv_p.add_argument(
+        "path", help="Path to an OSV export zip (e.g. PyPI/all.zip)"
+    )
+    import_osv_p.add_argument(
+        "--db",
+        help="Optional advisory store path (defaults to integrations.osv.db_path)",
+    )
+
     demo_snyk_p = integ_sub.add_parser("demo-snyk", help="Show offline Snyk enrichment for a package without contacting PyPI")
     demo_snyk_p.add_argument("package", help="Package name to demo enrichment for")
 
-    # 4. Parsing
+    # Command: 'cache' (portable bundles for seeding CI runners)
+    cache_p = subparsers.add_parser(
+        "cache", help="Export, import, warm or refresh the local audit cache"
+    )
+    cache_sub = cache_p.add_subparsers(dest="cache_cmd", help="Cache commands")
+    cache_export_p = cache_sub.add_parser(
+        "export", help="Write the audit cache to a compressed bundle"
+    )
+    cache_export_p.add_argument(
+        "path", help="Bundle file to write (e.g. skopos-cache.jsonl.gz)"
+    )
+    cache_import_p = cache_sub.add_parser(
+        "import", help="Merge a bundle into the audit cache (newest entry wins)"
+    )
+    cache_import_p.add_argument(
+        "path", help="Bundle file produced by 'skopos cache export'"
+    )
+    cache_warm_p = cache_sub.add_parser(
+        "warm",
+        help="Pre-audit a project's dependencies so later checks hit the cache "
+        "(e.g. nightly)",
+    )
+    cache_warm_p.add_argument(
+        "sources",
+        nargs="*",
+        help="Manifests (pyproject.toml, requirements*.txt, uv.lock) or package "
+        "names; defaults to the manifests here",
+    )
+    cache_warm_p.add_argument(
+        "--jobs", type=int, default=32, help="Concurrent audits (default: 32)"
+    )
+    cache_warm_p.add_argument(
+        "--spread",
+        type=float,
+        default=6.0,
+        metavar="HOURS",
+        help="Stagger expiries over the last HOURS of the 24h TTL (default: 6)",
+    )
+    cache_refresh_p = cache_sub.add_parser(
+        "refresh", help="Re-audit packages now and update their cached verdicts"
+    )
+    cache_refresh_p.add_argument(
+        "packages",
+        nargs="+",
+        metavar="package",
+        help="Package names, or name==version pins, to re-audit",
+    )
+    return parser
+
+
+def _cmd_config(args, parser):
+    if getattr(args, "action", None) == "init":
+        init_config()
+    else:
+        parser.print_help()
+    return 0
+
+
+def _cmd_integrations(args, parser):
+    if getattr(args, "integ_cmd", None) == "load-snyk":
+        ok = set_integration_offline_file(
+            "snyk", args.path, getattr(args, "target", None)
+        )
+        return 0 if ok else 1
+    if getattr(args, "integ_cmd", None) == "import-osv":
+        db_path = args.db or OSVAdapter().db_path
+        try:
+            count = import_osv_zip(args.path, db_path)
+        except Exception as e:
+            console.print(f"❌ Failed to import OSV export: {e}")
+            return 1
+        console.print(f"✅ Imported {count} PyPI advisories into {db_path}")
+        return 0
+    if getattr(args, "integ_cmd", None) == "demo-snyk":
+        try:
+            snyk = SnykAdapter()
+            enrich = snyk.enrich(args.package, {})
+            if enrich:
+                console.print(enrich)
+            else:
+                console.print("(no enrichment found or adapter disabled)")
+        except Exception as e:
+            console.print(f"Error during demo: {e}")
+        return 0
+    parser.print_help()
+    return 0
+
+
+def _cmd_cache_export(args):
+    count = cache.export_bundle(args.path)
+    console.print(f"✅ Exported {count} cached audits to {args.path}")
+    return 0
+
+
+def _cmd_cache_import(args):
+    try:
+        total, merged = cache.import_bundle(args.path)
+    except BundleError as e:
+        console.print(f"❌ Failed to import cache bundle: {e}")
+        return 1
+    console.print(f"✅ Merged {merged} of {total} cached audits from {args.path}")
+    return 0
+
+
+def _cmd_cache_warm(args):
+    sources = args.sources or [str(p) for p in _watched_manifests()]
+    if not sources:
+        console.print("❌ [red]Nothing to warm: pass manifests or package names.[/red]")
+        return 1
+    results = warm_cache(sources, args.jobs, args.spread)
+    failed = sorted(name for name, (passed, _) in results.items() if not passed)
+    console.print(f"✅ Warmed {len(results)} packages ({len(failed)} failing)")
+    for name in failed:
+        console.print(f"   🛑 [red]{name} scored {results[name][1]}/100[/red]")
+    return 0
+
+
+def _cmd_cache_refresh(args):
+    try:
+        results = refresh_audits(args.packages)
+    finally:
+        cache.flush()
+    console.print(f"✅ Refreshed {len(results)} cached audits")
+    return 0
+
+
+CACHE_COMMANDS = {
+    "export": _cmd_cache_export,
+    "import": _cmd_cache_import,
+    "warm": _cmd_cache_warm,
+    "refresh": _cmd_cache_refresh,
+}
+
+
+def _cmd_cache(args, parser):
+    handler = CACHE_COMMANDS.get(getattr(args, "cache_cmd", None))
+    if handler is None:
+        parser.print_help()
+        return 0
+    return handler(args)
+
+
+MAINTENANCE_COMMANDS = {
+    "config": _cmd_config,
+    "integrations": _cmd_integrations,
+    "cache": _cmd_cache,
+}
+
+
+def _cmd_check(args):
+    # Audit every package in this process, sharing cache, HTTP pool and config
+    names = [requirement_name(p) or p for p in args.packages]
+    results = audit_many(names, args, pins=pins_by_name(args.packages))
+    if getattr(args, "recursive", False):
+        results = audit_tree(names, args, args.max_depth, results)
+    passed = all(ok for ok, _ in results.values())
+    # In strict mode we exit non-zero so shims/CI can fail fast
+    return 2 if getattr(args, "strict", False) and not passed else 0
+
+
+def _cmd_audit(args):
+    if getattr(args, "tree", None):
+        return 0 if audit_monorepo(args.tree, args) else 1
+    # Pass the args namespace to the project auditor
+    audit_project(args)
+    return 0
+
+
+def _cmd_watch(args):
+    paths = args.files or _watched_manifests()
+    if not paths:
+        console.print(
+            "❌ [red]No pyproject.toml, uv.lock or requirements*.txt to watch.[/red]"
+        )
+        return 1
+    try:
+        watch(paths, args, ManifestWatcher(paths, debounce=args.debounce))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _cmd_precommit(args):
+    return 0 if precommit(args.files, args) else 1
+
+
+# Commands that audit packages; main() wraps them with profiling, metrics and
+# cache flushing
+AUDIT_COMMANDS = {
+    "check": _cmd_check,
+    "audit": _cmd_audit,
+    "watch": _cmd_watch,
+    "precommit": _cmd_precommit,
+}
+
+
+def _start_instrumentation(args):
+    """Enable profiling and metrics as requested; returns (profile, metrics_file)."""
+    profile = getattr(args, "profile", False) or getattr(args, "trace_file", None)
+    if profile:
+        profiling.enable()
+
+    metrics_file = getattr(args, "metrics_file", None)
+    metrics_port = getattr(args, "metrics_port", None)
+    if metrics_file or metrics_port:
+        metrics.enable_phase_timings()
+    if metrics_port:
+        metrics.serve(metrics_port)
+    return profile, metrics_file
+
+
+def main():
+    """v0.22.0: Official Entry Point - Forensic Gatekeeper"""
+
+    # 1. Security First: Verify Whitelist Integrity
+    ensure_whitelist_exists()
+    if not verify_whitelist_integrity():
+        console.print("🚨 [bold red]WHITELIST TAMPERED![/bold red] Signature mismatch.")
+        sys.exit(1)
+
+    # 2. Parsing
+    parser = _build_parser()
     args = parser.parse_args()
 
-    # Handle config subcommand
-    if args.command == "config":
-        if getattr(args, "action", None) == "init":
-            init_config()
-            sys.exit(0)
-        else:
-            parser.print_help()
-            sys.exit(0)
-
-    # Handle integrations subcommands
-    if args.command == "integrations":
-        if getattr(args, "integ_cmd", None) == "load-snyk":
-            ok = set_integration_offline_file("snyk", args.path, getattr(args, "target", None))
-            sys.exit(0 if ok else 1)
-        if getattr(args, "integ_cmd", None) == "demo-snyk":
-            try:
-                snyk = SnykAdapter()
-                enrich = snyk.enrich(args.package, {})
-                if enrich:
-                    console.print(enrich)
-                else:
-                    console.print("(no enrichment found or adapter disabled)")
-            except Exception as e:
-                console.print(f"Error during demo: {e}")
-            sys.exit(0)
-        else:
-            parser.print_help()
-            sys.exit(0)
+    # Maintenance commands run without profiling, metrics or revalidation
+    if args.command in MAINTENANCE_COMMANDS:
+        sys.exit(MAINTENANCE_COMMANDS[args.command](args, parser))
 
-    # 5. Execution Logic (The "Brain")
+    # 3. Execution Logic (The "Brain")
     if args.install_hook:
         install_shell_hook()
         sys.exit(0)
@@ -421,18 +1495,23 @@ def main():
         disable_hooks()
         sys.exit(0)
 
-    if args.command == "check":
-        # Pass the package and the args namespace to the engine
-        passed, score = check_package(args.package, args)
-        if getattr(args, "strict", False) and not passed:
-            # In strict mode we exit non-zero so shims/CI can fail fast
-            sys.exit(2)
-    elif args.command == "audit":
-        # Pass the args namespace to the project auditor
-        audit_project(args)
-    else:
-        # If no command and no global flag, show help
-        parser.print_help()
+    profile, metrics_file = _start_instrumentation(args)
+    try:
+        command = AUDIT_COMMANDS.get(args.command)
+        if command is None:
+            # If no command and no global flag, show help
+            parser.print_help()
+        else:
+            code = command(args)
+            if code:
+                sys.exit(code)
+    finally:
+        cache.flush()
+        revalidate_in_background()
+        if profile:
+            display_profile(getattr(args, "trace_file", None))
+        if metrics_file:
+            metrics.write_file(metrics_file)
 
 
 if __name__ == "__main__":
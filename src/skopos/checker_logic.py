@@ -1,11 +1,15 @@
 import math
 import re
+import time
 from collections import Counter
-from datetime import datetime, timezone
-from skopos.config import load_config
+from skopos.config import compile_targets, load_compiled
+from skopos.matching import find_all
+from skopos.metadata import PackageMetadata, as_metadata
+from skopos.names import canonical_name, skeleton
 
 # Load configuration (user overrides default via ~/.skopos/config.toml)
-_CFG = load_config()
+# together with the lookup tables precompiled from it.
+_CFG, _DERIVED = load_compiled()
 
 # --- SCORING CONFIGURATION ---
 # Read weights from config with a sane default fallback
@@ -17,8 +21,14 @@ SCORING_WEIGHTS = _CFG.get("scoring_weights", {
     "new_account": 20,  # Low/Medium: Lack of history
     "hidden_identity": 10,  # Low: Missing author contact
     "low_velocity": 10,  # Low: Stale package
+    "mass_publisher": 30,  # Medium: New account behind many packages
 })
 
+# Scores at or above this pass the audit
+PASS_THRESHOLD = 80
+
+_DAY = 86400
+
 # --- FORENSIC ENGINES ---
 
 
@@ -54,6 +64,19 @@ def levenshtein_distance(s1: str, s2: str) -> int:
 
 # --- HEURISTICS ---
 
+def _typosquat_candidates(compiled: dict, length: int, keyword_extra: int):
+    """Targets whose length leaves room for a Levenshtein or keyword match.
+
+    Returned in config order.
+    """
+    by_length = compiled["by_length"]
+    lo = length - max(compiled["max_threshold"], keyword_extra)
+    hi = length + compiled["max_threshold"]
+    entries = [e for size in range(max(lo, 0), hi + 1) for e in by_length.get(size, ())]
+    entries.sort()
+    return [(target, threshold) for _, target, threshold in entries]
+
+
 def check_for_typosquatting(package_name: str, custom_targets=None):
     """Detects similarity AND keyword-stuffing attacks.
 
@@ -61,11 +84,21 @@ def check_for_typosquatting(package_name: str, custom_targets=None):
     default. Callers may pass `custom_targets` to override for a single run.
     """
     cfg = _CFG
-    targets = custom_targets or cfg.get("targets", {})
+    compiled = (
+        compile_targets(custom_targets) if custom_targets else _DERIVED["targets"]
+    )
     keyword_extra = cfg.get("keyword_extra_chars", 8)
-    name = package_name.lower()
+    name = canonical_name(package_name)
+    # 0. Lookalike check: one translate and one dict lookup
+    # ('rnatplotlib', 'url1ib3', 'py-yaml')
+    lookalikes = compiled["skeletons"].get(skeleton(name), ())
+    if lookalikes and name not in lookalikes:
+        return True, f"{lookalikes[0]} (Lookalike)"
+
+    keywords = compiled["keywords"]
+    embedded = {keywords["patterns"][i] for i in find_all(keywords, name)}
 
-    for target, threshold in targets.items():
+    for target, threshold in _typosquat_candidates(compiled, len(name), keyword_extra):
         if name == target:
             continue
 
@@ -75,36 +108,32 @@ def check_for_typosquatting(package_name: str, custom_targets=None):
 
         # 2. Keyword-stuffing check (e.g., 'requests-ultra', 'pip-security')
         # If a high-value brand is in the name but it's not the actual package
-        if target in name and (len(name) - len(target)) <= keyword_extra:
+        if target in embedded and (len(name) - len(target)) <= keyword_extra:
             return True, f"{target} (Keyword match)"
 
     return False, None
 
 
-def check_resurrection(data: dict):
+def check_resurrection(data: PackageMetadata | dict):
     """v0.22: Detects dormant account activity with Giant's Immunity."""
-    releases = data.get("releases", {})
-    if len(releases) < 2:
+    meta = as_metadata(data)
+    if meta.release_count < 2:
         return True, {"dormancy": 0, "status": "New"}
 
     # Giant's Immunity: Established projects are exempt from dormancy flags
-    if len(releases) > 50:
-        return True, {"releases": len(releases), "status": "Immune (Giant)"}
-
-    upload_times = sorted(
-        [
-            datetime.fromisoformat(f["upload_time"].replace("Z", ""))
-            for r in releases.values()
-            for f in r
-        ]
-    )
+    if meta.release_count > 50:
+        return True, {"releases": meta.release_count, "status": "Immune (Giant)"}
+
+    upload_times = sorted(meta.upload_timestamps())
+    if not upload_times:
+        return True, {"max_gap": 0}
 
     gaps = [
-        (upload_times[i] - upload_times[i - 1]).days
+        int((upload_times[i] - upload_times[i - 1]) // _DAY)
         for i in range(1, len(upload_times))
     ]
     max_gap = max(gaps) if gaps else 0
-    last_age = (datetime.now(timezone.utc).replace(tzinfo=None) - upload_times[-1]).days
+    last_age = int((time.time() - upload_times[-1]) // _DAY)
 
     # Flag if dormant > 2 years then sudden update
     if max_gap > 730 and last_age < 14:
@@ -112,18 +141,21 @@ def check_resurrection(data: dict):
     return True, {"max_gap": max_gap}
 
 
-def check_author_reputation(package_name: str, data: dict):
+# Projects with more releases than this skip the author identity checks
+IDENTITY_IMMUNE_RELEASES = 30
+
+
+def check_author_reputation(package_name: str, data: PackageMetadata | dict):
     """
     v0.22.1: Analyzes author metadata. 
     Cross-references package names against email domains to detect brand-jacking.
     """
-    info = data.get("info", {}) or {}
-    releases = data.get("releases", {})
-    author = (info.get("author") or "").strip()
-    email = (info.get("author_email") or "").strip()
+    meta = as_metadata(data)
+    author = meta.author
+    email = meta.author_email
 
     # 1. Giant's Immunity: Established projects are exempt from metadata-gap flagging
-    if len(releases) > 30:
+    if meta.release_count > IDENTITY_IMMUNE_RELEASES:
         return True, {
             "author": author or "Project Lead", 
             "email": email, 
@@ -140,39 +172,29 @@ def check_author_reputation(package_name: str, data: dict):
 
     # 3. Brand-jacking Detection:
     # If the package name claims to be from a major brand, the email must match.
-    target_brands = ["google", "microsoft", "amazon", "apple", "adobe", "openai"]
-    pkg_lower = package_name.lower()
+    matcher = _DERIVED["brand_matcher"]
     email_lower = email.lower()
-    
-    for brand in target_brands:
-        if brand in pkg_lower:
-            # If 'google' is in the name, but the email isn't @google.com
-            if not email_lower.endswith(f"@{brand}.com"):
-                return False, {
-                    "reason": f"Suspected {brand.capitalize()} brand-jacking", 
-                    "email": email
-                }
+
+    for index in find_all(matcher, package_name.lower()):
+        brand = matcher["patterns"][index]
+        # If 'google' is in the name, but the email isn't @google.com
+        if not email_lower.endswith(f"@{brand}.com"):
+            return False, {
+                "reason": f"Suspected {brand.capitalize()} brand-jacking",
+                "email": email
+            }
 
     return True, {"author": author, "email": email}
 
-def check_reputation(package_name: str, data: dict):
+def check_reputation(package_name: str, data: PackageMetadata | dict):
     """v0.22: Detects bot-driven download inflation."""
-    info = data.get("info", {}) or {}
-    downloads = info.get("downloads", {}).get("last_month", 0)
-    releases = data.get("releases", {})
-
-    upload_times = [
-        datetime.fromisoformat(f["upload_time"].replace("Z", ""))
-        for r in releases.values()
-        for f in r
-        if r
-    ]
+    meta = as_metadata(data)
+    downloads = meta.downloads_last_month
+    upload_times = meta.upload_timestamps()
     if not upload_times:
         return True, {"downloads": downloads, "age": 0}
 
-    days_old = (
-        datetime.now(timezone.utc).replace(tzinfo=None) - min(upload_times)
-    ).days or 1
+    days_old = int((time.time() - min(upload_times)) // _DAY) or 1
 
     # High downloads + Very young = Suspected Bot Inflation
     if downloads > 10000 and days_old <= 7:
@@ -180,24 +202,63 @@ def check_reputation(package_name: str, data: dict):
     return True, {"downloads": downloads, "days_old": days_old}
 
 
-def scan_payload(package_name: str, data: dict):
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+
+
+def author_emails(data: PackageMetadata | dict) -> list:
+    """Lowercased author and maintainer addresses, deduplicated in order.
+
+    Both fields may hold several comma-separated entries, with or without
+    a display name (`"Jane Doe" <jane@example.org>`).
+    """
+    meta = as_metadata(data)
+    found = _EMAIL_RE.findall(f"{meta.author_email},{meta.maintainer_email}")
+    return list(dict.fromkeys(email.lower() for email in found))
+
+
+def check_maintainer_footprint(authors: dict):
+    """Flags new maintainer identities that already publish many packages.
+
+    `authors` maps each email to `(package_count, first_seen)` from the
+    local maintainer index; an address first seen within
+    `mass_publisher_days` that already has `mass_publisher_packages` or
+    more packages looks like a throwaway publishing account.
+    """
+    days = _CFG.get("mass_publisher_days", 30)
+    limit = _CFG.get("mass_publisher_packages", 10)
+    now = time.time()
+    flagged, seen = [], {}
+    for email, (count, first_seen) in authors.items():
+        age = int((now - first_seen) // _DAY)
+        seen[email] = {"packages": count, "days_known": age}
+        if age < days and count >= limit:
+            flagged.append(email)
+    if flagged:
+        return False, {
+            "reason": "New account publishing many packages",
+            "emails": flagged,
+            "authors": seen,
+        }
+    return True, {"authors": seen or "none indexed"}
+
+
+def scan_payload(package_name: str, data: PackageMetadata | dict):
     """v0.22: Scans manifest for dangerous file types and obfuscated names."""
-    info = data.get("info", {})
-    version = info.get("version")
-    releases = data.get("releases", {}).get(version, [])
+    meta = as_metadata(data)
+    filenames = meta.files_for(meta.version)
 
     suspicious = [
-        r.get("filename")
-        for r in releases
+        name
+        for name in filenames
         if any(
-            ext in r.get("filename", "").lower()
+            ext in name.lower()
             for ext in [".exe", ".msi", ".sh", ".bat", ".bin"]
         )
     ]
     entropy = [
-        r.get("filename")
-        for r in releases
-        if calculate_entropy(r.get("filename", "")) > 5.0
+        name
+        for name in filenames
+        if calculate_entropy(name) > 5.0
     ]
 
     passed = not (suspicious or entropy)
@@ -210,17 +271,26 @@ def scan_payload(package_name: str, data: dict):
 # --- UTILITIES ---
 
 
-def get_dependencies(pypi_data: dict) -> list:
+def get_dependencies(pypi_data: PackageMetadata | dict) -> list:
     """Extracts a clean list of unique dependency names."""
-    requires = pypi_data.get("info", {}).get("requires_dist") or []
+    requires = as_metadata(pypi_data).requires_dist
     clean_deps = []
     for req in requires:
         if ";" in req and "extra ==" in req:
             continue
         match = re.match(r"^([a-zA-Z0-9\-\._]+)", req)
         if match:
-            clean_deps.append(match.group(1).lower())
-    return list(set(clean_deps))
+            clean_deps.append(canonical_name(match.group(1)))
+    return sorted(set(clean_deps))
+
+
+def verdict_is_final(results: dict) -> bool:
+    """True once `results` fail and no further finding could make them pass.
+
+    Findings only ever subtract from the score, so a typosquat or a score
+    already below `PASS_THRESHOLD` cannot recover.
+    """
+    return calculate_skopos_score(results) < PASS_THRESHOLD
 
 
 def calculate_skopos_score(results: dict) -> int:
@@ -236,9 +306,11 @@ def calculate_skopos_score(results: dict) -> int:
         "Payload": "payload_risk",
         "Reputation": "new_account",
         "Identity": "hidden_identity",
+        "Maintainer": "mass_publisher",
         "Sandbox": "sandbox_violation",
         "Obfuscation": "obfuscation",
         "Snyk": "snyk_vuln",
+        "OSV": "osv_vuln",
     }
 
     for key, weight_key in mapping.items():
@@ -1,6 +1,12 @@
+import hashlib
+import json
+import os
 import tomllib
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List
+
+from skopos.matching import compile_patterns
+from skopos.names import canonical_name, skeleton
 
 DEFAULTS: Dict[str, Any] = {
     "targets": {
@@ -34,6 +40,12 @@ DEFAULTS: Dict[str, Any] = {
     },
     # How many extra characters beyond the brand name may indicate keyword-stuffing
     "keyword_extra_chars": 8,
+    # Vendors whose names in a package require a matching author email domain
+    "brands": ["google", "microsoft", "amazon", "apple", "adobe", "openai"],
+    # A maintainer email first seen fewer than mass_publisher_days ago that is
+    # already behind mass_publisher_packages indexed packages is flagged
+    "mass_publisher_days": 30,
+    "mass_publisher_packages": 10,
     # Scoring weights used by the aggregate score calculation
     "scoring_weights": {
         "typosquatting": 100,
@@ -43,13 +55,40 @@ DEFAULTS: Dict[str, Any] = {
         "new_account": 20,
         "hidden_identity": 10,
         "low_velocity": 10,
+        "mass_publisher": 30,
         "snyk_vuln": 80,
+        "osv_vuln": 80,
     },
     "integrations": {
         "snyk": {"enabled": False, "api_key": "", "offline_file": ""},
         "socket": {"enabled": False, "endpoint": "", "offline_file": ""},
+        "osv": {"enabled": False, "db_path": "~/.skopos/osv.db"},
     },
     # Scoring adjustments for enrichment sources are included above
+    # PyPI requests: metadata source ("simple" = PEP 691 index, "json" = legacy
+    # /pypi/<name>/json), per-request timeout and retry policy for
+    # 429/5xx/connection errors
+    "pypi": {
+        "metadata_source": "simple",
+        "timeout": 5,
+        "max_retries": 3,
+        "backoff_base": 0.5,
+        "backoff_max": 30,
+    },
+    # Seconds to remember failed PyPI lookups (404s / timeouts, 5xx, 429); 0 disables
+    # remote_url points at a shared HTTP audit cache (see skopos.cache_backends);
+    # empty disables.
+    # stale_ttl: seconds past the audit TTL a passing verdict scoring at least
+    # revalidate_below is still served while it is refreshed in the background
+    "cache": {
+        "not_found_ttl": 3600,
+        "error_ttl": 60,
+        "remote_url": "",
+        "remote_token": "",
+        "remote_timeout": 2,
+        "stale_ttl": 21600,
+        "revalidate_below": 90,
+    },
 }
 
 
@@ -64,34 +103,200 @@ def deep_merge(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
     return out
 
 
+# Bump when the snapshot layout changes. Changes to the DEFAULTS or to how
+# the derived structures are built are picked up from `_CODE_SOURCES`.
+SNAPSHOT_SCHEMA = 5
+
+# Modules whose code shapes the snapshot: this one (DEFAULTS, compile_*),
+# plus the name folding and the automaton builder it calls
+_CODE_SOURCES = tuple(
+    Path(__file__).with_name(m) for m in ("config.py", "names.py", "matching.py")
+)
+
 _CACHED: Dict[str, Any] | None = None
+_DERIVED: Dict[str, Any] | None = None
 
 
-def load_config(path: str | None = None) -> Dict[str, Any]:
-    """Load the configuration, merging user config over defaults.
+def compile_targets(targets: Dict[str, int]) -> Dict[str, Any]:
+    """Bucket typosquat targets by name length.
 
-    By default reads `~/.skopos/config.toml` if present.
+    Levenshtein distance is at least the length difference, and a keyword
+    match needs the target to fit inside the name, so only targets whose
+    length is close to the candidate's can ever match. Entries keep their
+    config order so the first hit stays the same as a linear scan. The
+    `keywords` automaton finds every target embedded in a name in one pass,
+    and `skeletons` maps each lookalike skeleton to the targets sharing it.
+    """
+    by_length: Dict[int, List[List[Any]]] = {}
+    max_threshold = 0
+    names = []
+    skeletons: Dict[str, List[str]] = {}
+    for order, (target, threshold) in enumerate(targets.items()):
+        target = canonical_name(target)
+        by_length.setdefault(len(target), []).append([order, target, threshold])
+        max_threshold = max(max_threshold, threshold)
+        names.append(target)
+        skeletons.setdefault(skeleton(target), []).append(target)
+    return {
+        "by_length": by_length,
+        "max_threshold": max_threshold,
+        "keywords": compile_patterns(names),
+        "skeletons": skeletons,
+    }
+
+
+def compile_derived(cfg: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the lookup structures the heuristics need from a merged config."""
+    brands = list(dict.fromkeys(b.lower() for b in cfg.get("brands", [])))
+    return {
+        "targets": compile_targets(cfg.get("targets", {})),
+        "brands": brands,
+        "brand_matcher": compile_patterns(brands),
+    }
+
+
+def _default_snapshot_path() -> Path:
+    return Path.home() / ".skopos" / "config.snapshot.json"
+
+
+def _source_stamp(path: Path) -> Dict[str, Any]:
+    """Cheap identity (stat only) for a config source.
+
+    A missing file is a valid state.
     """
-    global _CACHED
-    if _CACHED is not None:
-        return _CACHED
+    try:
+        st = path.stat()
+    except OSError:
+        return {"path": str(path), "exists": False}
+    return {
+        "path": str(path),
+        "exists": True,
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+    }
+
+
+def _read_snapshot(snapshot_path: Path) -> Dict[str, Any] | None:
+    try:
+        with open(snapshot_path, "r") as f:
+            snap = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return snap if snap.get("schema") == SNAPSHOT_SCHEMA else None
+
+
+def _write_snapshot(snapshot_path: Path, snap: Dict[str, Any]) -> None:
+    # Write-then-rename so a concurrent reader never sees a partial file
+    try:
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = snapshot_path.with_name(f"{snapshot_path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(snap, f)
+        os.replace(tmp, snapshot_path)
+    except (OSError, TypeError, ValueError):
+        # Unwritable home or non-JSON TOML values (dates): just skip the snapshot
+        try:
+            tmp.unlink()
+        except (OSError, UnboundLocalError):
+            pass
+
 
+def _thaw_derived(derived: Dict[str, Any]) -> Dict[str, Any]:
+    # JSON object keys are strings; restore the integer length buckets
+    targets = derived["targets"]
+    targets["by_length"] = {int(k): v for k, v in targets["by_length"].items()}
+    return derived
+
+
+def _read_source(user_path: Path) -> tuple[bytes | None, str | None]:
+    try:
+        raw = user_path.read_bytes()
+    except OSError:
+        return None, None
+    return raw, hashlib.sha256(raw).hexdigest()
+
+
+def _merge_user_config(raw: bytes | None) -> Dict[str, Any]:
     cfg = dict(DEFAULTS)
-    user_path = Path(path) if path else Path.home() / ".skopos" / "config.toml"
+    if raw is None:
+        return cfg
     try:
-        if user_path.exists():
-            with open(user_path, "rb") as f:
-                user_cfg = tomllib.load(f)
-            cfg = deep_merge(cfg, user_cfg)
+        return deep_merge(cfg, tomllib.loads(raw.decode()))
     except Exception:
         # If parsing fails, silently keep defaults to avoid breaking behavior
-        pass
+        return cfg
+
+
+def load_compiled(
+    path: str | None = None, snapshot_path: str | None = None
+) -> tuple[Dict[str, Any], Dict[str, Any]]:
+    """Return (merged config, derived lookup structures), using the on-disk snapshot.
+
+    The snapshot at `~/.skopos/config.snapshot.json` is keyed by the stat
+    stamp and sha256 of the user config and by the stat stamps of the
+    modules in `_CODE_SOURCES`. On a warm start nothing is parsed or
+    merged: a few `stat` calls and one JSON load. If only the user config's
+    mtime moved (e.g. `touch`), the hash confirms the content and the stamp
+    is refreshed.
+    """
+    global _CACHED, _DERIVED
+    if _CACHED is not None and _DERIVED is not None:
+        return _CACHED, _DERIVED
+
+    user_path = Path(path) if path else Path.home() / ".skopos" / "config.toml"
+    snap_path = Path(snapshot_path) if snapshot_path else _default_snapshot_path()
+    sources = [_source_stamp(user_path)] + [_source_stamp(p) for p in _CODE_SOURCES]
+
+    snap = _read_snapshot(snap_path)
+    if snap is not None and snap.get("sources") == sources:
+        _CACHED, _DERIVED = snap["config"], _thaw_derived(snap["derived"])
+        return _CACHED, _DERIVED
+
+    raw, digest = _read_source(user_path)
+    old_sources = (snap or {}).get("sources") or [{}]
+    if (
+        snap is not None
+        and snap.get("user_sha256") == digest
+        and old_sources[0].get("path") == sources[0]["path"]
+        and old_sources[1:] == sources[1:]
+    ):
+        snap["sources"] = sources
+        _write_snapshot(snap_path, snap)
+        _CACHED, _DERIVED = snap["config"], _thaw_derived(snap["derived"])
+        return _CACHED, _DERIVED
+
+    cfg = _merge_user_config(raw)
+    derived = compile_derived(cfg)
+    _write_snapshot(
+        snap_path,
+        {
+            "schema": SNAPSHOT_SCHEMA,
+            "sources": sources,
+            "user_sha256": digest,
+            "config": cfg,
+            "derived": derived,
+        },
+    )
+    _CACHED, _DERIVED = cfg, derived
+    return cfg, derived
+
+
+def load_config(path: str | None = None) -> Dict[str, Any]:
+    """Load the configuration, merging user config over defaults.
+
+    By default reads `~/.skopos/config.toml` if present.
+    """
+    return load_compiled(path)[0]
+
 
-    _CACHED = cfg
-    return cfg
+def config_fingerprint() -> str:
+    """Short stable hash of the active merged configuration."""
+    blob = json.dumps(load_config(), sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()[:16]
 
 
 def reset_cache() -> None:
     """Reset the cached config (useful in tests)."""
-    global _CACHED
+    global _CACHED, _DERIVED
     _CACHED = None
+    _DERIVED = None
@@ -8,4 +8,5 @@ __all__ = [
     "adapter",
     "snyk_adapter",
     "socket_adapter",
+    "osv_adapter",
 ]
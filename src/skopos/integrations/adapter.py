@@ -1,5 +1,7 @@
 from typing import Protocol, Dict, Any
 
+from skopos.metadata import PackageMetadata
+
 
 class Adapter(Protocol):
     """Minimal adapter interface for external enrichment providers."""
@@ -7,5 +9,7 @@ class Adapter(Protocol):
     def is_enabled(self) -> bool:
         ...
 
-    def enrich(self, package_name: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    def enrich(
+        self, package_name: str, metadata: PackageMetadata | Dict[str, Any]
+    ) -> Dict[str, Any]:
         """Return enrichment data (must be safe and side-effect free when disabled)."""
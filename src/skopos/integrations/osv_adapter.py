@@ -0,0 +1,264 @@
+import json
+import logging
+import sqlite3
+import threading
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+from packaging.version import InvalidVersion, Version
+
+from skopos.config import load_config
+from skopos.metadata import PackageMetadata, as_metadata
+from skopos.names import canonical_name
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS osv_advisories (
+    id TEXT PRIMARY KEY,
+    summary TEXT,
+    aliases_json TEXT,
+    modified TEXT
+);
+CREATE TABLE IF NOT EXISTS osv_ranges (
+    package TEXT,
+    lo_key TEXT,
+    hi_key TEXT,
+    hi_inclusive INTEGER,
+    fixed TEXT,
+    advisory_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_osv_ranges_lookup ON osv_ranges (package, lo_key);
+CREATE INDEX IF NOT EXISTS idx_osv_ranges_advisory ON osv_ranges (advisory_id);
+"""
+
+log = logging.getLogger(__name__)
+
+# Sorts below every encoded version, so `introduced: "0"` matches everything.
+_LOWEST_KEY = ""
+
+
+def version_key(version: str) -> str | None:
+    """Encode a PEP 440 version as a string whose lexical order is version order.
+
+    Mirrors the ordering of `packaging.version.Version` so ranges can be
+    compared with plain SQLite string comparisons (and therefore indexes).
+    Returns None for versions that do not parse.
+    """
+    try:
+        v = Version(version)
+    except InvalidVersion:
+        return None
+
+    release = list(v.release)
+    while len(release) > 1 and release[-1] == 0:
+        release.pop()
+    key = f"{v.epoch:04d}" + "".join(f"{part:010d}" for part in release) + "!"
+
+    # Same sentinel rules as packaging's _cmpkey: a bare dev release sorts
+    # before any pre-release, a final release after every pre-release.
+    if v.pre is None and v.post is None and v.dev is not None:
+        key += "0"
+    elif v.pre is None:
+        key += "2"
+    else:
+        key += "1" + v.pre[0] + f"{v.pre[1]:010d}"
+    key += "0" if v.post is None else "1" + f"{v.post:010d}"
+    key += "2" if v.dev is None else "1" + f"{v.dev:010d}"
+    return key
+
+
+# Closing events of an OSV range: (event, upper bound inclusive?)
+_CLOSERS = (("fixed", 0), ("last_affected", 1), ("limit", 0))
+# Marks an open interval whose `introduced` version cannot be keyed
+_UNKEYABLE = object()
+
+
+def _event_intervals(
+    events: List[Dict[str, str]],
+) -> Iterable[Tuple[str, str | None, int, str | None]]:
+    """Yield (lo_key, hi_key, hi_inclusive, fixed) for one range's events.
+
+    An interval with a bound that cannot be keyed is dropped (and logged)
+    rather than stored open-ended, which would flag every later release.
+    """
+    lo = None
+    for event in events:
+        if "introduced" in event:
+            intro = event["introduced"]
+            lo = _LOWEST_KEY if intro == "0" else version_key(intro)
+            if lo is None:
+                log.warning(
+                    "skipping OSV range: unparsable introduced version %r", intro
+                )
+                lo = _UNKEYABLE
+            continue
+        closer = next(((kind, incl) for kind, incl in _CLOSERS if kind in event), None)
+        if lo is None or closer is None:
+            continue
+        kind, inclusive = closer
+        hi = version_key(event[kind])
+        if hi is None:
+            log.warning(
+                "skipping OSV range: unparsable %s version %r", kind, event[kind]
+            )
+        elif lo is not _UNKEYABLE:
+            yield lo, hi, inclusive, event[kind] if kind == "fixed" else None
+        lo = None
+    if lo is not None and lo is not _UNKEYABLE:
+        yield lo, None, 0, None
+
+
+def _ranges_for(
+    affected: Dict[str, Any],
+) -> Iterable[Tuple[str, str | None, int, str | None]]:
+    """Yield (lo_key, hi_key, hi_inclusive, fixed) intervals for one `affected` entry.
+
+    Explicitly listed versions are always kept, so they still match when a
+    range had to be dropped.
+    """
+    for rng in affected.get("ranges", []) or []:
+        if rng.get("type") in ("ECOSYSTEM", "SEMVER"):
+            yield from _event_intervals(rng.get("events", []) or [])
+
+    for explicit in affected.get("versions", []) or []:
+        key = version_key(explicit)
+        if key is not None:
+            yield key, key, 1, None
+
+
+def import_osv_zip(zip_path: str, db_path: str) -> int:
+    """Bulk-import an OSV export zip into the local advisory store.
+
+    Only PyPI advisories are kept. Re-importing an advisory replaces its
+    previous ranges. Returns the number of advisories imported.
+    """
+    db = Path(db_path).expanduser()
+    db.parent.mkdir(parents=True, exist_ok=True)
+    advisories = []
+    ranges = []
+    with zipfile.ZipFile(zip_path) as zf:
+        for member in zf.namelist():
+            if not member.endswith(".json"):
+                continue
+            try:
+                doc = json.loads(zf.read(member))
+            except ValueError:
+                continue
+            adv_id = doc.get("id")
+            if not adv_id:
+                continue
+            rows = [
+                (canonical_name(a["package"]["name"]), lo, hi, incl, fixed, adv_id)
+                for a in doc.get("affected", []) or []
+                if (a.get("package") or {}).get("ecosystem") == "PyPI"
+                and (a.get("package") or {}).get("name")
+                for lo, hi, incl, fixed in _ranges_for(a)
+            ]
+            if not rows:
+                continue
+            advisories.append(
+                (
+                    adv_id,
+                    doc.get("summary") or (doc.get("details") or "")[:200],
+                    json.dumps(doc.get("aliases", [])),
+                    doc.get("modified", ""),
+                )
+            )
+            ranges.extend(rows)
+
+    with sqlite3.connect(db) as conn:
+        conn.executescript(_SCHEMA)
+        conn.executemany(
+            "DELETE FROM osv_ranges WHERE advisory_id = ?",
+            [(a[0],) for a in advisories],
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO osv_advisories "
+            "(id, summary, aliases_json, modified) VALUES (?, ?, ?, ?)",
+            advisories,
+        )
+        conn.executemany(
+            "INSERT INTO osv_ranges "
+            "(package, lo_key, hi_key, hi_inclusive, fixed, advisory_id) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            ranges,
+        )
+    return len(advisories)
+
+
+# One read connection per thread and store, reused by every query
+_LOCAL = threading.local()
+
+
+def _connection(db: Path) -> sqlite3.Connection:
+    conns = _LOCAL.__dict__.setdefault("conns", {})
+    conn = conns.get(db)
+    if conn is None:
+        conn = conns[db] = sqlite3.connect(db)
+    return conn
+
+
+def query_advisories(
+    db_path: str, package_name: str, version: str
+) -> List[Dict[str, Any]]:
+    """Return advisories affecting `package_name==version` via the range index."""
+    key = version_key(version)
+    db = Path(db_path).expanduser()
+    if key is None or not db.exists():
+        return []
+    query = """
+        SELECT DISTINCT a.id, a.summary, a.aliases_json, r.fixed
+        FROM osv_ranges r JOIN osv_advisories a ON a.id = r.advisory_id
+        WHERE r.package = ? AND r.lo_key <= ?
+          AND (r.hi_key IS NULL OR r.hi_key > ?
+               OR (r.hi_inclusive = 1 AND r.hi_key = ?))
+    """
+    rows = (
+        _connection(db)
+        .execute(query, (canonical_name(package_name), key, key, key))
+        .fetchall()
+    )
+    return [
+        {
+            "id": adv_id,
+            "summary": summary,
+            "aliases": json.loads(aliases),
+            "fixed": fixed,
+        }
+        for adv_id, summary, aliases, fixed in rows
+    ]
+
+
+class OSVAdapter:
+    """Offline OSV adapter backed by a locally imported advisory store.
+
+    Disabled by default; populate the store with `skopos integrations import-osv`.
+    """
+
+    def __init__(self):
+        cfg = load_config()
+        osv = cfg.get("integrations", {}).get("osv", {})
+        self.enabled = osv.get("enabled", False)
+        self.db_path = osv.get("db_path", "") or "~/.skopos/osv.db"
+
+    def is_enabled(self) -> bool:
+        return bool(self.enabled and Path(self.db_path).expanduser().exists())
+
+    def enrich(
+        self,
+        package_name: str,
+        metadata: PackageMetadata | Dict[str, Any],
+        version: str | None = None,
+    ) -> Dict[str, Any]:
+        """Advisories affecting `version` (a pin), else the latest release."""
+        if not self.is_enabled():
+            return {}
+        version = version or as_metadata(metadata).version
+        if not version:
+            return {}
+        try:
+            return {
+                "vulnerabilities": query_advisories(self.db_path, package_name, version)
+            }
+        except sqlite3.Error:
+            return {}
@@ -1,6 +1,7 @@
 from typing import Dict, Any
 from .adapter import Adapter
 from skopos.config import load_config
+from skopos.metadata import PackageMetadata
 
 
 class SnykAdapter:
@@ -20,7 +21,9 @@ class SnykAdapter:
         # or an offline_file path (offline enrichment).
         return bool(self.enabled and (self.api_key or self.offline_file))
 
-    def enrich(self, package_name: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    def enrich(
+        self, package_name: str, metadata: PackageMetadata | Dict[str, Any]
+    ) -> Dict[str, Any]:
         # No-op when disabled
         if not self.is_enabled():
             return {}
@@ -1,5 +1,6 @@
 from typing import Dict, Any
 from skopos.config import load_config
+from skopos.metadata import PackageMetadata
 
 
 class SocketAdapter:
@@ -16,7 +17,9 @@ class SocketAdapter:
     def is_enabled(self) -> bool:
         return bool(self.enabled and self.endpoint)
 
-    def enrich(self, package_name: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    def enrich(
+        self, package_name: str, metadata: PackageMetadata | Dict[str, Any]
+    ) -> Dict[str, Any]:
         if not self.is_enabled():
             return {}
         # Real-time socket interactions are intentionally not implemented in scaffold
@@ -0,0 +1,223 @@
+"""Discovery and parsing of dependency manifests (pyproject.toml, requirements*.txt)."""
+
+import os
+import re
+import subprocess
+import tomllib
+from pathlib import Path, PurePath
+from typing import Dict, List
+
+from packaging.requirements import InvalidRequirement, Requirement
+
+from skopos.names import canonical_name
+
+_NAME_RE = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+
+# Directories holding environments, build output or vendored code, never scanned
+SKIP_DIRS = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        ".tox",
+        ".nox",
+        ".venv",
+        "venv",
+        "env",
+        "__pycache__",
+        "node_modules",
+        "site-packages",
+        "build",
+        "dist",
+        "vendor",
+        "_vendor",
+        "third_party",
+    }
+)
+
+
+def requirement_name(spec: str) -> str | None:
+    """Return the distribution name of a PEP 508 requirement string."""
+    try:
+        return Requirement(spec).name
+    except InvalidRequirement:
+        match = _NAME_RE.match(spec)
+        return match.group(1) if match else None
+
+
+def pinned_version(spec: str) -> str | None:
+    """The version of an exact `name==x.y` (or `===`) pin, None for anything looser."""
+    try:
+        specifiers = list(Requirement(spec).specifier)
+    except InvalidRequirement:
+        return None
+    if (
+        len(specifiers) == 1
+        and specifiers[0].operator in ("==", "===")
+        and "*" not in specifiers[0].version
+    ):
+        return specifiers[0].version
+    return None
+
+
+def pins_by_name(specs: List[str]) -> Dict[str, str]:
+    """Map canonical package name -> pinned version, for exactly pinned specs only."""
+    pins = {}
+    for spec in specs:
+        version = pinned_version(spec)
+        if version:
+            pins[canonical_name(requirement_name(spec))] = version
+    return pins
+
+
+def parse_pyproject(text: str) -> List[str]:
+    """Requirement strings from a pyproject.toml.
+
+    Covers [project] dependencies, optional-dependencies and dependency-groups.
+    """
+    try:
+        data = tomllib.loads(text)
+    except tomllib.TOMLDecodeError:
+        return []
+    project = data.get("project", {}) or {}
+    specs = list(project.get("dependencies", []) or [])
+    for group in (project.get("optional-dependencies", {}) or {}).values():
+        specs.extend(group)
+    for group in (data.get("dependency-groups", {}) or {}).values():
+        # Groups may include {include-group = "..."} tables; only strings are
+        # requirements
+        specs.extend(item for item in group if isinstance(item, str))
+    return specs
+
+
+def parse_requirements(text: str) -> List[str]:
+    """Requirement strings from a requirements.txt.
+
+    Options, includes and URLs are skipped.
+    """
+    specs = []
+    for line in text.replace("\\\n", " ").splitlines():
+        line = line.split(" #", 1)[0].strip()
+        if not line or line.startswith(("#", "-")) or "://" in line.split(";", 1)[0]:
+            continue
+        specs.append(line)
+    return specs
+
+
+def parse_uv_lock(text: str) -> List[str]:
+    """Pinned `name==version` requirements for registry packages in a uv.lock.
+
+    The project itself and path/git/URL sources are skipped: they are not
+    PyPI packages.
+    """
+    try:
+        data = tomllib.loads(text)
+    except tomllib.TOMLDecodeError:
+        return []
+    specs = []
+    for package in data.get("package", []) or []:
+        if (
+            "registry" in (package.get("source") or {})
+            and package.get("name")
+            and package.get("version")
+        ):
+            specs.append(f"{package['name']}=={package['version']}")
+    return specs
+
+
+def is_manifest(path: str) -> bool:
+    name = PurePath(path).name
+    return name == "pyproject.toml" or (
+        name.startswith("requirements") and name.endswith(".txt")
+    )
+
+
+def parse_manifest(path: str, text: str) -> List[str]:
+    """Dispatch on the manifest file name."""
+    if PurePath(path).name == "pyproject.toml":
+        return parse_pyproject(text)
+    if PurePath(path).name == "uv.lock":
+        return parse_uv_lock(text)
+    if is_manifest(path):
+        return parse_requirements(text)
+    return []
+
+
+def specs_by_name(specs: List[str]) -> Dict[str, str]:
+    """Map normalized package name -> normalized requirement (last one wins).
+
+    The value ignores name spelling, whitespace and ordering of specifiers, so
+    `Py_YAML>=6,<7` and `pyyaml <7, >=6` compare equal.
+    """
+    out = {}
+    for spec in specs:
+        try:
+            req = Requirement(spec)
+        except InvalidRequirement:
+            name, norm = requirement_name(spec), spec.strip()
+        else:
+            name = req.name
+            norm = ";".join(
+                [
+                    ",".join(sorted(req.extras)),
+                    ",".join(sorted(str(s) for s in req.specifier)),
+                    req.url or "",
+                    str(req.marker or ""),
+                ]
+            )
+        if name:
+            out[canonical_name(name)] = norm
+    return out
+
+
+def requirement_delta(old_specs: List[str], new_specs: List[str]) -> List[str]:
+    """Names whose requirement was added or changed between two manifest versions."""
+    old = specs_by_name(old_specs)
+    new = specs_by_name(new_specs)
+    return [name for name, spec in new.items() if old.get(name) != spec]
+
+
+def _skipped(parts) -> bool:
+    return any(part in SKIP_DIRS or part.endswith(".egg-info") for part in parts)
+
+
+def discover_manifests(root) -> List[Path]:
+    """Every manifest under `root`, sorted, ignoring `SKIP_DIRS`.
+
+    Inside a git work tree the file list comes from one `git ls-files` call
+    (tracked plus untracked, minus .gitignore'd), so ignored trees are never
+    walked; otherwise (or without git) the tree is walked, pruning skipped
+    directories.
+    """
+    root = Path(root)
+    try:
+        proc = subprocess.run(
+            [
+                "git",
+                "-C",
+                str(root),
+                "ls-files",
+                "-z",
+                "--cached",
+                "--others",
+                "--exclude-standard",
+            ],
+            capture_output=True,
+            text=True,
+        )
+    except OSError:
+        # git is not installed: same walk as outside a work tree
+        proc = None
+    if proc is not None and proc.returncode == 0:
+        paths = (PurePath(p) for p in proc.stdout.split("\0") if p)
+        found = {
+            root / p
+            for p in paths
+            if is_manifest(p.name) and not _skipped(p.parts[:-1])
+        }
+        return sorted(p for p in found if p.is_file())
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not _skipped((d,))]
+        found.extend(Path(dirpath, f) for f in filenames if is_manifest(f))
+    return sorted(found)
@@ -0,0 +1,57 @@
+"""Aho–Corasick multi-pattern matching for brand and keyword detection.
+
+`compile_patterns()` builds the automaton once from a config list;
+`find_all()` then reports every pattern embedded in a name in one pass over
+its characters, however many patterns there are. The automaton is plain
+lists and dicts so it can live in the config snapshot next to the other
+derived structures.
+"""
+
+from collections import deque
+from typing import Any, Dict, List, Sequence
+
+
+def compile_patterns(patterns: Sequence[str]) -> Dict[str, Any]:
+    """Build the automaton; hits are reported as indices into `patterns`."""
+    goto: List[Dict[str, int]] = [{}]
+    out: List[List[int]] = [[]]
+    for index, pattern in enumerate(patterns):
+        state = 0
+        for ch in pattern:
+            nxt = goto[state].get(ch)
+            if nxt is None:
+                nxt = goto[state][ch] = len(goto)
+                goto.append({})
+                out.append([])
+            state = nxt
+        if pattern:
+            out[state].append(index)
+
+    # Breadth-first, so a state's failure target is always finished first
+    fail = [0] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for ch, nxt in goto[state].items():
+            queue.append(nxt)
+            f = fail[state]
+            while f and ch not in goto[f]:
+                f = fail[f]
+            target = goto[f].get(ch, 0)
+            fail[nxt] = target if target != nxt else 0
+            out[nxt] = out[nxt] + out[fail[nxt]]
+    return {"patterns": list(patterns), "goto": goto, "fail": fail, "out": out}
+
+
+def find_all(automaton: Dict[str, Any], text: str) -> List[int]:
+    """Sorted indices of every pattern occurring in `text` (i.e. config order)."""
+    goto, fail, out = automaton["goto"], automaton["fail"], automaton["out"]
+    state = 0
+    hits = set()
+    for ch in text:
+        while state and ch not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(ch, 0)
+        if out[state]:
+            hits.update(out[state])
+    return sorted(hits)
@@ -0,0 +1,139 @@
+"""Compact projection of PyPI metadata used by the heuristics.
+
+`PackageMetadata.from_pypi_json()` keeps only the fields skopos reads and
+drops the rest (descriptions, URLs, classifiers, digests) right after
+parsing. Per-file data is column-oriented: a tuple of filenames grouped by
+release, an `array` of upload timestamps and an `array` of release offsets,
+so a package with
+thousands of files costs roughly its filename per file instead of a dict
+per file.
+"""
+
+import math
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+
+_NO_TIME = math.nan
+
+
+def _timestamp(value) -> float:
+    """PyPI upload time (naive UTC ISO string, optionally with `Z`) as POSIX seconds."""
+    if not value:
+        return _NO_TIME
+    try:
+        return (
+            datetime.fromisoformat(value.replace("Z", ""))
+            .replace(tzinfo=timezone.utc)
+            .timestamp()
+        )
+    except (TypeError, ValueError):
+        return _NO_TIME
+
+
+class PackageMetadata:
+    __slots__ = (
+        "name",
+        "version",
+        "author",
+        "author_email",
+        "maintainer_email",
+        "downloads_last_month",
+        "requires_dist",
+        "versions",
+        "filenames",
+        "upload_times",
+        "release_starts",
+        "_release_index",
+    )
+
+    def __init__(
+        self,
+        name: str = "",
+        version: str | None = None,
+        author: str = "",
+        author_email: str = "",
+        maintainer_email: str = "",
+        downloads_last_month: int = 0,
+        requires_dist: Tuple[str, ...] = (),
+        versions: Tuple[str, ...] = (),
+        filenames: Tuple[str, ...] = (),
+        upload_times: array = None,
+        release_starts: array = None,
+    ):
+        self.name = name
+        self.version = version
+        self.author = author
+        self.author_email = author_email
+        self.maintainer_email = maintainer_email
+        self.downloads_last_month = downloads_last_month
+        self.requires_dist = requires_dist
+        # Every release, including ones without files
+        self.versions = versions
+        # Column-oriented files: filenames[i] was uploaded at upload_times[i]
+        # (POSIX seconds, NaN if unknown); the files of versions[r] are
+        # filenames[release_starts[r]:release_starts[r + 1]]
+        self.filenames = filenames
+        self.upload_times = upload_times if upload_times is not None else array("d")
+        self.release_starts = (
+            release_starts
+            if release_starts is not None
+            else array("I", [0] * (len(versions) + 1))
+        )
+        self._release_index = None
+
+    @classmethod
+    def from_pypi_json(cls, data: Dict[str, Any]) -> "PackageMetadata":
+        """Project a `/pypi/<name>/json`-shaped document onto the fields skopos uses."""
+        info = data.get("info", {}) or {}
+        releases = data.get("releases", {}) or {}
+        filenames: List[str] = []
+        upload_times = array("d")
+        release_starts = array("I", [0])
+        for files in releases.values():
+            for f in files or ():
+                filenames.append(f.get("filename") or "")
+                upload_times.append(_timestamp(f.get("upload_time")))
+            release_starts.append(len(filenames))
+        downloads = info.get("downloads") or {}
+        return cls(
+            name=info.get("name") or "",
+            version=info.get("version"),
+            author=(info.get("author") or "").strip(),
+            author_email=(info.get("author_email") or "").strip(),
+            maintainer_email=(info.get("maintainer_email") or "").strip(),
+            downloads_last_month=downloads.get("last_month", 0)
+            if isinstance(downloads, dict)
+            else 0,
+            requires_dist=tuple(info.get("requires_dist") or ()),
+            versions=tuple(releases),
+            filenames=tuple(filenames),
+            upload_times=upload_times,
+            release_starts=release_starts,
+        )
+
+    @property
+    def release_count(self) -> int:
+        return len(self.versions)
+
+    def upload_timestamps(self) -> List[float]:
+        """POSIX upload times of every file with a known time."""
+        return [ts for ts in self.upload_times if ts == ts]  # NaN != NaN
+
+    def files_for(self, version: str | None) -> List[str]:
+        """Filenames uploaded for `version` (empty if it is not a known release)."""
+        if self._release_index is None:
+            self._release_index = {v: i for i, v in enumerate(self.versions)}
+        index = self._release_index.get(version)
+        if index is None:
+            return []
+        return list(
+            self.filenames[self.release_starts[index] : self.release_starts[index + 1]]
+        )
+
+
+def as_metadata(data) -> PackageMetadata:
+    """Accept either a projected `PackageMetadata` or a raw PyPI JSON dict."""
+    if isinstance(data, PackageMetadata):
+        return data
+    return PackageMetadata.from_pypi_json(data or {})
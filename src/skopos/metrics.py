@@ -0,0 +1,315 @@
+"""In-process metrics registry with OpenMetrics text export.
+
+Counters and histograms are always updated (a lock and an add); per-phase
+durations are only collected once `enable_phase_timings()` hooks into the
+profiling spans. Export with `render()`, `write_file()` or `serve()`.
+"""
+
+import bisect
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Sequence, Tuple
+
+from skopos import profiling
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# TYPE {self.name} {self.kind}", f"# HELP {self.name} {self.help}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}_total{_labels(self.labelnames, k)} {v}" for k, v in items]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, k)} {v}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label key -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0] * (len(self.buckets) + 2)
+            row[idx] += 1
+            row[-1] += value
+
+    def count(self, **labels) -> int:
+        row = self._values.get(self._key(labels))
+        return int(sum(row[:-1])) if row else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        lines = []
+        inf = 'le="+Inf"'
+        for key, row in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, row):
+                cumulative += n
+                le = _labels(self.labelnames, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            cumulative += row[len(self.buckets)]
+            lines.append(
+                f"{self.name}_bucket{_labels(self.labelnames, key, inf)} {cumulative}"
+            )
+            lines.append(
+                f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}"
+            )
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {row[-1]}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        for metric in self._metrics:
+            with metric._lock:
+                metric._values.clear()
+
+
+REGISTRY = Registry()
+
+AUDITS = REGISTRY.register(
+    Counter("skopos_audits", "Package audits by outcome.", ["result"])
+)
+AUDIT_DURATION = REGISTRY.register(
+    Histogram("skopos_audit_duration_seconds", "Wall time of a full package audit.")
+)
+PYPI_FETCH_DURATION = REGISTRY.register(
+    Histogram("skopos_pypi_fetch_duration_seconds", "Latency of PyPI metadata fetches.")
+)
+PYPI_FETCH_FAILURES = REGISTRY.register(
+    Counter(
+        "skopos_pypi_fetch_failures",
+        "PyPI fetches that returned no metadata.",
+        ["reason"],
+    )
+)
+PYPI_BYTES = REGISTRY.register(
+    Counter(
+        "skopos_pypi_bytes",
+        "Response bytes received from PyPI by endpoint.",
+        ["endpoint"],
+    )
+)
+RELEASE_SYNCS = REGISTRY.register(
+    Counter(
+        "skopos_release_syncs",
+        "Release-history syncs by outcome (not_modified/unchanged/updated/full).",
+        ["result"],
+    )
+)
+RELEASE_FILES_ADDED = REGISTRY.register(
+    Counter(
+        "skopos_release_files_added", "Release files inserted into the history store."
+    )
+)
+PYPI_RETRIES = REGISTRY.register(
+    Counter(
+        "skopos_pypi_retries",
+        "PyPI requests retried after throttling or errors.",
+        ["reason"],
+    )
+)
+PYPI_CONCURRENCY_LIMIT = REGISTRY.register(
+    Gauge(
+        "skopos_pypi_concurrency_limit",
+        "Current adaptive concurrency window for PyPI requests.",
+    )
+)
+PYPI_FETCH_COALESCED = REGISTRY.register(
+    Counter(
+        "skopos_pypi_fetch_coalesced",
+        "Fetches served by another in-flight request for the same package.",
+    )
+)
+NEGATIVE_CACHE_HITS = REGISTRY.register(
+    Counter(
+        "skopos_negative_cache_hits",
+        "Lookups answered from the cache of missing/failing packages.",
+        ["reason"],
+    )
+)
+EARLY_EXITS = REGISTRY.register(
+    Counter(
+        "skopos_audit_early_exits",
+        "Audits whose verdict was decided before the last stage, by stage.",
+        ["stage"],
+    )
+)
+DEPENDENCY_LOOKUPS = REGISTRY.register(
+    Counter(
+        "skopos_dependency_lookups",
+        "Release dependency lists read from the edge cache or fetched.",
+        ["result"],
+    )
+)
+SUBTREE_ROLLUPS = REGISTRY.register(
+    Counter(
+        "skopos_subtree_rollups",
+        "Dependency subtree verdict rollups saved or reused.",
+        ["result"],
+    )
+)
+CACHE_REQUESTS = REGISTRY.register(
+    Counter("skopos_cache_requests", "Audit cache lookups by result.", ["result"])
+)
+CACHE_TIER_HITS = REGISTRY.register(
+    Counter(
+        "skopos_cache_tier_hits",
+        "Fresh audit entries found below the in-process tier.",
+        ["tier"],
+    )
+)
+REMOTE_CACHE_ERRORS = REGISTRY.register(
+    Counter(
+        "skopos_remote_cache_errors",
+        "Failed requests to the remote audit cache.",
+        ["op"],
+    )
+)
+CACHE_WRITES = REGISTRY.register(
+    Counter("skopos_cache_writes", "Audit results written to the cache.")
+)
+ADAPTER_ERRORS = REGISTRY.register(
+    Counter("skopos_adapter_errors", "Enrichment adapter failures.", ["adapter"])
+)
+PHASE_DURATION = REGISTRY.register(
+    Histogram(
+        "skopos_phase_duration_seconds",
+        "Duration of audit phases (heuristics, adapters, cache).",
+        ["phase"],
+    )
+)
+START_TIME = REGISTRY.register(
+    Gauge("skopos_process_start_time_seconds", "Unix time the skopos process started.")
+)
+START_TIME.set(time.time())
+
+
+def _observe_phase(name: str, seconds: float) -> None:
+    PHASE_DURATION.observe(seconds, phase=name)
+
+
+def enable_phase_timings() -> None:
+    """Feed every profiling span into `skopos_phase_duration_seconds`."""
+    profiling.add_observer(_observe_phase)
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+def write_file(path: str) -> None:
+    """Write the current metrics as an OpenMetrics text file (e.g. for a batch run)."""
+    with open(path, "w") as f:
+        f.write(render())
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve `/metrics` from a daemon thread for the lifetime of the process."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
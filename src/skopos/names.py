@@ -0,0 +1,39 @@
+"""PEP 503 name canonicalization and lookalike skeletons.
+
+Shared by every entry point that takes a package name.
+"""
+
+import re
+import sys
+from functools import lru_cache
+
+_SEPARATORS = re.compile(r"[-_.]+")
+
+# Characters that read alike in a terminal or a requirements file fold to one
+# representative; separators are dropped so `py-yaml` and `pyyaml` collide.
+_SKELETON_TABLE = str.maketrans(
+    {"0": "o", "1": "l", "i": "l", "|": "l", "5": "s", "-": None}
+)
+# Multi-character confusables, folded after the table
+_SKELETON_SEQUENCES = (("rn", "m"), ("vv", "w"))
+
+
+@lru_cache(maxsize=65536)
+def canonical_name(name: str) -> str:
+    """Lowercase and collapse runs of `-`, `_`, `.` to `-` (`Py_YAML` -> `py-yaml`).
+
+    Results are interned, so cache keys and dict lookups built from them
+    compare by identity first.
+    """
+    return sys.intern(_SEPARATORS.sub("-", name.strip()).lower())
+
+
+def skeleton(name: str) -> str:
+    """Lookalike-insensitive key.
+
+    `rnatplotlib`, `nurnpy` and `url1ib3` map to the same key as their targets.
+    """
+    key = canonical_name(name).translate(_SKELETON_TABLE)
+    for seq, rep in _SKELETON_SEQUENCES:
+        key = key.replace(seq, rep)
+    return key
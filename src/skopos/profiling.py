@@ -0,0 +1,126 @@
+"""Lightweight span instrumentation for `skopos --profile`.
+
+Spans are only recorded after `enable()`. While disabled (and no observer is
+registered), `span()` hands back a shared no-op context manager, so
+instrumented code pays one flag check.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+_ENABLED = False
+_ACTIVE = False
+_LOCK = threading.Lock()
+# (name, start_ns, duration_ns, thread_id)
+_SPANS: List[Tuple[str, int, int, int]] = []
+# Callables receiving (name, duration_seconds) for every finished span
+_OBSERVERS: List[Callable[[str, float], None]] = []
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        dur = time.perf_counter_ns() - self.start
+        if _ENABLED:
+            with _LOCK:
+                _SPANS.append((self.name, self.start, dur, threading.get_ident()))
+        for observer in _OBSERVERS:
+            observer(self.name, dur / 1e9)
+        return False
+
+
+def span(name: str):
+    """Time the enclosed block as phase `name`.
+
+    A no-op unless profiling or an observer is on.
+    """
+    return _Span(name) if _ACTIVE else _NULL_SPAN
+
+
+def enable() -> None:
+    global _ENABLED, _ACTIVE
+    _ENABLED = _ACTIVE = True
+
+
+def add_observer(observer: Callable[[str, float], None]) -> None:
+    """Call `observer(name, seconds)` for every finished span (e.g. metrics export)."""
+    global _ACTIVE
+    if observer not in _OBSERVERS:
+        _OBSERVERS.append(observer)
+    _ACTIVE = True
+
+
+def is_enabled() -> bool:
+    return _ENABLED
+
+
+def reset() -> None:
+    """Disable profiling, drop observers and recorded spans (useful in tests)."""
+    global _ENABLED, _ACTIVE
+    _ENABLED = _ACTIVE = False
+    _OBSERVERS.clear()
+    with _LOCK:
+        _SPANS.clear()
+
+
+def summary() -> List[Dict[str, Any]]:
+    """Aggregate spans per phase, slowest total first."""
+    phases: Dict[str, Dict[str, Any]] = {}
+    with _LOCK:
+        spans = list(_SPANS)
+    for name, _, dur, _ in spans:
+        entry = phases.setdefault(
+            name, {"phase": name, "calls": 0, "total_ms": 0.0, "max_ms": 0.0}
+        )
+        ms = dur / 1e6
+        entry["calls"] += 1
+        entry["total_ms"] += ms
+        entry["max_ms"] = max(entry["max_ms"], ms)
+    return sorted(phases.values(), key=lambda e: e["total_ms"], reverse=True)
+
+
+def write_chrome_trace(path: str) -> None:
+    """Write recorded spans as Chrome trace-event JSON (chrome://tracing, Perfetto)."""
+    pid = os.getpid()
+    with _LOCK:
+        spans = list(_SPANS)
+    origin = min((s[1] for s in spans), default=0)
+    events = [
+        {
+            "name": name,
+            "cat": name.split(".", 1)[0],
+            "ph": "X",
+            "ts": (start - origin) / 1000,
+            "dur": dur / 1000,
+            "pid": pid,
+            "tid": tid,
+        }
+        for name, start, dur, tid in spans
+    ]
+    with open(path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
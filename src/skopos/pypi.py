@@ -0,0 +1,346 @@
+"""Shared HTTP plumbing for talking to PyPI."""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+from packaging.version import InvalidVersion, Version
+from requests.adapters import HTTPAdapter
+
+from skopos import metrics
+
+PYPI_URL = "https://pypi.org"
+# PEP 691 JSON form of the simple index (PEP 700 adds `versions` and `upload-time`)
+SIMPLE_ACCEPT = "application/vnd.pypi.simple.v1+json"
+# Upper bound on concurrent audits sharing one connection pool
+POOL_SIZE = 16
+
+_SESSION: requests.Session | None = None
+_SESSION_LOCK = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Process-wide session so concurrent audits reuse keep-alive connections."""
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _SESSION = session
+    return _SESSION
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into one execution.
+
+    The first caller for a key runs `fn`; callers arriving while it is in
+    flight block and receive the same result (or exception). Nothing is
+    remembered once the call finishes; that is the cache's job.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict = {}
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {
+                    "done": threading.Event(),
+                    "result": None,
+                    "error": None,
+                }
+        if not leader:
+            call["done"].wait()
+        else:
+            try:
+                call["result"] = fn()
+            except BaseException as exc:
+                call["error"] = exc
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call["done"].set()
+        if call["error"] is not None:
+            raise call["error"]
+        return call["result"], not leader
+
+
+_FLIGHTS = SingleFlight()
+
+# Statuses that mean "slow down / try again" rather than "no such package"
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def coalesce(key, fn):
+    """Run `fn` once for all concurrent callers asking for `key`.
+
+    Returns (result, shared).
+    """
+    return _FLIGHTS.do(key, fn)
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency window for requests to one upstream.
+
+    Every success below `latency_target` grows the window by `1 / window`
+    (about +1 per window's worth of requests); a throttle response, an error
+    or a slow response halves it, at most once per `cooldown` seconds so a
+    burst of failures from the same window only counts once.
+    """
+
+    def __init__(
+        self,
+        max_limit=POOL_SIZE,
+        min_limit=1,
+        initial=4,
+        latency_target=2.0,
+        cooldown=1.0,
+    ):
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.latency_target = latency_target
+        self.cooldown = cooldown
+        self.window = float(min(max(initial, min_limit), max_limit))
+        self.in_flight = 0
+        self._last_decrease = float("-inf")
+        self._cond = threading.Condition()
+        metrics.PYPI_CONCURRENCY_LIMIT.set(self.window)
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, int(self.window))
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self.in_flight >= self.limit:
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self, latency: float) -> None:
+        if latency > self.latency_target:
+            self.on_congestion()
+            return
+        with self._cond:
+            self.window = min(self.max_limit, self.window + 1 / self.window)
+            metrics.PYPI_CONCURRENCY_LIMIT.set(self.window)
+            self._cond.notify_all()
+
+    def on_congestion(self) -> None:
+        with self._cond:
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self.window = max(float(self.min_limit), self.window / 2)
+            metrics.PYPI_CONCURRENCY_LIMIT.set(self.window)
+
+
+LIMITER = AdaptiveLimiter()
+
+
+def retry_after_seconds(value: str | None) -> float | None:
+    """Parse a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * (2**attempt)))
+
+
+def get(
+    url,
+    timeout=5,
+    max_retries=3,
+    backoff_base=0.5,
+    backoff_max=30.0,
+    limiter=None,
+    sleep=time.sleep,
+    headers=None,
+):
+    """GET `url` through the adaptive limiter, retrying throttled and failed requests.
+
+    429/5xx responses and connection errors are retried up to `max_retries`
+    times, waiting for `Retry-After` when the server sends one and a jittered
+    exponential backoff otherwise. A `Retry-After` longer than `backoff_max`
+    is not waited out: the last response is returned to the caller. Once
+    retries are exhausted the last response is returned (or the last
+    exception re-raised).
+    """
+    limiter = limiter or LIMITER
+    session = get_session()
+    attempt = 0
+    while True:
+        limiter.acquire()
+        start = time.monotonic()
+        try:
+            response, error = session.get(url, timeout=timeout, headers=headers), None
+        except requests.RequestException as exc:
+            response, error = None, exc
+        finally:
+            limiter.release()
+
+        if error is not None:
+            limiter.on_congestion()
+            if attempt >= max_retries:
+                raise error
+            metrics.PYPI_RETRIES.inc(reason=type(error).__name__)
+            sleep(backoff_delay(attempt, backoff_base, backoff_max))
+            attempt += 1
+            continue
+
+        if response.status_code not in RETRYABLE_STATUSES:
+            limiter.on_success(time.monotonic() - start)
+            return response
+
+        limiter.on_congestion()
+        delay = retry_after_seconds(response.headers.get("Retry-After"))
+        if attempt >= max_retries or (delay is not None and delay > backoff_max):
+            return response
+        metrics.PYPI_RETRIES.inc(reason=str(response.status_code))
+        sleep(
+            delay
+            if delay is not None
+            else backoff_delay(attempt, backoff_base, backoff_max)
+        )
+        attempt += 1
+
+
+_DIST_EXTS = (
+    ".tar.gz",
+    ".tar.bz2",
+    ".tar.xz",
+    ".tgz",
+    ".zip",
+    ".whl",
+    ".egg",
+    ".exe",
+    ".msi",
+    ".rpm",
+)
+
+
+def _parse_version(text):
+    try:
+        return Version(text)
+    except InvalidVersion:
+        return None
+
+
+def file_version(filename: str, versions: set, canonical: dict) -> str | None:
+    """Map a distribution filename to one of the project's `versions`.
+
+    Wheels and eggs carry the version in the second dash-separated field;
+    sdists end in `-<version>`. Filenames may spell the version differently
+    (normalized), so misses are retried through `canonical`
+    ({str(Version): original}).
+    """
+    stem = filename
+    for ext in _DIST_EXTS:
+        if stem.lower().endswith(ext):
+            stem = stem[: -len(ext)]
+            break
+    if filename.endswith((".whl", ".egg")):
+        candidate = stem.split("-")[1] if stem.count("-") >= 1 else ""
+    else:
+        candidate = stem.rsplit("-", 1)[-1]
+    if candidate in versions:
+        return candidate
+    parsed = _parse_version(candidate)
+    if parsed is not None and str(parsed) in canonical:
+        return canonical[str(parsed)]
+    # Legacy versions containing dashes: longest matching suffix wins
+    matches = [v for v in versions if stem.endswith(f"-{v}") or f"-{v}-" in stem]
+    return max(matches, key=len) if matches else None
+
+
+def latest_version(versions, yanked=frozenset()):
+    """The version PyPI reports as current.
+
+    That is the newest final release, else the newest pre-release.
+    """
+    parsed = [
+        (p, v)
+        for v in versions
+        if v not in yanked and (p := _parse_version(v)) is not None
+    ]
+    if not parsed:
+        return versions[-1] if versions else None
+    final = [item for item in parsed if not item[0].is_prerelease]
+    return max(final or parsed)[1]
+
+
+def simple_files_delta(doc: dict, known: dict):
+    """Diff a PEP 691 page against the files already stored for the project.
+
+    `known` maps filename -> yanked flag. Returns `(versions, new_files,
+    yank_changes)` where `new_files` holds `(version, filename, upload_ts,
+    size, sha256, yanked)` tuples for files not in `known` and
+    `yank_changes` holds `(filename, yanked)` for stored files whose yanked
+    state flipped. Only new files are mapped to a version, so an unchanged
+    history costs one pass over filenames. Returns None without PEP 700 data.
+    """
+    files, versions = doc.get("files"), doc.get("versions")
+    if files is None or versions is None:
+        return None
+    version_set = set(versions)
+    canonical = None
+    new_files, yank_changes = [], []
+    for f in files:
+        filename = f["filename"]
+        yanked = bool(f.get("yanked"))
+        if filename in known:
+            if known[filename] != yanked:
+                yank_changes.append((filename, yanked))
+            continue
+        upload_time = f.get("upload-time")
+        if upload_time is None:
+            return None
+        if canonical is None:
+            canonical = {
+                str(p): v for v in versions if (p := _parse_version(v)) is not None
+            }
+        version = file_version(filename, version_set, canonical)
+        if version is None:
+            continue
+        uploaded = (
+            datetime.fromisoformat(upload_time.replace("Z", ""))
+            .replace(tzinfo=timezone.utc)
+            .timestamp()
+        )
+        new_files.append(
+            (
+                version,
+                filename,
+                uploaded,
+                f.get("size"),
+                (f.get("hashes") or {}).get("sha256"),
+                yanked,
+            )
+        )
+    return list(versions), new_files, yank_changes
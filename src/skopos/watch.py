@@ -0,0 +1,73 @@
+"""Polling file watcher behind `skopos watch`.
+
+Stat polling needs no extra dependency and works the same on every
+platform and inside containers; a handful of manifests polled every 200ms
+costs a few syscalls per tick.
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+Signature = Optional[Tuple[int, int]]
+
+
+def _signature(path: Path) -> Signature:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class ManifestWatcher:
+    """Report which of `paths` changed, after a burst of writes has settled.
+
+    Editors often save a file in several writes (truncate, write, rename),
+    and tools like `uv add` touch pyproject.toml and uv.lock back to back.
+    `wait()` therefore returns only once nothing has changed for `debounce`
+    seconds, with every path touched during the burst.
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[Path],
+        interval: float = 0.2,
+        debounce: float = 0.3,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.paths = [Path(p) for p in paths]
+        self.interval = interval
+        self.debounce = debounce
+        self._clock = clock
+        self._sleep = sleep
+        self._seen: Dict[Path, Signature] = {p: _signature(p) for p in self.paths}
+
+    def changes(self) -> List[Path]:
+        """Paths whose mtime or size differs from the last poll."""
+        changed = []
+        for path in self.paths:
+            sig = _signature(path)
+            if sig != self._seen[path]:
+                self._seen[path] = sig
+                changed.append(path)
+        return changed
+
+    def wait(self, timeout: float | None = None) -> List[Path]:
+        """Block until a burst of changes has settled; [] if `timeout` passes first."""
+        deadline = None if timeout is None else self._clock() + timeout
+        pending: List[Path] = []
+        quiet_since = None
+        while True:
+            changed = self.changes()
+            now = self._clock()
+            if changed:
+                pending.extend(p for p in changed if p not in pending)
+                quiet_since = now
+            elif pending and now - quiet_since >= self.debounce:
+                return pending
+            elif not pending and deadline is not None and now >= deadline:
+                return []
+            self._sleep(self.interval)
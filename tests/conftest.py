@@ -0,0 +1,13 @@
+import pytest
+
+from skopos import checker
+from skopos.cache import CacheManager
+
+
+@pytest.fixture(autouse=True)
+def store(monkeypatch, tmp_path):
+    """Every test audits against a throwaway cache, never ~/.skopos/audit_cache.db."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    store = CacheManager(db_path=str(tmp_path / "cache.db"))
+    monkeypatch.setattr(checker, "cache", store)
+    return store
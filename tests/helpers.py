@@ -0,0 +1,48 @@
+"""Shared test helpers."""
+
+from packaging.version import InvalidVersion, Version
+
+from skopos import pypi
+
+
+def simple_to_metadata(name: str, doc: dict) -> dict | None:
+    """Reference `/pypi/<name>/json` shape built from a whole PEP 691 page.
+
+    Independent of the release-history store, so tests can check what the
+    store serves against it. None without PEP 700 data.
+    """
+    files, versions = doc.get("files"), doc.get("versions")
+    if files is None or versions is None:
+        return None
+    canonical = {}
+    for v in versions:
+        try:
+            canonical[str(Version(v))] = v
+        except InvalidVersion:
+            pass
+    releases = {v: [] for v in versions}
+    yanked_flags = {}
+    for f in files:
+        if f.get("upload-time") is None:
+            return None
+        version = pypi.file_version(f["filename"], set(versions), canonical)
+        if version is None:
+            continue
+        releases[version].append(
+            {
+                "filename": f["filename"],
+                "upload_time": f["upload-time"],
+                "size": f.get("size"),
+                "digests": f.get("hashes", {}),
+                "yanked": bool(f.get("yanked")),
+            }
+        )
+        yanked_flags.setdefault(version, []).append(bool(f.get("yanked")))
+    yanked = {v for v, flags in yanked_flags.items() if all(flags)}
+    return {
+        "info": {
+            "name": doc.get("name", name),
+            "version": pypi.latest_version(versions, yanked),
+        },
+        "releases": releases,
+    }
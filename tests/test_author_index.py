@@ -0,0 +1,94 @@
+import time
+
+from skopos import checker
+from skopos.checker_logic import (
+    author_emails,
+    calculate_skopos_score,
+    check_maintainer_footprint,
+)
+
+DAY = 86400
+
+
+def test_emails_are_parsed_from_author_and_maintainer_fields():
+    meta = {
+        "info": {
+            "author_email": '"Jane Doe" <Jane@Example.org>, ops@example.org',
+            "maintainer_email": "jane@example.org",
+        }
+    }
+    assert author_emails(meta) == ["jane@example.org", "ops@example.org"]
+    assert author_emails({"info": {}}) == []
+
+
+def test_index_counts_each_package_once_and_keeps_earliest_upload(store):
+    store.index_authors("pkg-a", ["dev@example.org"], 2000.0)
+    store.index_authors("Pkg_A", ["dev@example.org"], 2000.0)
+    stats = store.index_authors("pkg-b", ["dev@example.org", "new@example.org"], 1000.0)
+
+    assert stats == {"dev@example.org": (2, 1000.0), "new@example.org": (1, 1000.0)}
+    assert store.index_authors("pkg-c", ["dev@example.org"], 3000.0) == {
+        "dev@example.org": (3, 1000.0)
+    }
+
+
+def test_new_account_behind_many_packages_fails(store):
+    now = time.time()
+    for i in range(10):
+        stats = store.index_authors(f"burst-{i}", ["drop@example.org"], now - DAY)
+
+    passed, evidence = check_maintainer_footprint(stats)
+    assert not passed
+    assert evidence["emails"] == ["drop@example.org"]
+    assert calculate_skopos_score({"Maintainer": (passed, evidence)}) == 70
+
+
+def test_established_or_small_footprints_pass(store):
+    now = time.time()
+    for i in range(10):
+        store.index_authors(f"mature-{i}", ["old@example.org"], now - 400 * DAY)
+    stats = store.index_authors("fresh", ["old@example.org", "solo@example.org"], now)
+
+    passed, evidence = check_maintainer_footprint(stats)
+    assert passed
+    assert evidence["authors"]["old@example.org"] == {"packages": 11, "days_known": 400}
+    assert evidence["authors"]["solo@example.org"]["packages"] == 1
+    assert check_maintainer_footprint({}) == (True, {"authors": "none indexed"})
+
+
+def test_lookups_match_indexing_without_writing(store):
+    store.index_authors("pkg-a", ["dev@example.org"], 2000.0)
+    stats = store.author_stats("pkg-b", ["dev@example.org", "new@example.org"], 1000.0)
+
+    assert stats == {"dev@example.org": (2, 1000.0), "new@example.org": (1, 1000.0)}
+    assert store.author_stats("pkg-a", ["dev@example.org"], 500.0) == {
+        "dev@example.org": (1, 2000.0)
+    }
+    assert (
+        store.index_authors("pkg-b", ["dev@example.org", "new@example.org"], 1000.0)
+        == stats
+    )
+
+
+def test_saved_audits_feed_the_index_without_extra_requests(store):
+    meta = checker.as_metadata(
+        {
+            "info": {"version": "1.0", "author_email": "dev@example.org"},
+            "releases": {
+                "1.0": [{"filename": "a.tar.gz", "upload_time": "2020-01-01T00:00:00Z"}]
+            },
+        }
+    )
+    findings = {}
+    checker._metadata_findings("first", meta, findings)
+    assert findings["Maintainer"][0]
+    # Scoring alone leaves the index untouched; saving the audit records the package
+    assert store.author_stats("first", ["dev@example.org"], 0.0) == {
+        "dev@example.org": (1, 0.0)
+    }
+    checker._finish_audit("first", meta, findings, [], report=False)
+    checker._finish_audit("second", meta, dict(findings), [], report=False)
+
+    assert store.index_authors("third", ["dev@example.org"], time.time()) == {
+        "dev@example.org": (3, 1577836800.0)
+    }
@@ -0,0 +1,240 @@
+"""Micro-benchmarks for the heuristics, scoring and cache hot paths.
+
+Opt-in, since timings are machine dependent:
+
+    SKOPOS_BENCH=1 pytest -m benchmark -q        # compare against baseline
+    SKOPOS_BENCH=1 SKOPOS_BENCH_UPDATE=1 pytest -m benchmark  # record a baseline
+
+Timings are stored relative to a fixed pure-Python calibration loop measured
+right before each case, so the baseline carries across machines and CPU load.
+A case fails when its ratio still exceeds the baseline by more than
+SKOPOS_BENCH_THRESHOLD (default 1.0, i.e. twice as slow) after two
+re-measurements; tighten it on quiet, dedicated runners. Cases that hit
+SQLite use SKOPOS_BENCH_IO_THRESHOLD (default 3.0, i.e. four times as
+slow) instead, since disk and page-cache latency do not scale with the
+calibration loop.
+"""
+
+import json
+import os
+import timeit
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from skopos import checker_logic as cl
+from skopos import pypi
+from skopos.cache import CacheManager
+from skopos.metadata import PackageMetadata
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(
+        not os.environ.get("SKOPOS_BENCH"),
+        reason="set SKOPOS_BENCH=1 to run benchmarks",
+    ),
+]
+
+BASELINE_FILE = Path(__file__).with_name("benchmarks_baseline.json")
+THRESHOLD = float(os.environ.get("SKOPOS_BENCH_THRESHOLD", "1.0"))
+IO_THRESHOLD = float(os.environ.get("SKOPOS_BENCH_IO_THRESHOLD", "3.0"))
+UPDATE = bool(os.environ.get("SKOPOS_BENCH_UPDATE"))
+
+# Release counts from a brand-new package up to a long-lived giant.
+SIZES = {"tiny": 1, "small": 20, "medium": 200, "large": 2000}
+
+
+def make_pypi_json(releases: int, files_per_release: int = 3) -> dict:
+    """Build a synthetic `/pypi/<name>/json` document with `releases` versions."""
+    start = datetime(2015, 1, 1)
+    data = {
+        "info": {
+            "author": "Dev",
+            "author_email": "dev@example.com",
+            "downloads": {"last_month": 1200},
+        },
+        "releases": {},
+    }
+    for i in range(releases):
+        version = f"1.{i // 100}.{i % 100}"
+        uploaded = (start + timedelta(days=3 * i)).isoformat() + "Z"
+        data["releases"][version] = [
+            {
+                "filename": f"pkg-{version}-py3-none-any-{n}.whl",
+                "upload_time": uploaded,
+                "size": 40_000,
+                "digests": {"sha256": "0" * 64},
+            }
+            for n in range(files_per_release)
+        ]
+        data["info"]["version"] = version
+    data["info"]["description"] = "x" * 20_000
+    return data
+
+
+def _load_baseline() -> dict:
+    if BASELINE_FILE.exists():
+        return json.loads(BASELINE_FILE.read_text())
+    return {}
+
+
+_BASELINE = _load_baseline()
+_RESULTS: dict = {}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _write_baseline():
+    yield
+    if UPDATE and _RESULTS:
+        merged = {**_BASELINE, **_RESULTS}
+        BASELINE_FILE.write_text(
+            json.dumps(dict(sorted(merged.items())), indent=2) + "\n"
+        )
+
+
+def _calibration_loop():
+    total = 0
+    for i in range(1000):
+        total += i % 7
+    return total
+
+
+def best_per_call(fn, repeat: int = 5, min_time: float = 0.05) -> float:
+    """Best-of-`repeat` seconds per call, each repeat running at least `min_time`."""
+    timer = timeit.Timer(fn)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    return min(timer.repeat(number=number, repeat=repeat)) / number
+
+
+def _ratio(fn) -> float:
+    return best_per_call(fn) / best_per_call(_calibration_loop)
+
+
+def measure(name: str, fn, threshold: float = THRESHOLD) -> float:
+    """Record time per call (in calibration units) and check it against the baseline.
+
+    I/O-bound cases pass `threshold=IO_THRESHOLD`.
+    """
+    ratio = _ratio(fn)
+    baseline = _BASELINE.get(name)
+    if baseline and not UPDATE:
+        # A busy neighbour can slow a whole sample; only a repeatable slowdown fails
+        for _ in range(2):
+            if ratio <= baseline * (1 + threshold):
+                break
+            ratio = min(ratio, _ratio(fn))
+        assert ratio <= baseline * (1 + threshold), (
+            f"{name}: {ratio:.3f} units exceeds baseline {baseline:.3f} "
+            f"by more than {threshold:.0%}"
+        )
+    _RESULTS[name] = round(ratio, 4)
+    return ratio
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_bench_release_heuristics(size):
+    # check_package projects the document once, then every heuristic reads the model
+    data = make_pypi_json(SIZES[size])
+    meta = PackageMetadata.from_pypi_json(data)
+    measure(f"project_metadata[{size}]", lambda: PackageMetadata.from_pypi_json(data))
+    measure(f"check_resurrection[{size}]", lambda: cl.check_resurrection(meta))
+    measure(f"check_reputation[{size}]", lambda: cl.check_reputation("pkg", meta))
+    measure(f"scan_payload[{size}]", lambda: cl.scan_payload("pkg", meta))
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_bench_release_sync(size, tmp_path):
+    # fetch_pypi_data: diff the simple page against the stored files, then load
+    # the history
+    legacy = make_pypi_json(SIZES[size])
+    doc = {
+        "versions": list(legacy["releases"]),
+        "files": [
+            {
+                "filename": f["filename"],
+                "upload-time": f["upload_time"],
+                "hashes": f["digests"],
+                "size": f["size"],
+            }
+            for files in legacy["releases"].values()
+            for f in files
+        ],
+    }
+    measure(f"simple_files_delta[{size}]", lambda: pypi.simple_files_delta(doc, {}))
+    cache = CacheManager(db_path=str(tmp_path / "bench.db"))
+    cache.apply_release_delta("pkg", *pypi.simple_files_delta(doc, {}))
+    known = cache.known_release_files("pkg")
+    measure(
+        f"simple_files_delta_unchanged[{size}]",
+        lambda: pypi.simple_files_delta(doc, known),
+    )
+    measure(
+        f"load_release_history[{size}]",
+        lambda: cache.load_release_history("pkg"),
+        threshold=IO_THRESHOLD,
+    )
+
+
+@pytest.mark.parametrize(
+    "name",
+    ["requests", "reqeusts", "requests-security-patch", "totally-unrelated-name"],
+)
+def test_bench_typosquatting(name):
+    measure(
+        f"check_for_typosquatting[{name}]", lambda: cl.check_for_typosquatting(name)
+    )
+
+
+def test_bench_typosquatting_large_target_list():
+    targets = {f"project-{i:04d}": 1 for i in range(2000)}
+    measure(
+        "check_for_typosquatting[2000-targets]",
+        lambda: cl.check_for_typosquatting("unrelated-package", custom_targets=targets),
+    )
+
+
+def test_bench_levenshtein():
+    measure(
+        "levenshtein_distance[short]",
+        lambda: cl.levenshtein_distance("reqeusts", "requests"),
+    )
+    measure(
+        "levenshtein_distance[long]",
+        lambda: cl.levenshtein_distance("requests-oauthlib-extra", "requests-oauthlib"),
+    )
+
+
+def test_bench_calculate_score():
+    findings = {
+        "Typosquatting": (False, None),
+        "Identity": (True, {}),
+        "Reputation": (False, {}),
+        "Resurrection": (True, {}),
+        "Payload": (False, {}),
+    }
+    measure("calculate_skopos_score", lambda: cl.calculate_skopos_score(findings))
+
+
+def test_bench_cache_roundtrip(tmp_path):
+    cache = CacheManager(db_path=str(tmp_path / "bench.db"))
+    meta = {
+        "Typosquatting": [False, None],
+        "Identity": [True, {"email": "dev@example.com"}],
+    }
+    counter = iter(range(10**9))
+    measure(
+        "cache_save_audit",
+        lambda: cache.save_audit(f"pkg{next(counter)}", "1.0", 90, meta),
+        threshold=IO_THRESHOLD,
+    )
+    cache.save_audit("hot", "1.0", 90, meta)
+    # Served from the in-process tier: CPU-bound, so held to the normal threshold
+    measure("cache_get_cached_audit[hit]", lambda: cache.get_cached_audit("hot", "1.0"))
+    measure(
+        "cache_get_cached_audit[miss]",
+        lambda: cache.get_cached_audit("cold", "1.0"),
+        threshold=IO_THRESHOLD,
+    )
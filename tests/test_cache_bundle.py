@@ -0,0 +1,131 @@
+import gzip
+import hashlib
+import json
+import sqlite3
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from skopos import checker
+from skopos.cache import BundleError, CacheManager
+
+
+def _set_timestamp(cache, name, version, when):
+    with sqlite3.connect(cache.db_path) as conn:
+        conn.execute(
+            "UPDATE audits SET timestamp = ? WHERE package_name = ? AND version = ?",
+            (when.isoformat(), name, version),
+        )
+
+
+def test_roundtrip_keeps_newest_entry(tmp_path):
+    now = datetime.now(timezone.utc)
+    source = CacheManager(db_path=str(tmp_path / "source.db"))
+    source.save_audit("requests", "2.31.0", 95, {"Payload": [True, {}]})
+    source.save_audit("flask", "3.0.0", 90, {})
+    _set_timestamp(source, "flask", "3.0.0", now - timedelta(hours=2))
+    bundle = tmp_path / "bundle.jsonl.gz"
+    assert source.export_bundle(str(bundle)) == 2
+
+    target = CacheManager(db_path=str(tmp_path / "target.db"))
+    target.save_audit(
+        "flask", "3.0.0", 40, {"local": True}
+    )  # newer than the bundle row
+    target.save_audit("django", "5.0", 85, {})
+
+    assert target.import_bundle(str(bundle)) == (2, 1)
+    assert target.get_cached_audit("requests", "2.31.0") == (
+        95,
+        {"Payload": [True, {}]},
+    )
+    assert target.get_cached_audit("flask", "3.0.0") == (40, {"local": True})
+    assert target.get_cached_audit("django", "5.0")[0] == 85
+
+    # An older local row is replaced; re-importing the same bundle changes nothing
+    _set_timestamp(target, "flask", "3.0.0", now - timedelta(hours=3))
+    assert target.import_bundle(str(bundle)) == (2, 1)
+    assert target.get_cached_audit("flask", "3.0.0") == (90, {})
+    assert target.import_bundle(str(bundle)) == (2, 0)
+
+
+def test_tampered_or_foreign_bundles_are_rejected(tmp_path):
+    source = CacheManager(db_path=str(tmp_path / "source.db"))
+    source.save_audit("requests", "2.31.0", 95, {})
+    bundle = tmp_path / "bundle.jsonl.gz"
+    source.export_bundle(str(bundle))
+
+    lines = gzip.decompress(bundle.read_bytes()).splitlines(keepends=True)
+    lines[1] = lines[1].replace(b"95", b"10")
+    tampered = tmp_path / "tampered.jsonl.gz"
+    tampered.write_bytes(gzip.compress(b"".join(lines)))
+    truncated = tmp_path / "truncated.jsonl.gz"
+    truncated.write_bytes(gzip.compress(b"".join(lines[:2])))
+    foreign = tmp_path / "foreign.jsonl.gz"
+    foreign.write_bytes(gzip.compress(json.dumps({"format": "other"}).encode() + b"\n"))
+    plain = tmp_path / "plain.txt"
+    plain.write_text("not gzip")
+
+    target = CacheManager(db_path=str(tmp_path / "target.db"))
+    for path in (tampered, truncated, foreign, plain, tmp_path / "missing.gz"):
+        with pytest.raises(BundleError):
+            target.import_bundle(str(path))
+    assert target.get_cached_audit("requests", "2.31.0") is None
+
+
+def test_cli_export_and_import(tmp_path, monkeypatch, capsys):
+    source = CacheManager(db_path=str(tmp_path / "source.db"))
+    source.save_audit("requests", "2.31.0", 95, {})
+    bundle = tmp_path / "bundle.jsonl.gz"
+
+    monkeypatch.setattr(checker, "cache", source)
+    monkeypatch.setattr(sys, "argv", ["skopos", "cache", "export", str(bundle)])
+    with pytest.raises(SystemExit) as se:
+        checker.main()
+    assert se.value.code == 0
+
+    target = CacheManager(db_path=str(tmp_path / "target.db"))
+    monkeypatch.setattr(checker, "cache", target)
+    monkeypatch.setattr(sys, "argv", ["skopos", "cache", "import", str(bundle)])
+    with pytest.raises(SystemExit) as se:
+        checker.main()
+    assert se.value.code == 0
+    assert "Merged 1 of 1" in capsys.readouterr().out
+    assert target.get_cached_audit("requests", "2.31.0")[0] == 95
+
+
+def test_bundles_carry_staggered_expiry(tmp_path):
+    source = CacheManager(db_path=str(tmp_path / "source.db"))
+    source.save_audit("requests", "2.31.0", 95, {})
+    source.stagger_expiry([("requests", "2.31.0")], timedelta(hours=6))
+    with sqlite3.connect(source.db_path) as conn:
+        expires = conn.execute("SELECT expires_at FROM audits").fetchone()[0]
+    assert expires is not None
+    bundle = tmp_path / "bundle.jsonl.gz"
+    source.export_bundle(str(bundle))
+
+    target = CacheManager(db_path=str(tmp_path / "target.db"))
+    target.import_bundle(str(bundle))
+    with sqlite3.connect(target.db_path) as conn:
+        assert conn.execute("SELECT expires_at FROM audits").fetchone()[0] == expires
+
+
+def test_v1_bundles_still_import(tmp_path):
+    now = datetime.now(timezone.utc).isoformat()
+    row = (
+        json.dumps(["Flask", "3.0.0", 90, "{}", now], separators=(",", ":")).encode()
+        + b"\n"
+    )
+    trailer = (
+        json.dumps({"rows": 1, "sha256": hashlib.sha256(row).hexdigest()}).encode()
+        + b"\n"
+    )
+    header = (
+        json.dumps({"format": "skopos-cache-bundle", "version": 1}).encode() + b"\n"
+    )
+    bundle = tmp_path / "old.jsonl.gz"
+    bundle.write_bytes(gzip.compress(header + row + trailer))
+
+    target = CacheManager(db_path=str(tmp_path / "target.db"))
+    assert target.import_bundle(str(bundle)) == (1, 1)
+    assert target.get_cached_audit("flask", "3.0.0") == (90, {})
@@ -0,0 +1,132 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+from skopos import checker
+from skopos.cache import AUDIT_TTL, CacheManager
+
+
+def test_stagger_spreads_expiry_within_the_ttl(store):
+    names = [f"pkg-{i}" for i in range(50)]
+    for name in names:
+        store.save_audit(name, "1.0", 95, {})
+    assert (
+        store.stagger_expiry([(name, None) for name in names], timedelta(hours=6)) == 50
+    )
+
+    with sqlite3.connect(store.db_path) as conn:
+        rows = conn.execute("SELECT timestamp, expires_at FROM audits").fetchall()
+    lifetimes = [
+        datetime.fromisoformat(exp) - datetime.fromisoformat(ts) for ts, exp in rows
+    ]
+    assert all(
+        AUDIT_TTL - timedelta(hours=6) <= life <= AUDIT_TTL for life in lifetimes
+    )
+    # Spread out, not bunched into a single minute
+    assert max(lifetimes) - min(lifetimes) > timedelta(hours=4)
+    assert store.get_cached_audit("pkg-7", "latest") == (95, {})
+
+
+def test_expires_at_controls_freshness(store):
+    store.save_audit("soon", "1.0", 95, {})
+    with sqlite3.connect(store.db_path) as conn:
+        conn.execute("UPDATE audits SET expires_at = timestamp")
+    store._memory.clear()
+    assert store.get_cached_audit("soon", "latest") is None
+
+
+def test_warm_audits_manifests_and_names_bypassing_the_cache(
+    store, monkeypatch, tmp_path
+):
+    manifest = tmp_path / "requirements.txt"
+    manifest.write_text("requests==2.32\nRich>=13\n")
+    calls = []
+
+    def fake_check(name, args, use_cache=True, report=True, version=None):
+        calls.append((name, version, use_cache, report))
+        store.save_audit(name, version or "1.0", 95, {})
+        return True, 95
+
+    monkeypatch.setattr(checker, "_check_package", fake_check)
+    results = checker.warm_cache(
+        [str(manifest), "httpx>=0.27", "requests"], jobs=4, spread_hours=2
+    )
+
+    assert sorted(results) == ["httpx", "requests", "requests==2.32", "rich"]
+    assert sorted(calls, key=str) == [
+        ("httpx", None, False, False),
+        ("requests", "2.32", False, False),
+        ("requests", None, False, False),
+        ("rich", None, False, False),
+    ]
+    with sqlite3.connect(store.db_path) as conn:
+        assert (
+            conn.execute(
+                "SELECT COUNT(*) FROM audits WHERE expires_at IS NOT NULL"
+            ).fetchone()[0]
+            == 4
+        )
+
+
+def test_warmed_pins_answer_pinned_checks_without_fetching(
+    store, monkeypatch, tmp_path
+):
+    manifest = tmp_path / "requirements.txt"
+    manifest.write_text("requests==2.30.0\n")
+    monkeypatch.setattr(checker, "is_whitelisted", lambda name: False)
+    for stage in ("_metadata_findings", "_adapter_findings", "_artifact_findings"):
+        monkeypatch.setattr(
+            checker, stage, lambda package, meta, findings, version=None: None
+        )
+    fetches = []
+
+    def fake_fetch(name):
+        fetches.append(name)
+        return {"info": {"version": "2.32.0"}, "releases": {}}
+
+    monkeypatch.setattr(checker, "fetch_pypi_data", fake_fetch)
+    checker.warm_cache([str(manifest)], jobs=1)
+    assert fetches == ["requests"]
+    assert store.get_cached_audit("requests", "2.30.0") is not None
+
+    fetches.clear()
+    assert checker.audit_many(["requests"], None, pins={"requests": "2.30.0"}) == {
+        "requests": (True, 100)
+    }
+    assert fetches == []
+
+
+class RecordingRemote:
+    def __init__(self):
+        self.puts = []
+
+    def get_many(self, keys):
+        return {}
+
+    def put_many(self, entries):
+        self.puts.append(dict(entries))
+
+
+def test_warmed_entries_reach_the_remote_with_their_expiry(monkeypatch, tmp_path):
+    remote = RecordingRemote()
+    store = CacheManager(
+        db_path=str(tmp_path / "cache.db"), remote=remote, remote_batch=2
+    )
+    monkeypatch.setattr(checker, "cache", store)
+
+    def fake_check(name, args, use_cache=True, report=True, version=None):
+        store.save_audit(name, "1.0", 95, {})
+        return True, 95
+
+    monkeypatch.setattr(checker, "_check_package", fake_check)
+    checker.warm_cache(["alpha", "beta", "gamma"], jobs=1, spread_hours=6)
+
+    # Whatever was batched out early, the last write of every key carries its
+    # staggered expiry
+    final = {}
+    for batch in remote.puts:
+        final.update(batch)
+    assert set(final) == {
+        (n, v) for n in ("alpha", "beta", "gamma") for v in ("1.0", "latest")
+    }
+    assert all(entry["expires_at"] for entry in final.values())
+    assert final[("beta", "latest")]["version"] == "1.0"
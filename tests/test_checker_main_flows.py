@@ -97,7 +97,9 @@ def test_audit_project_interactive_blocks_on_fail(tmp_path, monkeypatch):
     monkeypatch.setattr(checker, "SIG_FILE", sig)
 
     # Monkeypatch check_package to return fail
-    monkeypatch.setattr(checker, "check_package", lambda name, args: (False, 10))
+    monkeypatch.setattr(
+        checker, "check_package", lambda name, args, version=None: (False, 10)
+    )
     # Simulate user answering 'n' to whitelist prompt
     monkeypatch.setattr(builtins, "input", lambda prompt="": "n")
 
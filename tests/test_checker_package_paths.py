@@ -1,5 +1,6 @@
 import types
 import json
+from datetime import datetime, timedelta
 
 import pytest
 
@@ -67,3 +68,54 @@ def test_check_package_with_snyk_and_socket(monkeypatch):
     # Snyk vulnerability should lower score below 80
     assert ok is False and score < 80
     assert saved.get("ver") == "1.2.3"
+
+
+def test_typosquat_is_blocked_before_any_network_io(monkeypatch):
+    monkeypatch.setattr(checker, "is_whitelisted", lambda n: False)
+
+    def no_network(*a, **k):
+        raise AssertionError("typosquat verdict must not need the cache or PyPI")
+
+    monkeypatch.setattr(checker.cache, "get_cached_audit", no_network)
+    monkeypatch.setattr(checker, "fetch_pypi_data", no_network)
+    ok, score = checker.check_package("reqests", None)
+    assert ok is False and score == 0
+
+
+def test_whitelist_still_overrides_name_heuristics(monkeypatch):
+    monkeypatch.setattr(checker, "is_whitelisted", lambda n: n == "reqests")
+    assert checker.check_package("reqests", None) == (True, 100)
+
+
+def test_failed_metadata_stage_skips_adapters_and_artifacts(monkeypatch):
+    # A two-year dormancy fails Resurrection, so the verdict is decided after the
+    # metadata stage
+    now = datetime.utcnow()
+    old = (now - timedelta(days=800)).replace(microsecond=0).isoformat() + "Z"
+    recent = (now - timedelta(days=1)).replace(microsecond=0).isoformat() + "Z"
+    data = {
+        "info": {"version": "1.0", "author": "a", "author_email": "a@example.com"},
+        "releases": {
+            "0.1": [{"filename": "x-0.1.tar.gz", "upload_time": old}],
+            "1.0": [{"filename": "x.exe", "upload_time": recent}],
+        },
+    }
+    monkeypatch.setattr(checker, "is_whitelisted", lambda n: False)
+    monkeypatch.setattr(checker.cache, "get_cached_audit", lambda pkg, ver: None)
+    monkeypatch.setattr(checker, "fetch_pypi_data", lambda pkg: data)
+    created = []
+    monkeypatch.setattr(checker, "SnykAdapter", lambda: created.append("snyk"))
+    monkeypatch.setattr(checker, "OSVAdapter", lambda: created.append("osv"))
+    monkeypatch.setattr(checker, "SocketAdapter", lambda: created.append("socket"))
+    saved = {}
+    monkeypatch.setattr(
+        checker.cache,
+        "save_audit",
+        lambda pkg, ver, score, findings: saved.update(findings),
+    )
+
+    ok, score = checker.check_package("dormant-thing", None)
+    assert ok is False and score < 80
+    assert created == []
+    assert saved["Skipped"] == (True, ["adapters", "artifacts"])
+    assert "Payload" not in saved
@@ -2,7 +2,10 @@
 import tomllib
 from pathlib import Path
 
-from skopos.config import load_config, reset_cache
+import os
+
+import skopos.config as config
+from skopos.config import load_compiled, load_config, reset_cache
 from skopos.checker import init_config
 
 
@@ -31,3 +34,73 @@ def test_init_config_writes(tmp_path):
     with open(target, "rb") as f:
         parsed = tomllib.load(f)
     assert "targets" in parsed
+
+
+def test_snapshot_warm_start_skips_parsing(tmp_path, monkeypatch):
+    user = tmp_path / "config.toml"
+    snap = tmp_path / "config.snapshot.json"
+    user.write_text("keyword_extra_chars = 3\n[targets]\nflask = 1\n")
+
+    reset_cache()
+    cfg, derived = load_compiled(str(user), snapshot_path=str(snap))
+    assert snap.exists()
+    assert cfg["keyword_extra_chars"] == 3
+    assert ["flask", 1] in [e[1:] for e in derived["targets"]["by_length"][5]]
+
+    # Warm start: a stat-identical source is served without TOML parsing
+    reset_cache()
+    monkeypatch.setattr(
+        config.tomllib,
+        "loads",
+        lambda *_: (_ for _ in ()).throw(AssertionError("parsed")),
+    )
+    cfg2, derived2 = load_compiled(str(user), snapshot_path=str(snap))
+    assert cfg2 == cfg
+    assert derived2["targets"]["by_length"][5] == derived["targets"]["by_length"][5]
+
+    # A touch changes the stamp but not the hash: still no parse
+    reset_cache()
+    st = user.stat()
+    os.utime(user, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert (
+        load_compiled(str(user), snapshot_path=str(snap))[0]["keyword_extra_chars"] == 3
+    )
+    reset_cache()
+
+
+def test_snapshot_invalidated_by_content_change(tmp_path):
+    user = tmp_path / "config.toml"
+    snap = tmp_path / "config.snapshot.json"
+    user.write_text("keyword_extra_chars = 3\n")
+    reset_cache()
+    load_compiled(str(user), snapshot_path=str(snap))
+
+    user.write_text("keyword_extra_chars = 44\n")
+    reset_cache()
+    cfg, _ = load_compiled(str(user), snapshot_path=str(snap))
+    assert cfg["keyword_extra_chars"] == 44
+    reset_cache()
+
+
+def test_snapshot_invalidated_by_a_change_to_the_derivation_code(tmp_path, monkeypatch):
+    user = tmp_path / "config.toml"
+    snap = tmp_path / "config.snapshot.json"
+    user.write_text("brands = ['acme']\n")
+    names_py = tmp_path / "names.py"
+    names_py.write_text("# v1\n")
+    monkeypatch.setattr(config, "_CODE_SOURCES", config._CODE_SOURCES[:1] + (names_py,))
+    reset_cache()
+    load_compiled(str(user), snapshot_path=str(snap))
+
+    # The config is untouched, but the module that builds the skeleton index changed
+    names_py.write_text("# v2, different folding\n")
+    rebuilt = []
+    monkeypatch.setattr(
+        config,
+        "compile_derived",
+        lambda cfg: rebuilt.append(cfg) or {"targets": {"by_length": {}}},
+    )
+    reset_cache()
+    load_compiled(str(user), snapshot_path=str(snap))
+    assert len(rebuilt) == 1
+    reset_cache()
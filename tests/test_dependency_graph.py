@@ -0,0 +1,107 @@
+from types import SimpleNamespace
+
+import pytest
+
+from skopos import checker, metrics
+from skopos.checker_logic import PASS_THRESHOLD
+
+GRAPH = {
+    "service-a": ["requests>=2", "click"],
+    "service-b": ["Requests", "rich; extra == 'cli'"],
+    "requests": ["urllib3<3", "certifi", "charset_normalizer"],
+    "urllib3": [],
+    "certifi": [],
+    "charset-normalizer": [],
+    "click": [],
+}
+
+
+class Response:
+    def __init__(self, payload):
+        self.status_code = 200 if payload is not None else 404
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+@pytest.fixture
+def graph(store, monkeypatch):
+    audited, fetched = [], []
+
+    def fake_check(name, args, depth=0, version=None):
+        audited.append(name)
+        store.save_audit(
+            name, "1.0", 20 if name == "certifi" and args.bad_certifi else 95, {}
+        )
+        return (
+            name != "certifi" or not args.bad_certifi
+        ), 20 if name == "certifi" and args.bad_certifi else 95
+
+    def fake_get(url, net, endpoint, headers=None):
+        name = url.split("/pypi/", 1)[1].split("/", 1)[0]
+        fetched.append(name)
+        requires = GRAPH.get(name)
+        return Response(
+            {"info": {"requires_dist": requires}} if requires is not None else None
+        )
+
+    monkeypatch.setattr(checker, "check_package", fake_check)
+    monkeypatch.setattr(checker, "_pypi_get", fake_get)
+    monkeypatch.setattr(checker, "load_config", lambda: {"pypi": {}})
+    return SimpleNamespace(store=store, audited=audited, fetched=fetched)
+
+
+def test_recursive_audit_walks_and_caches_edges(graph):
+    args = SimpleNamespace(bad_certifi=False)
+    results = checker.audit_tree(["service-a"], args, max_depth=3)
+
+    assert set(results) == {
+        "service-a",
+        "requests",
+        "click",
+        "urllib3",
+        "certifi",
+        "charset-normalizer",
+    }
+    assert all(passed for passed, _ in results.values())
+    assert graph.store.get_dependencies("requests", "1.0") == [
+        "certifi",
+        "charset-normalizer",
+        "urllib3",
+    ]
+    assert graph.store.get_dependencies("urllib3", "1.0") == []
+
+
+def test_shared_subtree_is_reused_across_projects(graph):
+    args = SimpleNamespace(bad_certifi=False)
+    checker.audit_tree(["service-a"], args, max_depth=3)
+    graph.audited.clear()
+    graph.fetched.clear()
+    reused = metrics.SUBTREE_ROLLUPS.value(result="reused")
+
+    checker.audit_tree(["service-b"], args, max_depth=3)
+
+    # Only the new root is audited and resolved; the requests subtree comes from
+    # its rollup
+    assert graph.audited == ["service-b"]
+    assert graph.fetched == ["service-b"]
+    assert metrics.SUBTREE_ROLLUPS.value(result="reused") == reused + 1
+
+
+def test_changed_node_invalidates_rollup(graph):
+    args = SimpleNamespace(bad_certifi=False)
+    checker.audit_tree(["requests"], args, max_depth=1)
+    assert graph.store.get_subtree("requests", "1.0", 1, PASS_THRESHOLD) is not None
+
+    graph.store.save_audit("certifi", "2.0", 95, {})
+    assert graph.store.get_subtree("requests", "1.0", 1, PASS_THRESHOLD) is None
+
+
+def test_failing_subtree_is_reported_and_not_rolled_up(graph):
+    args = SimpleNamespace(bad_certifi=True)
+    results = checker.audit_tree(["service-a"], args, max_depth=3)
+
+    assert results["certifi"] == (False, 20)
+    assert graph.store.get_subtree("requests", "1.0", 2, PASS_THRESHOLD) is None
+    assert graph.store.get_subtree("urllib3", "1.0", 1, PASS_THRESHOLD) is not None
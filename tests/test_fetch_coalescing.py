@@ -0,0 +1,139 @@
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from skopos import checker, metrics, pypi
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self._payload = payload
+        self.headers = {}
+        self.content = b"{}"
+
+    def json(self):
+        return self._payload
+
+
+class FakeSession:
+    def __init__(self, responses, delay=0.0):
+        self.responses = responses
+        self.delay = delay
+        self.calls = []
+
+    def get(self, url, timeout, headers=None):
+        self.calls.append(url)
+        time.sleep(self.delay)
+        result = self.responses[url.rsplit("/", 2)[-2]]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+@pytest.fixture
+def tmp_cache(store, monkeypatch):
+    monkeypatch.setattr(
+        checker,
+        "load_config",
+        lambda: {
+            "cache": {"not_found_ttl": 3600, "error_ttl": 60},
+            "pypi": {"metadata_source": "json", "max_retries": 0},
+        },
+    )
+    return store
+
+
+def test_concurrent_fetches_share_one_request(tmp_cache, monkeypatch):
+    session = FakeSession(
+        {"requests": FakeResponse(200, {"info": {"version": "2.0"}})}, delay=0.2
+    )
+    monkeypatch.setattr(pypi, "get_session", lambda: session)
+    before = metrics.PYPI_FETCH_COALESCED.value()
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(checker.fetch_pypi_data("requests"))
+        )
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(session.calls) == 1
+    assert results == [{"info": {"version": "2.0"}}] * 5
+    assert metrics.PYPI_FETCH_COALESCED.value() - before == 4
+
+
+def test_single_flight_propagates_errors_to_every_waiter():
+    flight = pypi.SingleFlight()
+    gate = threading.Event()
+    errors = []
+
+    def boom():
+        gate.wait(1)
+        raise RuntimeError("upstream")
+
+    def call():
+        try:
+            flight.do("k", boom)
+        except RuntimeError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    gate.set()
+    for t in threads:
+        t.join()
+    assert len(errors) == 3
+    # The key is released once the call finishes
+    assert flight.do("k", lambda: 1) == (1, False)
+
+
+def test_not_found_is_negatively_cached(tmp_cache, monkeypatch):
+    session = FakeSession({"reqeusts": FakeResponse(404)})
+    monkeypatch.setattr(pypi, "get_session", lambda: session)
+
+    assert checker.fetch_pypi_data("reqeusts") is None
+    assert checker.fetch_pypi_data("reqeusts") is None
+    assert len(session.calls) == 1
+    assert tmp_cache.get_negative("reqeusts") == "not_found"
+
+
+def test_transient_errors_use_the_short_ttl(tmp_cache, monkeypatch):
+    session = FakeSession(
+        {"flaky": FakeResponse(503), "slow": TimeoutError("timed out")}
+    )
+    monkeypatch.setattr(pypi, "get_session", lambda: session)
+
+    assert checker.fetch_pypi_data("flaky") is None
+    assert checker.fetch_pypi_data("slow") is None
+    assert tmp_cache.get_negative("flaky") == "error"
+    assert tmp_cache.get_negative("slow") == "error"
+
+    # Once the error TTL lapses the package is fetched again
+    with sqlite3.connect(tmp_cache.db_path) as conn:
+        past = (datetime.now(timezone.utc) - timedelta(seconds=1)).isoformat()
+        conn.execute("UPDATE negative_lookups SET expires_at = ?", (past,))
+    session.responses["flaky"] = FakeResponse(200, {"info": {}})
+    assert checker.fetch_pypi_data("flaky") == {"info": {}}
+
+
+def test_zero_ttl_disables_negative_cache(tmp_cache, monkeypatch):
+    monkeypatch.setattr(
+        checker, "load_config", lambda: {"cache": {"not_found_ttl": 0, "error_ttl": 0}}
+    )
+    session = FakeSession({"gone": FakeResponse(404)})
+    monkeypatch.setattr(pypi, "get_session", lambda: session)
+
+    checker.fetch_pypi_data("gone")
+    checker.fetch_pypi_data("gone")
+    assert len(session.calls) == 2
@@ -0,0 +1,68 @@
+import types
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from skopos import checker
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(checker, "SIG_FILE", str(tmp_path / "whitelist.sig"))
+    audited = []
+
+    def fake_check(name, args, version=None):
+        audited.append(name)
+        return True, 95
+
+    monkeypatch.setattr(checker, "check_package", fake_check)
+
+    def write(deps):
+        body = ", ".join(f'"{d}"' for d in deps)
+        (tmp_path / "pyproject.toml").write_text(
+            f'[project]\nname = "demo"\ndependencies = [{body}]\n'
+        )
+
+    return write, audited
+
+
+def test_second_run_only_audits_changed_specs(project):
+    write, audited = project
+    write(["requests>=2.0", "rich"])
+    checker.audit_project(types.SimpleNamespace())
+    assert audited == ["requests", "rich"]
+
+    audited.clear()
+    checker.audit_project(types.SimpleNamespace())
+    assert audited == []
+
+    write(["requests>=2.31", "rich", "packaging"])
+    checker.audit_project(types.SimpleNamespace())
+    assert audited == ["requests", "packaging"]
+
+    audited.clear()
+    checker.audit_project(types.SimpleNamespace(full=True))
+    assert audited == ["requests", "rich", "packaging"]
+
+
+def test_expired_failed_and_context_changes_are_reaudited(project, monkeypatch):
+    now = datetime.now(timezone.utc)
+    previous = {
+        "fresh": {"package": "fresh", "passed": True, "timestamp": now},
+        "stale": {
+            "package": "stale",
+            "passed": True,
+            "timestamp": now - timedelta(days=2),
+        },
+        "failed": {"package": "failed", "passed": False, "timestamp": now},
+    }
+    context = checker._audit_context_fingerprint()
+    deps = ["fresh", "stale", "failed", "new"]
+
+    reuse, pending = checker.plan_incremental_audit(deps, f"{context}:x", previous)
+    assert list(reuse) == ["fresh"]
+    assert pending == ["stale", "failed", "new"]
+
+    reuse, pending = checker.plan_incremental_audit(deps, "other-context:x", previous)
+    assert reuse == {} and pending == deps
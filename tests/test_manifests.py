@@ -0,0 +1,147 @@
+import pytest
+
+from skopos import manifests
+
+
+def test_parse_requirements_skips_options_and_comments():
+    text = (
+        "# pinned\nrequests==2.31.0  # http\n-r base.txt\n--hash=sha256:abc\n"
+        "rich>=13 \\\n    ; python_version>'3.8'\nhttps://example.com/pkg.whl\n\n"
+    )
+    assert manifests.parse_requirements(text) == [
+        "requests==2.31.0",
+        "rich>=13      ; python_version>'3.8'",
+    ]
+
+
+def test_parse_pyproject_collects_all_groups():
+    text = """
+[project]
+dependencies = ["requests>=2"]
+[project.optional-dependencies]
+fast = ["orjson"]
+[dependency-groups]
+dev = ["pytest", {include-group = "fast"}]
+"""
+    assert manifests.parse_pyproject(text) == ["requests>=2", "orjson", "pytest"]
+    assert manifests.parse_pyproject("not = [toml") == []
+
+
+def test_requirement_name_and_delta():
+    assert (
+        manifests.requirement_name("PyYAML[extra] (>=5.4); python_version>'3'")
+        == "PyYAML"
+    )
+    old = ["requests>=2.0", "rich", "Py_YAML==6.0"]
+    new = ["requests >= 2.0", "rich==13.0", "py-yaml==6.0", "packaging"]
+    assert manifests.requirement_delta(old, new) == ["rich", "packaging"]
+    assert manifests.is_manifest("svc/requirements-dev.txt")
+    assert not manifests.is_manifest("setup.cfg")
+
+
+def _tree(root):
+    for rel in (
+        "pyproject.toml",
+        "svc/api/requirements.txt",
+        "svc/api/requirements-dev.txt",
+        "svc/worker/pyproject.toml",
+        ".venv/lib/pyproject.toml",
+        "node_modules/x/requirements.txt",
+        "svc/api/vendor/requirements.txt",
+        "svc/api/README.md",
+    ):
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+
+
+def test_discover_manifests_walks_and_skips_vendored_dirs(tmp_path):
+    _tree(tmp_path)
+    found = [
+        p.relative_to(tmp_path).as_posix()
+        for p in manifests.discover_manifests(tmp_path)
+    ]
+    assert found == [
+        "pyproject.toml",
+        "svc/api/requirements-dev.txt",
+        "svc/api/requirements.txt",
+        "svc/worker/pyproject.toml",
+    ]
+
+
+def test_discover_manifests_without_git_walks_the_tree(tmp_path, monkeypatch):
+    def no_git(*args, **kwargs):
+        raise FileNotFoundError("git")
+
+    _tree(tmp_path)
+    monkeypatch.setattr(manifests.subprocess, "run", no_git)
+    found = [
+        p.relative_to(tmp_path).as_posix()
+        for p in manifests.discover_manifests(tmp_path)
+    ]
+    assert found == [
+        "pyproject.toml",
+        "svc/api/requirements-dev.txt",
+        "svc/api/requirements.txt",
+        "svc/worker/pyproject.toml",
+    ]
+
+
+def test_discover_manifests_honours_gitignore(tmp_path):
+    import shutil
+    import subprocess
+
+    if not shutil.which("git"):
+        pytest.skip("git not available")
+    _tree(tmp_path)
+    (tmp_path / ".gitignore").write_text("svc/worker/\n")
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    found = [
+        p.relative_to(tmp_path).as_posix()
+        for p in manifests.discover_manifests(tmp_path)
+    ]
+    assert found == [
+        "pyproject.toml",
+        "svc/api/requirements-dev.txt",
+        "svc/api/requirements.txt",
+    ]
+
+
+def test_parse_uv_lock_keeps_registry_packages():
+    text = """
+version = 1
+[[package]]
+name = "myapp"
+version = "0.1.0"
+source = { editable = "." }
+[[package]]
+name = "requests"
+version = "2.32.3"
+source = { registry = "https://pypi.org/simple" }
+[[package]]
+name = "local-lib"
+version = "1.0"
+source = { path = "../lib" }
+"""
+    assert manifests.parse_manifest("uv.lock", text) == ["requests==2.32.3"]
+    assert not manifests.is_manifest("uv.lock")
+
+
+@pytest.mark.parametrize(
+    "spec,version",
+    [
+        ("requests==2.31.0", "2.31.0"),
+        ("Flask_Login === 0.6.3", "0.6.3"),
+        ("rich==13.*", None),
+        ("httpx>=0.27", None),
+        ("idna", None),
+    ],
+)
+def test_pinned_version(spec, version):
+    assert manifests.pinned_version(spec) == version
+
+
+def test_pins_by_name_keeps_exact_pins_only():
+    assert manifests.pins_by_name(
+        ["Requests==2.30.0", "rich>=13", "py_yaml==6.0.1"]
+    ) == {"requests": "2.30.0", "py-yaml": "6.0.1"}
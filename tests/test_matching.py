@@ -0,0 +1,41 @@
+import random
+
+from skopos import checker_logic as cl
+from skopos.matching import compile_patterns, find_all
+
+
+def naive(patterns, text):
+    return [i for i, p in enumerate(patterns) if p and p in text]
+
+
+def test_finds_overlapping_and_nested_patterns():
+    patterns = ["he", "she", "his", "hers", "requests", "request", "quest"]
+    automaton = compile_patterns(patterns)
+    assert find_all(automaton, "ushers") == [0, 1, 3]
+    assert find_all(automaton, "requests-ultra") == [4, 5, 6]
+    assert find_all(automaton, "flask") == []
+
+
+def test_matches_naive_substring_search():
+    rng = random.Random(7)
+    patterns = list(
+        dict.fromkeys(
+            "".join(rng.choice("abc-") for _ in range(rng.randint(1, 5)))
+            for _ in range(300)
+        )
+    )
+    automaton = compile_patterns(patterns)
+    for _ in range(200):
+        text = "".join(rng.choice("abcd-") for _ in range(rng.randint(0, 20)))
+        assert find_all(automaton, text) == naive(patterns, text)
+
+
+def test_brand_and_keyword_heuristics_use_the_automaton():
+    meta = {"info": {"author_email": "dev@example.com"}, "releases": {"0.1": []}}
+    ok, info = cl.check_author_reputation("google-auth-helper", meta)
+    assert ok is False and "Google" in info["reason"]
+    assert cl.check_author_reputation("helper", meta)[0] is True
+    assert cl.check_for_typosquatting("requests-ultra") == (
+        True,
+        "requests (Keyword match)",
+    )
@@ -0,0 +1,85 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from skopos import checker_logic as cl
+from skopos.integrations.osv_adapter import OSVAdapter
+from skopos.metadata import PackageMetadata, as_metadata
+
+RAW = {
+    "info": {
+        "name": "acme",
+        "version": "1.1",
+        "author": " Dev ",
+        "author_email": "dev@example.com",
+        "description": "x" * 100_000,
+        "downloads": {"last_month": 42},
+        "requires_dist": ["requests>=2", "pytest; extra == 'test'"],
+    },
+    "releases": {
+        "1.0": [
+            {
+                "filename": "acme-1.0.tar.gz",
+                "upload_time": "2020-01-01T00:00:00",
+                "digests": {},
+            }
+        ],
+        "1.1": [
+            {
+                "filename": "acme-1.1.tar.gz",
+                "upload_time": "2020-03-01T12:30:00.123456Z",
+            },
+            {"filename": "acme-1.1.exe"},
+        ],
+        "2.0a1": [],
+    },
+}
+
+
+def test_projection_keeps_only_used_fields():
+    meta = PackageMetadata.from_pypi_json(RAW)
+    assert not hasattr(meta, "__dict__")
+    assert (meta.name, meta.version, meta.author, meta.author_email) == (
+        "acme",
+        "1.1",
+        "Dev",
+        "dev@example.com",
+    )
+    assert meta.downloads_last_month == 42
+    assert meta.release_count == 3
+    assert meta.files_for("1.1") == ["acme-1.1.tar.gz", "acme-1.1.exe"]
+    assert meta.files_for("2.0a1") == [] and meta.files_for("9.9") == []
+    # Files without an upload time are kept but contribute no timestamp
+    assert meta.upload_timestamps() == [
+        datetime(2020, 1, 1, tzinfo=timezone.utc).timestamp(),
+        datetime(2020, 3, 1, 12, 30, 0, 123456, tzinfo=timezone.utc).timestamp(),
+    ]
+    assert as_metadata(meta) is meta
+    assert as_metadata(None).release_count == 0
+
+
+@pytest.mark.parametrize(
+    "heuristic",
+    [
+        lambda d: cl.check_resurrection(d),
+        lambda d: cl.check_reputation("acme", d),
+        lambda d: cl.scan_payload("acme", d),
+        lambda d: cl.check_author_reputation("acme", d),
+        lambda d: sorted(cl.get_dependencies(d)),
+    ],
+)
+def test_heuristics_give_the_same_answer_for_dict_and_model(heuristic):
+    assert heuristic(RAW) == heuristic(PackageMetadata.from_pypi_json(RAW))
+
+
+def test_adapters_accept_the_model(monkeypatch, tmp_path):
+    adapter = OSVAdapter()
+    (tmp_path / "osv.db").touch()
+    adapter.enabled, adapter.db_path = True, str(tmp_path / "osv.db")
+    captured = {}
+    monkeypatch.setattr(
+        "skopos.integrations.osv_adapter.query_advisories",
+        lambda db, name, version: captured.setdefault("version", version) and [],
+    )
+    adapter.enrich("acme", PackageMetadata.from_pypi_json(RAW))
+    assert captured["version"] == "1.1"
@@ -0,0 +1,79 @@
+import sys
+import urllib.request
+
+import pytest
+
+from skopos import checker, metrics, profiling
+from skopos.cache import CacheManager
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry():
+    metrics.REGISTRY.reset()
+    profiling.reset()
+    yield
+    profiling.reset()
+
+
+def test_openmetrics_rendering():
+    metrics.AUDITS.inc(result="pass")
+    metrics.AUDITS.inc(result="pass")
+    metrics.PYPI_FETCH_DURATION.observe(0.03)
+    metrics.PYPI_FETCH_DURATION.observe(7)
+
+    text = metrics.render()
+    assert text.endswith("# EOF\n")
+    assert "# TYPE skopos_audits counter" in text
+    assert 'skopos_audits_total{result="pass"} 2' in text
+    assert 'skopos_pypi_fetch_duration_seconds_bucket{le="0.05"} 1' in text
+    assert 'skopos_pypi_fetch_duration_seconds_bucket{le="+Inf"} 2' in text
+    assert "skopos_pypi_fetch_duration_seconds_count 2" in text
+
+
+def test_cache_manager_feeds_hit_and_miss(tmp_path):
+    cm = CacheManager(db_path=str(tmp_path / "cache.db"))
+    cm.get_cached_audit("pkg", "1.0")
+    cm.save_audit("pkg", "1.0", 90, {})
+    cm.get_cached_audit("pkg", "1.0")
+    assert metrics.CACHE_REQUESTS.value(result="miss") == 1
+    assert metrics.CACHE_REQUESTS.value(result="hit") == 1
+    assert metrics.CACHE_WRITES.value() == 1
+
+
+def test_phase_timings_follow_spans():
+    with profiling.span("heuristic.payload"):
+        pass
+    assert metrics.PHASE_DURATION.count(phase="heuristic.payload") == 0
+
+    metrics.enable_phase_timings()
+    with profiling.span("heuristic.payload"):
+        pass
+    assert metrics.PHASE_DURATION.count(phase="heuristic.payload") == 1
+
+
+def test_main_writes_metrics_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(checker, "ensure_whitelist_exists", lambda: None)
+    monkeypatch.setattr(checker, "verify_whitelist_integrity", lambda: True)
+    monkeypatch.setattr(checker, "is_whitelisted", lambda n: True)
+    out = tmp_path / "skopos.prom"
+    monkeypatch.setattr(
+        sys, "argv", ["skopos", "--metrics-file", str(out), "check", "somepkg"]
+    )
+    checker.main()
+    text = out.read_text()
+    assert 'skopos_audits_total{result="whitelisted"} 1' in text
+    assert 'skopos_phase_duration_seconds_count{phase="whitelist"} 1' in text
+
+
+def test_http_endpoint_serves_metrics():
+    server = metrics.serve(0)
+    try:
+        metrics.AUDITS.inc(result="fail")
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as resp:
+            assert resp.headers["Content-Type"].startswith(
+                "application/openmetrics-text"
+            )
+            assert 'skopos_audits_total{result="fail"} 1' in resp.read().decode()
+    finally:
+        server.shutdown()
@@ -0,0 +1,88 @@
+import sys
+import threading
+
+import pytest
+
+from skopos import checker
+
+
+@pytest.fixture
+def quiet_main(monkeypatch):
+    monkeypatch.setattr(checker, "ensure_whitelist_exists", lambda: None)
+    monkeypatch.setattr(checker, "verify_whitelist_integrity", lambda: True)
+
+
+def test_check_accepts_many_packages_and_runs_concurrently(quiet_main, monkeypatch):
+    barrier = threading.Barrier(3, timeout=5)
+    seen = []
+
+    def fake_check(name, args, version=None):
+        # All three must be in flight at once for the barrier to release
+        barrier.wait()
+        seen.append(name)
+        return True, 100
+
+    monkeypatch.setattr(checker, "check_package", fake_check)
+    monkeypatch.setattr(
+        sys, "argv", ["skopos", "check", "alpha", "beta>=2", "gamma[extra]", "alpha"]
+    )
+    checker.main()
+    assert sorted(seen) == ["alpha", "beta", "gamma"]
+
+
+def test_strict_fails_if_any_package_fails(quiet_main, monkeypatch):
+    monkeypatch.setattr(
+        checker,
+        "check_package",
+        lambda name, args, version=None: (name != "bad", 10 if name == "bad" else 95),
+    )
+    monkeypatch.setattr(sys, "argv", ["skopos", "--strict", "check", "good", "bad"])
+    with pytest.raises(SystemExit) as se:
+        checker.main()
+    assert se.value.code == 2
+
+
+def test_fetch_uses_shared_session(monkeypatch):
+    calls = []
+
+    class FakeResponse:
+        status_code = 200
+        content = b"{}"
+
+        def json(self):
+            return {"info": {}}
+
+    class FakeSession:
+        def get(self, url, timeout, headers=None):
+            calls.append(url)
+            return FakeResponse()
+
+    monkeypatch.setattr(checker.pypi, "get_session", lambda: FakeSession())
+    monkeypatch.setattr(
+        checker, "load_config", lambda: {"pypi": {"metadata_source": "json"}}
+    )
+    assert checker.fetch_pypi_data("requests") == {"info": {}}
+    assert calls == ["https://pypi.org/pypi/requests/json"]
+
+
+def test_audit_tree_dedupes_across_manifests(quiet_main, monkeypatch, tmp_path, capsys):
+    repo = tmp_path / "repo"
+    (repo / "svc-a").mkdir(parents=True)
+    (repo / "svc-b").mkdir()
+    (repo / "svc-a" / "pyproject.toml").write_text(
+        '[project]\ndependencies = ["requests>=2", "bad"]\n'
+    )
+    (repo / "svc-b" / "requirements.txt").write_text("Requests==2.31\nrich\n")
+    calls = []
+
+    def fake_check(name, args, version=None):
+        calls.append(name)
+        return name != "bad", 10 if name == "bad" else 95
+
+    monkeypatch.setattr(checker, "check_package", fake_check)
+    monkeypatch.setattr(sys, "argv", ["skopos", "audit", "--tree", str(repo)])
+    with pytest.raises(SystemExit) as se:
+        checker.main()
+    assert se.value.code == 1
+    assert sorted(calls) == ["bad", "requests", "rich"]
+    assert "svc-a/pyproject.toml" in capsys.readouterr().out
@@ -0,0 +1,130 @@
+import json
+import sqlite3
+
+import pytest
+
+from skopos import checker, pypi
+from skopos.cache import CacheManager
+from skopos.checker_logic import check_for_typosquatting
+from skopos.names import canonical_name, skeleton
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self._payload = payload
+        self.headers = {}
+        self.content = b"{}"
+
+    def json(self):
+        return self._payload
+
+
+class FakeSession:
+    def __init__(self, payload):
+        self.payload = payload
+        self.calls = []
+
+    def get(self, url, timeout, headers=None):
+        self.calls.append(url)
+        return FakeResponse(200, self.payload)
+
+
+@pytest.mark.parametrize(
+    "raw,expected",
+    [
+        ("Requests", "requests"),
+        ("requests_oauthlib", "requests-oauthlib"),
+        ("zope.interface", "zope-interface"),
+        ("Foo__Bar-.baz", "foo-bar-baz"),
+        ("  PyYAML\n", "pyyaml"),
+    ],
+)
+def test_canonical_name(raw, expected):
+    assert canonical_name(raw) == expected
+
+
+def test_separator_variant_of_target_is_not_a_typosquat():
+    assert check_for_typosquatting("requests_oauthlib", {"requests-oauthlib": 2}) == (
+        False,
+        None,
+    )
+    assert check_for_typosquatting("Requests", {"requests": 2}) == (False, None)
+
+
+def test_whitelist_matches_any_spelling(monkeypatch, tmp_path):
+    whitelist = tmp_path / "whitelist"
+    whitelist.write_text("# comment\nRequests_OAuthlib\n")
+    monkeypatch.setattr(checker, "WHITELIST_FILE", str(whitelist))
+    assert checker.is_whitelisted("requests-oauthlib")
+    assert checker.is_whitelisted("REQUESTS.oauthlib")
+    assert not checker.is_whitelisted("requests")
+
+
+def test_spelling_variants_share_cache_and_fetch(store, monkeypatch):
+    monkeypatch.setattr(
+        checker,
+        "load_config",
+        lambda: {
+            "cache": {"not_found_ttl": 3600, "error_ttl": 60},
+            "pypi": {"metadata_source": "json", "max_retries": 0},
+        },
+    )
+    session = FakeSession(
+        {"info": {"name": "PyYAML", "version": "6.0"}, "releases": {}}
+    )
+    monkeypatch.setattr(pypi, "get_session", lambda: session)
+
+    assert checker.fetch_pypi_data("PyYAML")["info"]["version"] == "6.0"
+    assert session.calls[0].endswith("/pyyaml/json")
+
+    store.save_audit("PyYAML", "6.0", 90, {})
+    assert store.get_cached_audit("pyyaml", "6.0") == (90, {})
+    assert store.latest_version("PYYAML") == "6.0"
+
+
+def test_existing_rows_are_migrated_to_canonical_names(tmp_path):
+    db = tmp_path / "legacy.db"
+    with sqlite3.connect(db) as conn:
+        conn.execute(
+            "CREATE TABLE audits (package_name TEXT, version TEXT, score INTEGER, "
+            "meta_json TEXT, timestamp DATETIME, PRIMARY KEY (package_name, version))"
+        )
+        conn.executemany(
+            "INSERT INTO audits VALUES (?, ?, ?, ?, ?)",
+            [
+                ("Django", "5.0", 70, json.dumps({}), "2026-01-01T00:00:00+00:00"),
+                ("django", "5.0", 80, json.dumps({}), "2025-01-01T00:00:00+00:00"),
+                ("Flask_Login", "0.6", 60, json.dumps({}), "2025-06-01T00:00:00+00:00"),
+            ],
+        )
+
+    CacheManager(db_path=str(db))
+
+    with sqlite3.connect(db) as conn:
+        rows = conn.execute(
+            "SELECT package_name, version, score FROM audits ORDER BY package_name"
+        ).fetchall()
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 1
+    # The newer "Django" row wins over the older canonical one
+    assert rows == [("django", "5.0", 70), ("flask-login", "0.6", 60)]
+
+
+@pytest.mark.parametrize(
+    "lookalike,target",
+    [
+        ("rnatplotlib", "matplotlib"),
+        ("nurnpy", "numpy"),
+        ("url1ib3", "urllib3"),
+        ("djang0", "django"),
+        ("py-yaml", "pyyaml"),
+    ],
+)
+def test_lookalikes_share_a_skeleton_with_their_target(lookalike, target):
+    assert skeleton(lookalike) == skeleton(target)
+    assert check_for_typosquatting(lookalike) == (True, f"{target} (Lookalike)")
+
+
+def test_targets_and_their_spellings_are_not_lookalikes():
+    assert check_for_typosquatting("PyYAML") == (False, None)
+    assert check_for_typosquatting("urllib3") == (False, None)
@@ -0,0 +1,204 @@
+import json
+import zipfile
+
+import pytest
+from packaging.version import Version
+
+import skopos.integrations.osv_adapter as oa
+
+
+def make_export(tmp_path, advisories):
+    path = tmp_path / "all.zip"
+    with zipfile.ZipFile(path, "w") as zf:
+        for adv in advisories:
+            zf.writestr(f"{adv['id']}.json", json.dumps(adv))
+    return path
+
+
+ADVISORIES = [
+    {
+        "id": "PYSEC-1",
+        "summary": "Header injection",
+        "aliases": ["CVE-2023-1"],
+        "affected": [
+            {
+                "package": {"ecosystem": "PyPI", "name": "Requests"},
+                "ranges": [
+                    {
+                        "type": "ECOSYSTEM",
+                        "events": [{"introduced": "0"}, {"fixed": "2.31.0"}],
+                    }
+                ],
+            }
+        ],
+    },
+    {
+        "id": "PYSEC-2",
+        "summary": "Bad pickle",
+        "affected": [
+            {
+                "package": {"ecosystem": "PyPI", "name": "PyYAML"},
+                "ranges": [
+                    {
+                        "type": "ECOSYSTEM",
+                        "events": [{"introduced": "5.1"}, {"last_affected": "5.3"}],
+                    }
+                ],
+                "versions": ["4.2b1"],
+            }
+        ],
+    },
+    {
+        "id": "GHSA-npm",
+        "affected": [
+            {"package": {"ecosystem": "npm", "name": "requests"}, "versions": ["1.0.0"]}
+        ],
+    },
+]
+
+
+@pytest.mark.parametrize(
+    "versions",
+    [
+        [
+            "1.0.dev1",
+            "1.0a1",
+            "1.0a2.dev1",
+            "1.0a2",
+            "1.0b1",
+            "1.0rc1",
+            "1.0",
+            "1.0.post1",
+            "1.0.1",
+            "1.1",
+            "1!0.1",
+        ],
+        ["0", "0.0.1", "0.1", "2.9", "2.10", "10.0"],
+    ],
+)
+def test_version_key_matches_pep440_order(versions):
+    keys = [oa.version_key(v) for v in versions]
+    assert sorted(keys) == keys
+    assert sorted(versions, key=Version) == versions
+    assert oa.version_key("1.0") == oa.version_key("1.0.0")
+    assert oa.version_key("not a version") is None
+
+
+def test_import_and_query_ranges(tmp_path):
+    db = tmp_path / "osv.db"
+    assert oa.import_osv_zip(str(make_export(tmp_path, ADVISORIES)), str(db)) == 2
+
+    assert [a["id"] for a in oa.query_advisories(str(db), "requests", "2.30.0")] == [
+        "PYSEC-1"
+    ]
+    assert oa.query_advisories(str(db), "requests", "2.31.0") == []
+    assert oa.query_advisories(str(db), "requests", "2.30.0")[0]["fixed"] == "2.31.0"
+
+    # last_affected is inclusive, explicit versions match exactly
+    assert oa.query_advisories(str(db), "PyYAML", "5.3")
+    assert oa.query_advisories(str(db), "py_yaml", "5.3") == []
+    assert not oa.query_advisories(str(db), "pyyaml", "5.3.1")
+    assert oa.query_advisories(str(db), "pyyaml", "4.2b1")
+    assert not oa.query_advisories(str(db), "pyyaml", "4.2")
+
+    # Re-importing replaces ranges instead of duplicating them
+    oa.import_osv_zip(str(make_export(tmp_path, ADVISORIES)), str(db))
+    assert len(oa.query_advisories(str(db), "requests", "1.0")) == 1
+
+
+def test_osv_adapter_enrich(tmp_path, monkeypatch):
+    db = tmp_path / "osv.db"
+    oa.import_osv_zip(str(make_export(tmp_path, ADVISORIES)), str(db))
+    monkeypatch.setattr(
+        oa,
+        "load_config",
+        lambda: {"integrations": {"osv": {"enabled": True, "db_path": str(db)}}},
+    )
+
+    adapter = oa.OSVAdapter()
+    assert adapter.is_enabled()
+    enriched = adapter.enrich("requests", {"info": {"version": "2.0"}})
+    assert enriched["vulnerabilities"][0]["aliases"] == ["CVE-2023-1"]
+    assert adapter.enrich("requests", {}) == {}
+
+
+def test_pinned_version_is_checked_instead_of_latest(tmp_path, monkeypatch):
+    from skopos import checker
+
+    db = tmp_path / "osv.db"
+    oa.import_osv_zip(str(make_export(tmp_path, ADVISORIES)), str(db))
+    monkeypatch.setattr(
+        oa,
+        "load_config",
+        lambda: {"integrations": {"osv": {"enabled": True, "db_path": str(db)}}},
+    )
+    monkeypatch.setattr(checker, "is_whitelisted", lambda n: False)
+    monkeypatch.setattr(checker.cache, "get_cached_audit", lambda pkg, ver: None)
+    latest = {
+        "info": {"version": "2.32.0", "author_email": "dev@example.com"},
+        "releases": {},
+    }
+    monkeypatch.setattr(checker, "fetch_pypi_data", lambda pkg: latest)
+    saved = {}
+    monkeypatch.setattr(
+        checker.cache,
+        "save_audit",
+        lambda pkg, ver, score, findings: saved.update({ver: findings}),
+    )
+
+    checker.audit_many(["requests", "pyyaml"], None, pins={"requests": "2.30.0"})
+
+    assert [v["id"] for v in saved["2.30.0"]["OSV"][1]] == ["PYSEC-1"]
+    assert saved["2.32.0"]["OSV"] == (True, [])
+
+
+def test_queries_reuse_one_connection_per_thread(tmp_path, monkeypatch):
+    db = tmp_path / "osv.db"
+    oa.import_osv_zip(str(make_export(tmp_path, ADVISORIES)), str(db))
+    opened = []
+    real_connect = oa.sqlite3.connect
+    monkeypatch.setattr(
+        oa.sqlite3, "connect", lambda path: opened.append(path) or real_connect(path)
+    )
+
+    for version in ("1.0", "2.0", "2.31.0"):
+        oa.query_advisories(str(db), "requests", version)
+    assert len(opened) == 1
+
+
+def test_unparsable_bounds_never_widen_a_range(tmp_path, caplog):
+    advisory = {
+        "id": "PYSEC-3",
+        "affected": [
+            {
+                "package": {"ecosystem": "PyPI", "name": "oddpkg"},
+                "ranges": [
+                    {
+                        "type": "ECOSYSTEM",
+                        "events": [{"introduced": "1.0"}, {"fixed": "not-a-version"}],
+                    },
+                    {
+                        "type": "ECOSYSTEM",
+                        "events": [
+                            {"introduced": "bogus"},
+                            {"fixed": "3.0"},
+                            {"introduced": "4.0"},
+                            {"fixed": "4.1"},
+                        ],
+                    },
+                ],
+                "versions": ["1.5"],
+            }
+        ],
+    }
+    db = tmp_path / "osv.db"
+    oa.import_osv_zip(str(make_export(tmp_path, [advisory])), str(db))
+
+    assert oa.query_advisories(
+        str(db), "oddpkg", "1.5"
+    )  # still matched through the explicit list
+    assert oa.query_advisories(str(db), "oddpkg", "4.0")
+    for version in ("1.2", "2.0", "9.0", "4.1"):
+        assert oa.query_advisories(str(db), "oddpkg", version) == []
+    assert "unparsable fixed version 'not-a-version'" in caplog.text
+    assert "unparsable introduced version 'bogus'" in caplog.text
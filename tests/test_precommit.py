@@ -0,0 +1,50 @@
+import subprocess
+import sys
+
+import pytest
+
+from skopos import checker
+
+
+def git(cwd, *args):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "config", "user.email", "dev@example.com")
+    git(tmp_path, "config", "user.name", "dev")
+    (tmp_path / "requirements.txt").write_text("requests==2.31.0\nrich\n")
+    git(tmp_path, "add", "requirements.txt")
+    git(tmp_path, "commit", "-qm", "init")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_precommit_audits_only_staged_delta(repo, monkeypatch):
+    (repo / "requirements.txt").write_text("requests==2.32.0\nrich\nreqeusts\n")
+    git(repo, "add", "requirements.txt")
+    # Unstaged edits are not part of the commit and must be ignored
+    (repo / "requirements.txt").write_text("requests==2.32.0\nrich\nreqeusts\nflask\n")
+
+    audited = []
+
+    def fake_check(name, args, version=None):
+        audited.append(name)
+        return name != "reqeusts", 0 if name == "reqeusts" else 95
+
+    monkeypatch.setattr(checker, "check_package", fake_check)
+    assert checker.precommit_delta(["requirements.txt"]) == ["requests", "reqeusts"]
+    assert checker.precommit([], None) is False
+    assert sorted(audited) == ["reqeusts", "requests"]
+
+
+def test_precommit_main_no_changes(repo, monkeypatch):
+    monkeypatch.setattr(checker, "ensure_whitelist_exists", lambda: None)
+    monkeypatch.setattr(checker, "verify_whitelist_integrity", lambda: True)
+    monkeypatch.setattr(
+        checker, "check_package", lambda *a: pytest.fail("nothing to audit")
+    )
+    monkeypatch.setattr(sys, "argv", ["skopos", "precommit", "requirements.txt"])
+    checker.main()
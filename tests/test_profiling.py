@@ -0,0 +1,70 @@
+import json
+import sys
+
+import pytest
+
+from skopos import checker, profiling
+
+
+@pytest.fixture(autouse=True)
+def _reset_profiling():
+    profiling.reset()
+    yield
+    profiling.reset()
+
+
+def test_span_is_noop_when_disabled():
+    with profiling.span("phase"):
+        pass
+    assert profiling.summary() == []
+
+
+def test_summary_and_chrome_trace(tmp_path):
+    profiling.enable()
+    for _ in range(3):
+        with profiling.span("heuristic.payload"):
+            pass
+    with profiling.span("pypi.fetch"):
+        pass
+
+    phases = {e["phase"]: e for e in profiling.summary()}
+    assert phases["heuristic.payload"]["calls"] == 3
+    assert phases["pypi.fetch"]["calls"] == 1
+
+    trace = tmp_path / "trace.json"
+    profiling.write_chrome_trace(str(trace))
+    events = json.loads(trace.read_text())["traceEvents"]
+    assert len(events) == 4
+    assert {e["ph"] for e in events} == {"X"}
+    assert events[0]["cat"] == "heuristic"
+
+
+def test_main_check_with_profile_writes_trace(tmp_path, monkeypatch, capsys):
+    data = {
+        "info": {"version": "1.0", "author_email": "dev@example.com"},
+        "releases": {
+            "1.0": [{"filename": "a.tar.gz", "upload_time": "2020-01-01T00:00:00Z"}]
+        },
+    }
+    monkeypatch.setattr(checker, "ensure_whitelist_exists", lambda: None)
+    monkeypatch.setattr(checker, "verify_whitelist_integrity", lambda: True)
+    monkeypatch.setattr(checker, "is_whitelisted", lambda n: False)
+    monkeypatch.setattr(checker.cache, "get_cached_audit", lambda pkg, ver: None)
+    monkeypatch.setattr(checker.cache, "save_audit", lambda *a: None)
+    monkeypatch.setattr(checker, "fetch_pypi_data", lambda pkg: data)
+
+    trace = tmp_path / "trace.json"
+    monkeypatch.setattr(
+        sys, "argv", ["skopos", "--trace-file", str(trace), "check", "somepkg"]
+    )
+    checker.main()
+
+    out = capsys.readouterr().out
+    assert "Skopos Profile" in out
+    names = {e["name"] for e in json.loads(trace.read_text())["traceEvents"]}
+    assert {
+        "check_package",
+        "pypi.fetch",
+        "heuristic.typosquatting",
+        "render.report",
+    } <= names
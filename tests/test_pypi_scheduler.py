@@ -0,0 +1,172 @@
+import json
+import threading
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from skopos import checker, metrics, pypi
+
+
+class FakePyPI:
+    """Local stand-in for pypi.org replaying scripted responses per package."""
+
+    def __init__(self, delay=0.0):
+        self.scripts = {}
+        self.hits = {}
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                name = self.path.split("/")[2]
+                with fake._lock:
+                    fake.hits[name] = fake.hits.get(name, 0) + 1
+                    script = fake.scripts.get(
+                        name, [(200, {}, {"info": {"name": name}})]
+                    )
+                    status, headers, body = (
+                        script.pop(0) if len(script) > 1 else script[0]
+                    )
+                    fake.active += 1
+                    fake.peak = max(fake.peak, fake.active)
+                time.sleep(fake.delay)
+                payload = json.dumps(body or {}).encode()
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                with fake._lock:
+                    fake.active -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def fake_pypi(monkeypatch):
+    fake = FakePyPI()
+    monkeypatch.setattr(pypi, "PYPI_URL", fake.url)
+    monkeypatch.setattr(pypi, "LIMITER", pypi.AdaptiveLimiter(cooldown=0))
+    monkeypatch.setattr(
+        checker,
+        "load_config",
+        lambda: {
+            "cache": {"not_found_ttl": 3600, "error_ttl": 60},
+            "pypi": {
+                "metadata_source": "json",
+                "timeout": 5,
+                "max_retries": 2,
+                "backoff_base": 0.001,
+                "backoff_max": 1,
+            },
+        },
+    )
+    monkeypatch.setattr(pypi, "_SESSION", None)
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    yield fake
+    fake.close()
+
+
+def test_retry_after_is_honoured_until_success(fake_pypi):
+    fake_pypi.scripts["busy"] = [
+        (429, {"Retry-After": "0"}, None),
+        (503, {}, None),
+        (200, {}, {"info": {"v": 1}}),
+    ]
+    before = metrics.PYPI_RETRIES.value(reason="429")
+
+    assert checker.fetch_pypi_data("busy") == {"info": {"v": 1}}
+    assert fake_pypi.hits["busy"] == 3
+    assert metrics.PYPI_RETRIES.value(reason="429") - before == 1
+    assert checker.cache.get_negative("busy") is None
+
+
+def test_exhausted_retries_are_a_transient_failure(fake_pypi):
+    fake_pypi.scripts["down"] = [(503, {}, None)]
+
+    assert checker.fetch_pypi_data("down") is None
+    assert fake_pypi.hits["down"] == 3
+    assert checker.cache.get_negative("down") == "error"
+
+
+def test_not_found_is_not_retried(fake_pypi):
+    fake_pypi.scripts["missing"] = [(404, {}, None)]
+
+    assert checker.fetch_pypi_data("missing") is None
+    assert fake_pypi.hits["missing"] == 1
+    assert checker.cache.get_negative("missing") == "not_found"
+
+
+def test_long_retry_after_is_not_waited_out(fake_pypi):
+    fake_pypi.scripts["banned"] = [(429, {"Retry-After": "3600"}, None)]
+    start = time.monotonic()
+
+    assert checker.fetch_pypi_data("banned") is None
+    assert fake_pypi.hits["banned"] == 1
+    assert time.monotonic() - start < 1
+
+
+def test_concurrency_stays_within_the_window(fake_pypi):
+    fake_pypi.delay = 0.05
+    limiter = pypi.AdaptiveLimiter(max_limit=3, initial=3)
+    urls = [f"{fake_pypi.url}/pypi/pkg{i}/json" for i in range(12)]
+    threads = [
+        threading.Thread(target=pypi.get, args=(u,), kwargs={"limiter": limiter})
+        for u in urls
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert 1 < fake_pypi.peak <= 3
+
+
+def test_aimd_window():
+    limiter = pypi.AdaptiveLimiter(
+        max_limit=8, initial=4, latency_target=1.0, cooldown=60
+    )
+    for _ in range(5):
+        limiter.on_success(0.01)
+    assert limiter.limit == 5
+
+    grown = limiter.window
+    limiter.on_congestion()
+    assert limiter.window == pytest.approx(grown / 2)
+    # A second failure from the same burst is absorbed by the cooldown
+    limiter.on_congestion()
+    assert limiter.window == pytest.approx(grown / 2)
+
+    limiter._last_decrease = float("-inf")
+    limiter.on_success(5.0)  # slower than the latency target counts as congestion
+    assert limiter.limit == 1
+
+    for _ in range(200):
+        limiter.on_success(0.01)
+    assert limiter.limit == 8
+
+
+def test_retry_after_parsing():
+    assert pypi.retry_after_seconds("7") == 7
+    assert pypi.retry_after_seconds(None) is None
+    assert pypi.retry_after_seconds("soon") is None
+    later = format_datetime(
+        datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True
+    )
+    assert 25 < pypi.retry_after_seconds(later) <= 30
+    assert 0 <= pypi.backoff_delay(10, 0.5, 4) <= 4
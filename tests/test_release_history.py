@@ -0,0 +1,136 @@
+import json
+
+import pytest
+
+from skopos import checker, checker_logic as cl, metrics, pypi
+from skopos.metadata import PackageMetadata
+from tests.helpers import simple_to_metadata
+
+
+def page(versions, serial, yanked=()):
+    files = []
+    for i, version in enumerate(versions):
+        for filename in (
+            f"giant-{version}.tar.gz",
+            f"giant-{version}-py3-none-any.whl",
+        ):
+            files.append(
+                {
+                    "filename": filename,
+                    "hashes": {"sha256": f"{i:064d}"},
+                    "size": 100 + i,
+                    "upload-time": (
+                        f"20{10 + i // 12:02d}-{i % 12 + 1:02d}-01T00:00:00.000000Z"
+                    ),
+                    "yanked": version in yanked,
+                }
+            )
+    return {
+        "meta": {"api-version": "1.1", "_last-serial": serial},
+        "name": "giant",
+        "versions": versions,
+        "files": files,
+    }
+
+
+class Response:
+    def __init__(self, status_code, payload=None, headers=None):
+        self.status_code = status_code
+        self._payload = payload
+        self.headers = headers or {}
+        self.content = json.dumps(payload).encode() if payload is not None else b""
+
+    def json(self):
+        return self._payload
+
+
+class FakeIndex:
+    """Serves one simple page, honouring If-None-Match like PyPI's CDN."""
+
+    def __init__(self, doc, etag="v1"):
+        self.doc, self.etag = doc, etag
+        self.statuses = []
+
+    def get(self, url, timeout, headers=None):
+        if (headers or {}).get("If-None-Match") == self.etag:
+            response = Response(304)
+        else:
+            response = Response(200, self.doc, {"ETag": self.etag})
+        self.statuses.append(response.status_code)
+        return response
+
+
+VERSIONS = [f"1.{i}" for i in range(cl.IDENTITY_IMMUNE_RELEASES + 10)]
+
+
+@pytest.fixture
+def index(monkeypatch):
+    monkeypatch.setattr(
+        checker,
+        "load_config",
+        lambda: {"pypi": {"metadata_source": "simple", "max_retries": 0}},
+    )
+    fake = FakeIndex(page(VERSIONS, serial=100))
+    monkeypatch.setattr(pypi, "get_session", lambda: fake)
+    return fake
+
+
+def test_first_sync_stores_the_full_history(index):
+    meta = checker.fetch_pypi_data("giant")
+    reference = PackageMetadata.from_pypi_json(simple_to_metadata("giant", index.doc))
+
+    assert isinstance(meta, PackageMetadata)
+    assert meta.version == "1.39" == reference.version
+    assert meta.release_count == len(VERSIONS)
+    assert len(checker.cache.known_release_files("giant")) == 2 * len(VERSIONS)
+    assert sorted(meta.upload_timestamps()) == sorted(reference.upload_timestamps())
+    assert sorted(meta.files_for("1.5")) == sorted(reference.files_for("1.5"))
+    for heuristic in (cl.check_resurrection, lambda m: cl.scan_payload("giant", m)):
+        assert heuristic(meta) == heuristic(reference)
+
+
+def test_unchanged_project_is_served_from_the_store(index, monkeypatch):
+    checker.fetch_pypi_data("giant")
+    before = metrics.RELEASE_SYNCS.value(result="not_modified")
+    assert checker.fetch_pypi_data("giant").release_count == len(VERSIONS)
+    assert index.statuses == [200, 304]
+    assert metrics.RELEASE_SYNCS.value(result="not_modified") == before + 1
+
+    # Same serial behind a new ETag: the page is not re-parsed
+    index.etag = "v2"
+    monkeypatch.setattr(
+        pypi,
+        "simple_files_delta",
+        lambda *a: pytest.fail("history should not be re-diffed"),
+    )
+    assert checker.fetch_pypi_data("giant").version == "1.39"
+
+
+def test_new_releases_only_add_the_delta(index):
+    checker.fetch_pypi_data("giant")
+    before = metrics.RELEASE_FILES_ADDED.value()
+
+    index.doc, index.etag = page(VERSIONS + ["2.0"], serial=101), "v2"
+    meta = checker.fetch_pypi_data("giant")
+    assert metrics.RELEASE_FILES_ADDED.value() - before == 2
+    assert meta.version == "2.0"
+    assert meta.files_for("2.0") == ["giant-2.0-py3-none-any.whl", "giant-2.0.tar.gz"]
+
+
+def test_yanking_is_picked_up_for_known_files(index):
+    checker.fetch_pypi_data("giant")
+    index.doc, index.etag = page(VERSIONS, serial=102, yanked={"1.39"}), "v3"
+    assert checker.fetch_pypi_data("giant").version == "1.38"
+    assert checker.cache.known_release_files("giant")["giant-1.39.tar.gz"] is True
+
+
+def test_delta_ignores_known_files():
+    doc = page(["1.0", "1.1"], serial=1)
+    known = {"giant-1.0.tar.gz": False, "giant-1.0-py3-none-any.whl": True}
+    versions, new_files, yank_changes = pypi.simple_files_delta(doc, known)
+    assert versions == ["1.0", "1.1"]
+    assert [f[1] for f in new_files] == [
+        "giant-1.1.tar.gz",
+        "giant-1.1-py3-none-any.whl",
+    ]
+    assert yank_changes == [("giant-1.0-py3-none-any.whl", False)]
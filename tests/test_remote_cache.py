@@ -0,0 +1,118 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from skopos import metrics
+from skopos.cache import CacheManager
+from skopos.cache_backends import HTTPBackend
+
+
+class FakeKVServer:
+    """Local stand-in for the shared cache: an in-memory dict behind /mget and /mput."""
+
+    def __init__(self):
+        self.store = {}
+        self.requests = []
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                fake.requests.append((self.path, body))
+                if self.path == "/mget":
+                    reply = {
+                        "entries": {
+                            k: fake.store[k] for k in body["keys"] if k in fake.store
+                        }
+                    }
+                else:
+                    fake.store.update(body["entries"])
+                    reply = {}
+                payload = json.dumps(reply).encode()
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def kv():
+    server = FakeKVServer()
+    yield server
+    server.close()
+
+
+def node(tmp_path, name, url, **kwargs):
+    backend = HTTPBackend(url, session=requests.Session())
+    return CacheManager(db_path=str(tmp_path / f"{name}.db"), remote=backend, **kwargs)
+
+
+def test_one_nodes_audit_serves_another(tmp_path, kv):
+    a = node(tmp_path, "a", kv.url)
+    a.save_audit("requests", "2.31.0", 95, {"Payload": [True, {}]})
+    assert kv.store == {}  # buffered until the batch fills or flush()
+    a.flush()
+    assert set(kv.store) == {"requests==2.31.0", "requests==latest"}
+
+    b = node(tmp_path, "b", kv.url)
+    assert b.get_cached_audit("requests", "latest") == (95, {"Payload": [True, {}]})
+    # Backfilled into B's SQLite, and later reads never leave the process
+    assert b.local.get_many([("requests", "2.31.0")])
+    seen = len(kv.requests)
+    assert b.get_cached_audit("requests", "latest")[0] == 95
+    assert len(kv.requests) == seen
+
+
+def test_reads_and_writes_are_batched(tmp_path, kv):
+    a = node(tmp_path, "a", kv.url, remote_batch=4)
+    a.save_audit("flask", "3.0", 90, {})
+    assert kv.requests == []
+    a.save_audit("django", "5.0", 88, {})  # 4 keys including the "latest" aliases
+    assert [path for path, _ in kv.requests] == ["/mput"]
+
+    b = node(tmp_path, "b", kv.url)
+    b.prefetch([("flask", "latest"), ("django", "latest"), ("unknown", "latest")])
+    mgets = [body for path, body in kv.requests if path == "/mget"]
+    assert len(mgets) == 1 and len(mgets[0]["keys"]) == 3
+    assert b.get_cached_audit("django", "latest")[0] == 88
+
+
+def test_fresh_remote_entry_beats_expired_local_one(tmp_path, kv):
+    a = node(tmp_path, "a", kv.url)
+    a.save_audit("numpy", "2.0", 97, {"fresh": True})
+    a.flush()
+
+    b = node(tmp_path, "b", kv.url)
+    old = (datetime.now(timezone.utc) - timedelta(days=3)).isoformat()
+    with sqlite3.connect(b.db_path) as conn:
+        conn.execute(
+            "INSERT INTO audits (package_name, version, score, meta_json, timestamp) "
+            "VALUES (?, ?, ?, ?, ?)",
+            ("numpy", "2.0", 50, json.dumps({"fresh": False}), old),
+        )
+    assert b.get_cached_audit("numpy", "2.0") == (97, {"fresh": True})
+
+
+def test_unreachable_remote_is_a_miss(tmp_path):
+    before = metrics.REMOTE_CACHE_ERRORS.value(op="mget")
+    c = node(tmp_path, "c", "http://127.0.0.1:9", remote_batch=1)
+    assert c.get_cached_audit("requests", "latest") is None
+    assert metrics.REMOTE_CACHE_ERRORS.value(op="mget") == before + 1
+    c.save_audit("requests", "2.31.0", 95, {})  # put failure is swallowed too
+    assert c.get_cached_audit("requests", "latest")[0] == 95
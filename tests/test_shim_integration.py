@@ -15,3 +15,55 @@ def test_bash_shim_runs_check_help_from_repo_root():
     assert proc.returncode in (0, 2)
     output = (proc.stdout or "") + (proc.stderr or "")
     assert "Usage" in output or "usage" in output
+
+
+def test_bash_shim_checks_every_added_package(tmp_path):
+    repo_root = Path(__file__).resolve().parents[1]
+    script = repo_root / "scripts" / "skopos-uv.sh"
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    log = tmp_path / "calls.log"
+    for tool in ("skopos", "uv"):
+        stub = bin_dir / tool
+        stub.write_text(f'#!/usr/bin/env bash\necho "{tool} $*" >> "{log}"\n')
+        stub.chmod(0o755)
+
+    env = {"PATH": f"{bin_dir}:/usr/bin:/bin"}
+    args = ["add", "foo", "--dev", "bar>=1.0", "--group", "lint", "baz[extra]"]
+    proc = subprocess.run(
+        ["bash", str(script), *args], env=env, capture_output=True, text=True
+    )
+    assert proc.returncode == 0, proc.stderr
+    calls = log.read_text().splitlines()
+    assert calls[0] == "skopos check foo bar>=1.0 baz[extra]"
+    assert calls[1] == "uv " + " ".join(args)
+
+
+def test_installed_hook_checks_every_added_package(tmp_path, monkeypatch):
+    from skopos import checker
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("SHELL", "/bin/bash")
+    checker.install_shell_hook()
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    log = tmp_path / "calls.log"
+    for tool in ("skopos", "uv"):
+        stub = bin_dir / tool
+        stub.write_text(f'#!/usr/bin/env bash\necho "{tool} $*" >> "{log}"\n')
+        stub.chmod(0o755)
+
+    env = {"PATH": f"{bin_dir}:/usr/bin:/bin"}
+    script = (
+        f'source "{tmp_path / ".bashrc"}"; '
+        'uv add foo --dev "bar>=1.0" --group lint "baz[extra]"; uv sync'
+    )
+    proc = subprocess.run(
+        ["bash", "-c", script], env=env, capture_output=True, text=True
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert log.read_text().splitlines() == [
+        "skopos check foo bar>=1.0 baz[extra]",
+        "uv add foo --dev bar>=1.0 --group lint baz[extra]",
+        "uv sync",
+    ]
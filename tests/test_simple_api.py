@@ -0,0 +1,198 @@
+import json
+
+import pytest
+
+from skopos import checker, checker_logic as cl, pypi
+from tests.helpers import simple_to_metadata
+
+
+def simple_doc(name, versions, files_per_version=2, author_version=None):
+    files = []
+    for i, version in enumerate(versions):
+        for n in range(files_per_version):
+            filename = (
+                f"{name.replace('-', '_')}-{version}-py3-none-any.whl"
+                if n
+                else f"{name}-{version}.tar.gz"
+            )
+            files.append(
+                {
+                    "filename": filename,
+                    "url": f"https://files.example/{filename}",
+                    "hashes": {"sha256": "0" * 64},
+                    "size": 1000,
+                    "upload-time": f"2020-01-{i % 28 + 1:02d}T10:00:00.000000Z",
+                    "yanked": False,
+                }
+            )
+    return {
+        "meta": {"api-version": "1.1"},
+        "name": name,
+        "versions": list(versions),
+        "files": files,
+    }
+
+
+def legacy_doc(name, simple):
+    data = simple_to_metadata(name, simple)
+    releases = {
+        v: [
+            {
+                "filename": f["filename"],
+                "upload_time": f["upload_time"].replace(".000000Z", ""),
+            }
+            for f in files
+        ]
+        for v, files in data["releases"].items()
+    }
+    info = {
+        "name": name,
+        "version": data["info"]["version"],
+        "author": "Dev",
+        "author_email": "dev@example.com",
+    }
+    return {"info": info, "releases": releases}
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self._payload = payload
+        self.headers = {}
+        self.content = json.dumps(payload).encode() if payload is not None else b""
+
+    def json(self):
+        return self._payload
+
+
+class FakeSession:
+    def __init__(self, routes):
+        self.routes = routes
+        self.calls = []
+
+    def get(self, url, timeout, headers=None):
+        path = url.split("://", 1)[1].split("/", 1)[1]
+        self.calls.append((path, (headers or {}).get("Accept")))
+        return self.routes.get(path) or FakeResponse(404)
+
+
+@pytest.fixture
+def simple_source(monkeypatch):
+    cfg = {
+        "cache": {"not_found_ttl": 3600},
+        "pypi": {"metadata_source": "simple", "max_retries": 0},
+    }
+    monkeypatch.setattr(checker, "load_config", lambda: cfg)
+
+    def install(routes):
+        session = FakeSession(routes)
+        monkeypatch.setattr(pypi, "get_session", lambda: session)
+        return session
+
+    return install
+
+
+@pytest.mark.parametrize(
+    "filename, expected",
+    [
+        ("requests-2.31.0-py3-none-any.whl", "2.31.0"),
+        ("python-dateutil-2.8.2.tar.gz", "2.8.2"),
+        ("Django-5.0.zip", "5.0"),
+        ("pkg-1.0.0rc1-py3-none-any.whl", "1.0.0-rc1"),
+        ("legacy-pkg-1.0-beta.tar.gz", "1.0-beta"),
+        ("unrelated.txt", None),
+    ],
+)
+def test_file_version(filename, expected):
+    versions = {"2.31.0", "2.8.2", "5.0", "1.0.0-rc1", "1.0-beta"}
+    canonical = {
+        "2.31.0": "2.31.0",
+        "2.8.2": "2.8.2",
+        "5.0": "5.0",
+        "1.0.0rc1": "1.0.0-rc1",
+    }
+    assert pypi.file_version(filename, versions, canonical) == expected
+
+
+def test_latest_version_prefers_final_unyanked_releases():
+    assert pypi.latest_version(["1.0", "1.1", "2.0b1"]) == "1.1"
+    assert pypi.latest_version(["1.0", "1.1"], yanked={"1.1"}) == "1.0"
+    assert pypi.latest_version(["1.0a1", "1.0a2"]) == "1.0a2"
+
+
+def test_pre_pep700_index_is_not_used():
+    assert pypi.simple_files_delta({"files": []}, {}) is None
+    assert (
+        pypi.simple_files_delta(
+            {"versions": ["1.0"], "files": [{"filename": "x-1.0.tar.gz"}]}, {}
+        )
+        is None
+    )
+
+
+def test_heuristics_agree_with_legacy_document():
+    simple = simple_doc("acme-tool", ["0.1", "0.2", "1.0"])
+    data = simple_to_metadata("acme-tool", simple)
+    legacy = legacy_doc("acme-tool", simple)
+    assert data["info"]["version"] == "1.0"
+    assert set(data["releases"]) == set(legacy["releases"])
+    assert cl.check_resurrection(data) == cl.check_resurrection(legacy)
+    assert cl.check_reputation("acme-tool", data) == cl.check_reputation(
+        "acme-tool", legacy
+    )
+    assert cl.scan_payload("acme-tool", data) == cl.scan_payload("acme-tool", legacy)
+
+
+def test_large_projects_need_only_the_simple_page(simple_source):
+    versions = [f"1.{i}" for i in range(cl.IDENTITY_IMMUNE_RELEASES + 5)]
+    session = simple_source(
+        {"simple/giant/": FakeResponse(200, simple_doc("giant", versions))}
+    )
+
+    data = checker.fetch_pypi_data("giant")
+    assert session.calls == [("simple/giant/", pypi.SIMPLE_ACCEPT)]
+    assert data.release_count == len(versions)
+    assert cl.check_author_reputation("giant", data)[1]["status"] == "Immune (Giant)"
+
+
+def test_small_projects_fetch_author_fields_from_the_version_document(simple_source):
+    simple = simple_doc("tiny", ["0.1", "0.2"])
+    version_doc = {
+        "info": {"author": "Dev", "author_email": "dev@example.com", "version": "0.2"},
+        "urls": [],
+    }
+    session = simple_source(
+        {
+            "simple/tiny/": FakeResponse(200, simple),
+            "pypi/tiny/0.2/json": FakeResponse(200, version_doc),
+        }
+    )
+
+    data = checker.fetch_pypi_data("tiny")
+    assert [path for path, _ in session.calls] == ["simple/tiny/", "pypi/tiny/0.2/json"]
+    assert data.author_email == "dev@example.com"
+    assert cl.check_author_reputation("tiny", data)[0] is True
+
+
+def test_missing_package_on_simple_index(simple_source):
+    session = simple_source({})
+    assert checker.fetch_pypi_data("nope") is None
+    assert checker.cache.get_negative("nope") == "not_found"
+    assert len(session.calls) == 1
+
+
+def test_falls_back_to_legacy_json_without_pep700(simple_source):
+    legacy = {
+        "info": {"version": "1.0", "author_email": "a@b.c"},
+        "releases": {"1.0": []},
+    }
+    session = simple_source(
+        {
+            "simple/old/": FakeResponse(
+                200, {"meta": {"api-version": "1.0"}, "files": []}
+            ),
+            "pypi/old/json": FakeResponse(200, legacy),
+        }
+    )
+    assert checker.fetch_pypi_data("old") == legacy
+    assert [path for path, _ in session.calls] == ["simple/old/", "pypi/old/json"]
@@ -0,0 +1,94 @@
+import json
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from skopos import checker
+
+
+def _audit_row(store, name, score, age):
+    ts = (datetime.now(timezone.utc) - age).isoformat()
+    with sqlite3.connect(store.db_path) as conn:
+        conn.execute(
+            "INSERT INTO audits (package_name, version, score, meta_json, timestamp) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (name, "1.0", score, json.dumps({}), ts),
+        )
+
+
+@pytest.fixture(autouse=True)
+def stale_config(monkeypatch):
+    monkeypatch.setattr(checker, "is_whitelisted", lambda n: False)
+    monkeypatch.setattr(
+        checker,
+        "load_config",
+        lambda: {"cache": {"stale_ttl": 6 * 3600, "revalidate_below": 90}},
+    )
+    checker._STALE.clear()
+
+
+def test_stale_window_bounds(store):
+    _audit_row(store, "fresh", 95, timedelta(hours=1))
+    _audit_row(store, "stale", 95, timedelta(hours=26))
+    _audit_row(store, "expired", 95, timedelta(hours=31))
+    ttl = 6 * 3600
+    assert store.get_stale_audit("fresh", "latest", ttl) is None
+    assert store.get_stale_audit("stale", "latest", ttl) == (95, {})
+    assert store.get_stale_audit("expired", "latest", ttl) is None
+    assert store.get_stale_audit("stale", "latest", 0) is None
+
+
+def test_stale_passing_verdict_is_served_and_revalidated_in_background(
+    store, monkeypatch
+):
+    _audit_row(store, "requests", 95, timedelta(hours=26))
+    monkeypatch.setattr(
+        checker, "fetch_pypi_data", lambda name: pytest.fail("must not block on PyPI")
+    )
+    spawned = []
+    monkeypatch.setattr(
+        checker.subprocess, "Popen", lambda cmd, **kw: spawned.append(cmd)
+    )
+
+    assert checker.check_package("requests", None) == (True, 95)
+    checker.revalidate_in_background()
+    assert spawned and spawned[0][-3:] == ["cache", "refresh", "requests"]
+    # The queue is drained
+    assert checker.revalidate_in_background() is None
+
+
+def test_stale_pinned_verdict_is_revalidated_as_that_pin(store, monkeypatch):
+    _audit_row(store, "requests", 95, timedelta(hours=26))
+    monkeypatch.setattr(
+        checker, "fetch_pypi_data", lambda name: pytest.fail("must not block on PyPI")
+    )
+    spawned = []
+    monkeypatch.setattr(
+        checker.subprocess, "Popen", lambda cmd, **kw: spawned.append(cmd)
+    )
+
+    assert checker.check_package("requests", None, version="1.0") == (True, 95)
+    checker.revalidate_in_background()
+    assert spawned[0][-3:] == ["cache", "refresh", "requests==1.0"]
+
+    refreshed = []
+    monkeypatch.setattr(
+        checker,
+        "_check_package",
+        lambda name, args, version=None, **kw: (
+            refreshed.append((name, version)) or (True, 95)
+        ),
+    )
+    assert checker.refresh_audits(["requests==1.0"]) == {"requests==1.0": (True, 95)}
+    assert refreshed == [("requests", "1.0")]
+
+
+def test_borderline_stale_verdict_is_reaudited_synchronously(store, monkeypatch):
+    _audit_row(store, "borderline", 85, timedelta(hours=26))
+    fetched = []
+    monkeypatch.setattr(checker, "fetch_pypi_data", lambda name: fetched.append(name))
+
+    assert checker.check_package("borderline", None) == (False, 0)
+    assert fetched == ["borderline"]
+    assert not checker._STALE
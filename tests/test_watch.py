@@ -0,0 +1,58 @@
+import threading
+import time
+
+from skopos import checker
+from skopos.watch import ManifestWatcher
+
+
+def test_watcher_debounces_a_burst_of_writes(tmp_path):
+    manifest = tmp_path / "requirements.txt"
+    manifest.write_text("requests\n")
+    lock = tmp_path / "uv.lock"
+    watcher = ManifestWatcher([manifest, lock], interval=0.01, debounce=0.1)
+
+    def edit():
+        time.sleep(0.05)
+        manifest.write_text("requests\nrich\n")
+        time.sleep(0.03)
+        lock.write_text("version = 1\n")
+
+    start = time.monotonic()
+    threading.Thread(target=edit).start()
+    changed = watcher.wait(timeout=2)
+    elapsed = time.monotonic() - start
+    assert changed == [manifest, lock]
+    # Feedback well within a second of the last save
+    assert 0.15 <= elapsed < 1.0
+    assert watcher.wait(timeout=0.05) == []
+
+
+class ScriptedWatcher:
+    def __init__(self, edits):
+        self.edits = edits
+
+    def wait(self):
+        path, text = self.edits.pop(0)
+        path.write_text(text)
+        return [path]
+
+
+def test_watch_audits_only_added_or_changed_requirements(monkeypatch, tmp_path):
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text('[project]\ndependencies = ["requests>=2"]\n')
+    audited = []
+    monkeypatch.setattr(
+        checker,
+        "audit_many",
+        lambda names, args, pins=None: (
+            audited.append(names) or {n: (True, 95) for n in names}
+        ),
+    )
+    monkeypatch.setattr(checker.cache, "flush", lambda: None)
+    edits = [
+        (pyproject, '[project]\ndependencies = ["requests>=2", "httpx"]\n'),
+        (pyproject, '[project]\ndependencies = ["Requests >= 2", "httpx"]\n'),
+        (pyproject, '[project]\ndependencies = ["requests>=2.31", "httpx"]\n'),
+    ]
+    checker.watch([pyproject], None, watcher=ScriptedWatcher(edits), rounds=3)
+    assert audited == [["httpx"], ["requests"]]